@@ -1,31 +1,278 @@
-from homeassistant.core import HomeAssistant
+import asyncio
+import functools
+import logging
+import sqlite3
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
 from homeassistant.config_entries import ConfigEntry
-from .const import DOMAIN, PLATFORMS
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+from .const import (
+    ALARM_HISTORY_FILE,
+    ALARM_HISTORY_LIMIT,
+    ALARM_HISTORY_RETENTION_DAYS,
+    DOMAIN,
+    PLATFORMS,
+    SERVICE_ALARM_HISTORY,
+)
 from .api import Hp7Api
 from .coordinator import Hp7Coordinator
+from .pylocalapi.store import AlarmStore
+
+_LOGGER = logging.getLogger(__name__)
+
+ALARM_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional("serial"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("alarm_type"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("limit", default=ALARM_HISTORY_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1000)
+        ),
+    }
+)
+
+
+def _account_key(entry: ConfigEntry) -> str:
+    """Chiave dell'account EZVIZ: le entry con le stesse credenziali condividono client e coordinator."""
+    return f"{entry.data['region']}:{entry.data['username']}".lower()
+
+
+async def _async_get_account(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Restituisce (creandolo se serve) il client/coordinator condiviso dell'account.
+
+    Le entry partono in parallelo: il lock per account fa sì che solo la prima
+    crei client, coordinator e MQTT, le altre attendono e li riusano.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    accounts = domain_data.setdefault("accounts", {})
+    key = _account_key(entry)
+    lock = domain_data.setdefault("account_locks", {}).setdefault(key, asyncio.Lock())
+    async with lock:
+        account = accounts.get(key)
+        if account is None:
+            account = await _async_create_account(hass, entry, key)
+            accounts[key] = account
+    return account
+
+
+async def _async_create_account(hass: HomeAssistant, entry: ConfigEntry, key: str) -> dict:
+    """Login, coordinator e push MQTT di un account nuovo."""
+    api = Hp7Api(
+        entry.data["username"],
+        entry.data["password"],
+        entry.data["region"],
+        token=entry.data.get("token"),
+        session=async_get_clientsession(hass),
+    )
+    api.on_token_refreshed = lambda token: _async_save_token(hass, key, token)
+    await api.async_login()
+
+    api.alarm_store = await _async_get_alarm_store(hass)
+    coordinator = Hp7Coordinator(hass, api)
+
+    @callback
+    def _async_token_refreshed(token: dict) -> None:
+        _async_save_token(hass, key, token)
+        # Il push lato server è legato al sessionId: va rinnovato anche lui
+        coordinator.async_refresh_push_session(token)
+
+    api.on_token_refreshed = _async_token_refreshed
+    api.on_lock_learned = lambda serial, action, lock_no: _async_save_lock_number(
+        hass, serial, action, lock_no
+    )
+    account = {
+        "api": api,
+        "coordinator": coordinator,
+        "entries": set(),
+    }
+
+    # Push MQTT: gli allarmi arrivano in tempo reale, il polling resta di sicurezza
+    await coordinator.async_start_push()
+    account["stop_unsub"] = hass.bus.async_listen_once(
+        EVENT_HOMEASSISTANT_STOP, coordinator.async_stop_push
+    )
+    return account
+
+
+async def _async_get_alarm_store(hass: HomeAssistant) -> AlarmStore | None:
+    """Apre (una volta sola) lo storico allarmi SQLite condiviso da tutti gli account.
+
+    Se il file non si apre l'integrazione funziona lo stesso, senza storico.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if "alarm_store" not in domain_data:
+        try:
+            store = await hass.async_add_executor_job(
+                AlarmStore, hass.config.path(ALARM_HISTORY_FILE), ALARM_HISTORY_RETENTION_DAYS
+            )
+        except (OSError, sqlite3.Error) as e:
+            _LOGGER.warning("Storico allarmi non disponibile: %s", e)
+            store = None
+        # Un'altra entry può averlo aperto durante l'attesa: vince la prima
+        if "alarm_store" in domain_data and store is not None:
+            await hass.async_add_executor_job(store.close)
+        domain_data.setdefault("alarm_store", store)
+    return domain_data["alarm_store"]
+
+
+async def _async_alarm_history(call: ServiceCall) -> ServiceResponse:
+    """Servizio alarm_history: allarmi dallo storico locale, senza chiamate al cloud.
+
+    Senza start restituisce gli allarmi di oggi (da mezzanotte locale), i più recenti prima.
+    """
+    hass = call.hass
+    store: AlarmStore | None = hass.data.get(DOMAIN, {}).get("alarm_store")
+    if store is None:
+        raise HomeAssistantError("Storico allarmi EZVIZ HP7 non disponibile")
+    start = call.data.get("start")
+    end = call.data.get("end")
+    query = functools.partial(
+        store.query,
+        call.data.get("serial"),
+        since=dt_util.as_timestamp(start) if start else dt_util.start_of_local_day().timestamp(),
+        until=dt_util.as_timestamp(end) if end else None,
+        alarm_type=call.data.get("alarm_type"),
+        limit=call.data["limit"],
+    )
+    try:
+        alarms = await hass.async_add_executor_job(query)
+    except sqlite3.Error as e:
+        raise HomeAssistantError(f"Lettura storico allarmi fallita: {e}") from e
+    return {"count": len(alarms), "alarms": alarms}
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
-    username = entry.data["username"]
-    password = entry.data["password"]
-    region = entry.data["region"]
     serial = entry.data["serial"]
 
-    token = entry.data.get("token")
+    account = await _async_get_account(hass, entry)
+    api: Hp7Api = account["api"]
+    coordinator: Hp7Coordinator = account["coordinator"]
+    account["entries"].add(entry.entry_id)
 
-    api = Hp7Api(username, password, region, token=token)
-    await hass.async_add_executor_job(api.login)
+    # Le opzioni di polling valgono per tutto l'account: vince l'ultima entry caricata
+    coordinator.configure_scheduler(entry.options)
+    api.configure_retry(entry.options)
+    account["options"] = dict(entry.options)
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
 
-    await hass.async_add_executor_job(api.detect_capabilities, serial)
+    # Un solo refresh batch per account: il nuovo serial entra nel prossimo giro
+    coordinator.add_serial(serial)
+    await coordinator.async_refresh()
+    if not coordinator.last_update_success:
+        account["entries"].discard(entry.entry_id)
+        coordinator.remove_serial(serial)
+        await _async_release_account(hass, entry)
+        raise ConfigEntryNotReady(f"EZVIZ HP7 {serial}: nessun dato dal cloud")
 
-    coordinator = Hp7Coordinator(hass, api, serial)
-    await coordinator.async_config_entry_first_refresh()
+    await api.async_detect_capabilities(serial)
+    # Route serratura pronta prima del primo sblocco: la pressione è una sola richiesta
+    api.restore_lock_numbers(serial, entry.data.get("lock_numbers", {}))
+    api.warm_lock_route(serial)
 
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
+    hass.data[DOMAIN][entry.entry_id] = {
         "api": api,
         "serial": serial,
+        "account_key": _account_key(entry),
         "coordinator": coordinator,
         "token": api._token,
     }
 
+    if not hass.services.has_service(DOMAIN, SERVICE_ALARM_HISTORY):
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_ALARM_HISTORY,
+            _async_alarm_history,
+            schema=ALARM_HISTORY_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
+
+
+@callback
+def _async_save_lock_number(
+    hass: HomeAssistant, serial: str, action: str, lock_no: int | None
+) -> None:
+    """Salva nella entry del serial il lock_no che ha funzionato per l'azione.
+
+    None lo toglie: il cloud lo ha rifiutato, al prossimo comando si riprova.
+    """
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.data.get("serial") != serial:
+            continue
+        lock_numbers = dict(entry.data.get("lock_numbers", {}))
+        if lock_no is None:
+            lock_numbers.pop(action, None)
+        else:
+            lock_numbers[action] = lock_no
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, "lock_numbers": lock_numbers}
+        )
+
+
+@callback
+def _async_save_token(hass: HomeAssistant, account_key: str, token: dict) -> None:
+    """Salva il token rinnovato in tutte le entry dell'account.
+
+    Al riavvio si riparte dal refresh della sessione invece che da un login
+    completo con password (ed eventuale MFA).
+    """
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if _account_key(entry) != account_key or entry.data.get("token") == token:
+            continue
+        hass.config_entries.async_update_entry(entry, data={**entry.data, "token": token})
+
+
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Applica subito le nuove opzioni di polling e retry all'account."""
+    account = hass.data[DOMAIN].get("accounts", {}).get(_account_key(entry))
+    # Il listener scatta anche per i salvataggi di token e lock_no: solo le opzioni contano
+    if account and account.get("options") != dict(entry.options):
+        account["options"] = dict(entry.options)
+        account["coordinator"].configure_scheduler(entry.options)
+        account["api"].configure_retry(entry.options)
+
+
+async def _async_release_account(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Chiude client e coordinator dell'account quando non ha più entry."""
+    accounts = hass.data[DOMAIN].get("accounts", {})
+    key = _account_key(entry)
+    account = accounts.get(key)
+    if account is None or account["entries"]:
+        return
+
+    accounts.pop(key)
+    account["stop_unsub"]()
+    coordinator: Hp7Coordinator = account["coordinator"]
+    await coordinator.async_stop_push()
+    await coordinator.async_shutdown()
+    await hass.async_add_executor_job(account["api"].close)
+
+    # Ultimo account chiuso: via anche il servizio e lo storico allarmi
+    if not accounts:
+        if hass.services.has_service(DOMAIN, SERVICE_ALARM_HISTORY):
+            hass.services.async_remove(DOMAIN, SERVICE_ALARM_HISTORY)
+        store = hass.data[DOMAIN].pop("alarm_store", None)
+        if store is not None:
+            await hass.async_add_executor_job(store.close)
+
+
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        data = hass.data[DOMAIN].pop(entry.entry_id, None)
+        account = hass.data[DOMAIN].get("accounts", {}).get(_account_key(entry))
+        if data and account:
+            account["entries"].discard(entry.entry_id)
+            account["coordinator"].remove_serial(data["serial"])
+            # I sensori di metrica li riprende la prossima entry dell'account che si carica
+            if account.get("metrics_entry") == entry.entry_id:
+                account.pop("metrics_entry")
+            await _async_release_account(hass, entry)
+    return unload_ok
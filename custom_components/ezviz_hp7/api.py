@@ -1,26 +1,96 @@
+import asyncio
 import logging
-from typing import Any, Dict, Optional
-from .pylocalapi.client import EzvizClient
+import sqlite3
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+import aiohttp
+import requests
+from .pylocalapi.alarm_kinds import classify_alarm
+from .pylocalapi.async_client import AsyncEzvizClient
 from .pylocalapi.camera import EzvizCamera
+from .pylocalapi.constants import HIK_ENCRYPTION_HEADER, REQUEST_HEADER
+from .pylocalapi.exceptions import (
+    EzvizAuthTokenExpired,
+    EzvizAuthVerificationCode,
+    EzvizCircuitOpen,
+    HTTPError,
+    InvalidURL,
+    PyEzvizError,
+)
+from .pylocalapi.retry import RetryPolicy
+from .pylocalapi.utils import decrypt_image
+
+if TYPE_CHECKING:
+    from .pylocalapi.mqtt import MQTTClient
+    from .pylocalapi.store import AlarmStore
 
 _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_DOOR_LOCK_NO = 2
 DEFAULT_GATE_LOCK_NO = 1
 
+# Errori di rete, cloud o autenticazione: non dicono nulla sul lock_no provato
+LOCK_TRANSPORT_ERRORS = (
+    EzvizAuthTokenExpired,
+    EzvizAuthVerificationCode,
+    EzvizCircuitOpen,
+    HTTPError,
+    InvalidURL,
+)
+
+# Ordine dei lock_no da provare per ogni azione finché non se ne impara uno
+LOCK_CANDIDATES = {
+    "unlock_door": (DEFAULT_DOOR_LOCK_NO, DEFAULT_GATE_LOCK_NO),
+    "unlock_gate": (DEFAULT_GATE_LOCK_NO, DEFAULT_DOOR_LOCK_NO),
+}
+
+# Sezioni pagelist lette dal tier lento (_device_fields): le altre restano quelle
+# dell'ultima pagelist completa. deviceInfos e resourceInfos arrivano sempre.
+DEVICE_STATUS_SECTIONS = ("STATUS", "CONNECTION", "WIFI", "UPGRADE")
+FULL_PAGELIST_EVERY = 4  # una pagelist completa ogni N giri del tier lento
+
 class Hp7Api:
+    """Accesso al cloud EZVIZ per un account.
+
+    Le chiamate HTTP usano AsyncEzvizClient sulla sessione aiohttp condivisa
+    di Home Assistant: niente thread dell'executor occupati durante il polling.
+    Solo il push MQTT (paho, sincrono) va avviato/fermato nell'executor.
+    """
+
     def __init__(
         self,
         username: str,
         password: Optional[str] = None,
         region: str = "eu",
         token: Optional[dict] = None,
+        session: Optional[aiohttp.ClientSession] = None,
     ):
         self._username = username
         self._password = password
         self._region = region
-        self._token = token
-        self._client: Optional[EzvizClient] = None
+        # Copia: il dict della config entry non va modificato dai refresh
+        self._token = dict(token) if token else None
+        self._session = session
+        self._client: Optional[AsyncEzvizClient] = None
+        self._mqtt_client: Optional["MQTTClient"] = None
+        # Camera persistenti per serial, aggiornate in modo incrementale
+        self._cameras: Dict[str, EzvizCamera] = {}
+        # Chiavi di cifratura per serial (servono a decifrare le immagini allarme)
+        self._cam_keys: Dict[str, str] = {}
+        # Routing serrature: route calcolata da resourceInfos e lock_no imparato
+        self._lock_routes: Dict[str, Dict[str, Any]] = {}
+        self._lock_numbers: Dict[Tuple[str, str], int] = {}
+        # Chiamata con None quando un lock_no imparato viene rifiutato e dimenticato
+        self.on_lock_learned: Optional[Callable[[str, str, Optional[int]], None]] = None
+        self._device_polls = 0
+        # Backoff, budget di retry e circuit breaker condivisi da tutte le richieste
+        self._retry_policy = RetryPolicy()
+        self._retry_options: Dict[str, Any] = {}
+        # Chiamata a ogni token nuovo, per salvarlo nella config entry
+        self.on_token_refreshed: Optional[Callable[[Dict[str, Any]], None]] = None
+        # Campi del tier lento per serial, ricalcolati solo se il change set li tocca
+        self._device_status: Dict[str, dict] = {}
+        # Storico allarmi locale condiviso dagli account (assegnato dal setup)
+        self.alarm_store: Optional["AlarmStore"] = None
 
         region_urls = {
             "eu": "apiieu.ezvizlife.com",
@@ -35,106 +105,434 @@ class Hp7Api:
         self.supports_door = True
         self.supports_gate = True
 
-    def ensure_client(self) -> None:
+    async def async_ensure_client(self) -> None:
         """Crea il client Ezviz se non esiste e gestisce il token."""
         if self._client:
             return
 
-        self._client = EzvizClient(
+        if self._session is None:
+            raise RuntimeError("Hp7Api richiede una sessione aiohttp")
+        self._client = AsyncEzvizClient(
+            self._session,
             account=self._username,
             password=self._password,
             url=self._url,
             token=self._token,
+            retry_policy=self._retry_policy,
         )
+        self._client.tokens.subscribe(self._on_token_refreshed)
 
         if not self._token:
-            self._login_and_store_token()
+            await self._async_login_and_store_token()
+
+    def _on_token_refreshed(self, token: Dict[str, Any]) -> None:
+        """Token nuovo (login o refresh, anche proattivo): lo tiene e lo inoltra."""
+        self._token = token
+        if self.on_token_refreshed:
+            self.on_token_refreshed(token)
 
-    def _login_and_store_token(self) -> None:
+    def configure_retry(self, options: Mapping[str, Any]) -> None:
+        """Applica le opzioni di retry e circuit breaker, anche al client già creato.
+
+        Con le stesse opzioni non fa nulla: la entry viene aggiornata anche
+        per salvare token e lock_no, e lo stato del circuito va conservato.
+        """
+        if dict(options) == self._retry_options:
+            return
+        self._retry_options = dict(options)
+        self._retry_policy = RetryPolicy.from_options(options)
+        if self._client is not None:
+            self._client.retry_policy = self._retry_policy
+
+    async def _async_login_and_store_token(self) -> None:
         """Login al server e salva il token in memoria."""
         try:
-            self._token = self._client.login()
+            self._token = await self._client.login()
             _LOGGER.info("EZVIZ HP7: login OK, token pronto")
         except Exception as e:
             _LOGGER.error("EZVIZ HP7: login fallito: %s", e)
             raise
 
-    def login(self) -> bool:
+    async def async_login(self) -> bool:
         """Compatibile con setup entry di Home Assistant."""
-        self.ensure_client()
+        await self.async_ensure_client()
         return True
 
-    def detect_capabilities(self, serial: str) -> None:
+    async def async_detect_capabilities(self, serial: str) -> None:
         """Rileva le capabilities del device (di default True)."""
-        self.ensure_client()
+        await self.async_ensure_client()
         try:
-            dev = self._client.get_device_infos(serial).get(serial, {})
+            camera = self._cameras.get(serial)
+            # Dopo il primo refresh la pagelist è già nella camera persistente
+            dev = (
+                camera.fetch_key(["deviceInfos"], {})
+                if camera
+                else (await self._client.get_device_infos(serial)).get("deviceInfos", {})
+            )
             _LOGGER.info("EZVIZ HP7: device %s info=%s", serial, dev)
         except Exception as e:
             _LOGGER.debug("detect_capabilities fallita: %s", e)
         self.supports_door = True
         self.supports_gate = True
 
-    def list_devices(self) -> Dict[str, Dict[str, Any]]:
-        self.ensure_client()
-        devices = self._client.get_device_infos()
+    def start_push(self, on_message: Callable[[Dict[str, Any]], None]) -> None:
+        """Avvia il client MQTT dell'account per ricevere gli allarmi in push.
+
+        Bloccante (paho + requests): va eseguito nell'executor dopo async_login.
+        """
+        if self._client is None:
+            raise RuntimeError("login non eseguito")
+        # paho-mqtt caricato solo qui, fuori dall'import dell'integrazione
+        from .pylocalapi.mqtt import MQTTClient
+
+        token = self._client.export_token()
+        session = requests.Session()
+        session.headers.update(REQUEST_HEADER)
+        session.headers["sessionId"] = str(token.get("session_id"))
+        mqtt_client = MQTTClient(
+            token=token, session=session, on_message_callback=on_message
+        )
+        mqtt_client.connect()
+        self._mqtt_client = mqtt_client
+        _LOGGER.info("EZVIZ HP7: push MQTT attivo")
+
+    def refresh_push_session(self, token: Dict[str, Any]) -> None:
+        """Riavvia il push lato server con la sessione nuova (bloccante, da executor)."""
+        mqtt_client = self._mqtt_client
+        if mqtt_client is None:
+            return
+        mqtt_client.update_token(token)
+        _LOGGER.debug("EZVIZ HP7: push MQTT rinnovato con la nuova sessione")
+
+    def stop_push(self) -> None:
+        """Ferma il client MQTT, se attivo (bloccante, da executor)."""
+        mqtt_client, self._mqtt_client = self._mqtt_client, None
+        if mqtt_client is None:
+            return
+        try:
+            mqtt_client.stop()
+        except Exception as e:
+            _LOGGER.debug("stop_push fallita: %s", e)
+        mqtt_client.close()
+
+    @staticmethod
+    def serial_matches(serial: str, device_serial: Optional[str]) -> bool:
+        """Confronta il serial del messaggio con quello configurato (anche long serial con '-')."""
+        if not device_serial:
+            return False
+        return device_serial == serial or device_serial in serial.split("-")
+
+    @staticmethod
+    def alarm_from_push(message: Dict[str, Any]) -> Dict[str, Any]:
+        """Converte un messaggio MQTT nei campi allarme del coordinator."""
+        ext = message.get("ext") if isinstance(message.get("ext"), dict) else {}
+        alarm = {
+            "motion": True,
+            "seconds_last_trigger": 0.0,
+            "last_alarm_time": ext.get("time"),
+            "last_alarm_pic": ext.get("image") or ext.get("default_pic_url"),
+            "alarm_name": message.get("alert") or message.get("title"),
+            "pic_checksum": ext.get("picChecksum"),
+            "pic_crypt": ext.get("is_encrypted"),
+        }
+        # I campi mancanti nel push restano quelli dell'ultimo polling
+        fields = {key: value for key, value in alarm.items() if value not in (None, "")}
+        if "last_alarm_pic" in fields:
+            # Checksum e cifratura descrivono l'immagine: con una nuova immagine
+            # valgono quelli del push (None se assenti), non quelli del vecchio allarme
+            fields["pic_checksum"] = alarm["pic_checksum"] or None
+            fields["pic_crypt"] = alarm["pic_crypt"]
+        return fields
+
+    async def async_list_devices(self) -> Dict[str, Dict[str, Any]]:
+        await self.async_ensure_client()
+        devices = await self._client.get_device_infos()
         result: Dict[str, Dict[str, Any]] = {}
         for serial, data in devices.items():
             name = data.get("name") or data.get("deviceName") or "Device"
             result[serial] = {"device_name": name}
         return result
 
-    def _try_unlock(self, serial: str, lock_no: int) -> bool:
-        self.ensure_client()
+    def warm_lock_route(self, serial: str) -> Dict[str, Any]:
+        """Calcola (senza I/O) la route della serratura dalla camera persistente.
+
+        resource_id/local_index/stream_token/lock_type vengono da resourceInfos
+        tramite EzvizCamera._resource_route; va richiamata quando cambia la pagelist.
+        """
+        camera = self._cameras.get(serial)
+        if camera is None:
+            return {}
+        resource_id, local_index, stream_token, lock_type = camera._resource_route()
+        route = self._lock_routes[serial] = {
+            "resource_id": resource_id,
+            "local_index": local_index,
+            "stream_token": stream_token,
+            "lock_type": lock_type,
+        }
+        return route
+
+    def restore_lock_numbers(self, serial: str, lock_numbers: Dict[str, int]) -> None:
+        """Ripristina i lock_no imparati (salvati nella config entry)."""
+        for action, lock_no in (lock_numbers or {}).items():
+            if action in LOCK_CANDIDATES:
+                self._lock_numbers[(serial, action)] = int(lock_no)
+
+    async def _async_try_unlock(self, serial: str, lock_no: int) -> Optional[bool]:
+        """True se il cloud conferma, False se rifiuta il comando, None su errore di rete/cloud."""
+        await self.async_ensure_client()
         user_id = self._token.get("username") or self._username
+        route = self._lock_routes.get(serial) or self.warm_lock_route(serial)
         try:
-            self._client.remote_unlock(serial, user_id, lock_no)
-            _LOGGER.info("remote_unlock OK (serial=%s, lock_no=%s)", serial, lock_no)
-            return True
-        except Exception as e:
+            await self._client.remote_unlock(serial, user_id, lock_no, **route)
+        except LOCK_TRANSPORT_ERRORS as e:
+            _LOGGER.warning(
+                "remote_unlock non inviato (serial=%s, lock_no=%s): %s", serial, lock_no, e
+            )
+            return None
+        except PyEzvizError as e:
+            # Il cloud ha risposto con un codice di errore: lock_no o route sbagliati
             _LOGGER.warning(
                 "remote_unlock KO (serial=%s, lock_no=%s): %s", serial, lock_no, e
             )
             return False
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            _LOGGER.warning(
+                "remote_unlock non inviato (serial=%s, lock_no=%s): %s", serial, lock_no, e
+            )
+            return None
+        _LOGGER.info("remote_unlock OK (serial=%s, lock_no=%s)", serial, lock_no)
+        return True
 
-    def unlock_door(self, serial: str) -> bool:
-        return self._try_unlock(serial, DEFAULT_DOOR_LOCK_NO) or self._try_unlock(
-            serial, DEFAULT_GATE_LOCK_NO
-        )
+    async def _async_unlock(self, serial: str, action: str) -> bool:
+        """Una sola richiesta quando il lock_no dell'azione è noto.
 
-    def unlock_gate(self, serial: str) -> bool:
-        return self._try_unlock(serial, DEFAULT_GATE_LOCK_NO) or self._try_unlock(
-            serial, DEFAULT_DOOR_LOCK_NO
-        )
+        Finché non lo è si provano i candidati in ordine e si memorizza il primo
+        confermato dal cloud. Se il cloud rifiuta il lock_no imparato, questo
+        viene dimenticato e si riprovano gli altri candidati; un errore di rete
+        o del cloud invece non cambia nulla (non dice niente sul routing).
+        """
+        key = (serial, action)
+        learned = self._lock_numbers.get(key)
+        if learned is not None:
+            result = await self._async_try_unlock(serial, learned)
+            if result is not False:
+                return bool(result)
+            del self._lock_numbers[key]
+            if self.on_lock_learned:
+                self.on_lock_learned(serial, action, None)
+
+        for lock_no in LOCK_CANDIDATES[action]:
+            if lock_no == learned:
+                continue
+            result = await self._async_try_unlock(serial, lock_no)
+            if result is None:
+                return False
+            if result:
+                self._lock_numbers[key] = lock_no
+                if self.on_lock_learned:
+                    self.on_lock_learned(serial, action, lock_no)
+                return True
+        return False
 
-    def get_status(self, serial: str) -> dict:
-        self.ensure_client()
+    async def async_unlock_door(self, serial: str) -> bool:
+        return await self._async_unlock(serial, "unlock_door")
+
+    async def async_unlock_gate(self, serial: str) -> bool:
+        return await self._async_unlock(serial, "unlock_gate")
+
+    def _camera(self, serial: str) -> EzvizCamera:
+        """Camera persistente del serial (creata vuota, riempita dal tier lento).
+
+        La camera serve solo da modello dati: l'I/O passa sempre dal client async.
+        """
+        camera = self._cameras.get(serial)
+        if camera is None:
+            camera = self._cameras[serial] = EzvizCamera(self._client, serial, {})
+        return camera
+
+    @staticmethod
+    def _device_fields(cam_status: dict) -> dict:
+        """Campi del tier lento (pagelist) usati dalle entità."""
+        wifi_info = cam_status.get("WIFI", {})
+        return {
+            "name": cam_status.get("name"), #Nome
+            "version": cam_status.get("version"), #Versione firmware
+            "upgrade_available": cam_status.get("upgrade_available"), #Disponibilità aggiornamneto? true/false
+            "status": cam_status.get("status"), #Disponibilità aggiornamneto? true/false
+            "wan_ip": cam_status.get("wan_ip"), #Indirizzo ip locale
+            "pir_status": cam_status.get("PIR_Status"), #Presenza di movimento? 1/0
+            #Info Wifi
+            "ssid": wifi_info.get("ssid"),
+            "signal": wifi_info.get("signal"),
+            "local_ip": cam_status.get("local_ip") or wifi_info.get("address"),
+        }
+
+    @staticmethod
+    def _alarm_fields(cam_status: dict) -> dict:
+        """Campi del tier veloce (ultimo allarme) usati dalle entità."""
+        return {
+            "motion": cam_status.get("Motion_Trigger"), #Presenza di movimento? true/false
+            "seconds_last_trigger": cam_status.get("Seconds_Last_Trigger"), #Secondi da ultimo movimento 0.0
+            "last_alarm_time": cam_status.get("last_alarm_time"), #Data ultimo allarme 2025-10-17 13:51:37
+            "last_alarm_pic": cam_status.get("last_alarm_pic"), #Pic ultima rilevazione
+            "alarm_name": cam_status.get("last_alarm_type_name"),
+            "pic_checksum": cam_status.get("last_alarm_pic_checksum"), #Checksum immagine (chiave cache)
+            "pic_crypt": cam_status.get("last_alarm_pic_crypt"), #Immagine cifrata? 0/1
+        }
+
+    async def async_get_device_statuses(self, serials: Iterable[str]) -> Dict[str, dict]:
+        """Tier lento per tutti i serial dell'account con una sola pagelist."""
+        await self.async_ensure_client()
         try:
-            camera = EzvizCamera(self._client, serial)
-            cam_status = camera.status(refresh=True)
-
-            wifi_info = cam_status.get("WIFI", {})
-
-            _LOGGER.info("EZVIZ HP7 RAW CAMERA JSON: %s", cam_status)
-            
-            return {
-                "name": cam_status.get("name"), #Nome
-                "version": cam_status.get("version"), #Versione firmware
-                "upgrade_available": cam_status.get("upgrade_available"), #Disponibilità aggiornamneto? true/false
-                "status": cam_status.get("status"), #Disponibilità aggiornamneto? true/false
-                "wan_ip": cam_status.get("wan_ip"), #Indirizzo ip locale
-                "pir_status": cam_status.get("PIR_Status"), #Presenza di movimento? 1/0
-                "motion": cam_status.get("Motion_Trigger"), #Presenza di movimento? true/false
-                "seconds_last_trigger": cam_status.get("Seconds_Last_Trigger"), #Secondi da ultimo movimento 0.0
-                "last_alarm_time": cam_status.get("last_alarm_time"), #Data ultimo allarme 2025-10-17 13:51:37
-                "last_alarm_pic": cam_status.get("last_alarm_pic"), #Pic ultima rilevazione
-                "alarm_name": cam_status.get("last_alarm_type_name"),
-                #Info Wifi
-                "ssid": wifi_info.get("ssid"),
-                "signal": wifi_info.get("signal"),
-                "local_ip": cam_status.get("local_ip") or wifi_info.get("address"),
-            }
+            # Tra due pagelist complete si scaricano solo le sezioni usate;
+            # il change set dice quali device sono davvero cambiati.
+            full = self._device_polls % FULL_PAGELIST_EVERY == 0
+            changes = await self._client.get_device_changes(
+                None if full else DEVICE_STATUS_SECTIONS
+            )
+        except Exception as e:
+            _LOGGER.warning("get_device_statuses fallita: %s", e)
+            return {}
+        self._device_polls += 1
+        for serial in changes.removed:
+            self._device_status.pop(serial, None)
+        touched = changes.touched()
+
+        result: Dict[str, dict] = {}
+        for serial in serials:
+            device = self._client.device_state.state(serial)
+            if device is None:
+                _LOGGER.debug("EZVIZ HP7: %s non presente nella pagelist", serial)
+                continue
+            if serial in touched or serial not in self._device_status:
+                camera = self._camera(serial)
+                if camera.update(device_payload=device):
+                    # resourceInfos/stream token possono essere cambiati
+                    self.warm_lock_route(serial)
+                self._device_status[serial] = self._device_fields(
+                    camera.status(refresh=False)
+                )
+            result[serial] = self._device_status[serial]
+        return result
+
+    @staticmethod
+    def alarm_event(message: Dict[str, Any]) -> Dict[str, Any]:
+        """Riassunto di un messaggio unifiedmsg per eventi e recent_alarms."""
+        ext = message.get("ext") if isinstance(message.get("ext"), dict) else {}
+        return {
+            "serial": message.get("deviceSerial"),
+            "msg_id": message.get("msgId"),
+            "time": message.get("timeStr") or message.get("time"),
+            "alarm_name": message.get("title") or message.get("detail") or message.get("sampleName"),
+            "alarm_type": ext.get("alarmType") or message.get("subType"),
+            # Tipo canonico dai codici (il titolo è localizzato): instrada ai binary sensor
+            "kind": classify_alarm(message).value,
+            "pic": message.get("pic") or message.get("defaultPic"),
+        }
 
+    async def async_get_alarm_statuses(self, serials: Iterable[str]) -> Dict[str, dict]:
+        """Tier veloce per tutti i serial dell'account.
+
+        sync_messages legge dal più recente fino ai messaggi già visti: a regime
+        una sola richiesta, e un burst di allarmi tra due poll arriva completo in
+        "new_alarms" (ogni messaggio una sola volta). Le camere persistenti
+        applicano l'ultimo allarme senza ricostruire i campi pagelist.
+        """
+        await self.async_ensure_client()
+        serial_list = list(serials)
+        try:
+            batch = await self._client.sync_messages(serial_list)
         except Exception as e:
-            _LOGGER.warning("get_status fallita per %s: %s", serial, e)
+            _LOGGER.warning("get_alarm_statuses fallita: %s", e)
+            return {}
+        if batch.read:
+            await self._async_store_alarms(batch.read)
+
+        new_by_serial = batch.new_by_serial()
+        result: Dict[str, dict] = {}
+        for serial in serial_list:
+            camera = self._camera(serial)
+            camera.update(latest_alarm=batch.latest.get(serial))
+            result[serial] = self._alarm_fields(camera.status(refresh=False))
+            if serial in new_by_serial:
+                result[serial]["new_alarms"] = [
+                    self.alarm_event(message) for message in new_by_serial[serial]
+                ]
+        return result
+
+    async def _async_store_alarms(self, messages: Iterable[Dict[str, Any]]) -> None:
+        """Salva nello storico locale i messaggi letti (anche quelli della baseline).
+
+        I msgId già presenti vengono ignorati; SQLite è bloccante, quindi fuori dal loop.
+        """
+        if self.alarm_store is None:
+            return
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.alarm_store.add_many, list(messages)
+            )
+        except sqlite3.Error as e:
+            _LOGGER.warning("Salvataggio storico allarmi fallito: %s", e)
+
+    async def async_get_device_status(self, serial: str) -> dict:
+        """Tier lento per un singolo serial."""
+        return (await self.async_get_device_statuses([serial])).get(serial, {})
+
+    async def async_get_alarm_status(self, serial: str) -> dict:
+        """Tier veloce per un singolo serial."""
+        return (await self.async_get_alarm_statuses([serial])).get(serial, {})
+
+    async def async_get_status(self, serial: str) -> dict:
+        """Stato completo (entrambi i tier)."""
+        return {
+            **await self.async_get_device_status(serial),
+            **await self.async_get_alarm_status(serial),
+        }
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """Metriche delle richieste HTTP del client dell'account (conteggi, latenze, re-login, circuito)."""
+        if self._client is None:
             return {}
+        return {
+            **self._client.metrics.snapshot(),
+            "circuit": self._retry_policy.snapshot(),
+        }
+
+    @staticmethod
+    def is_encrypted(pic_crypt: Any) -> bool:
+        """picCrypt/is_encrypted arrivano come int o stringa ("0" = in chiaro)."""
+        return str(pic_crypt).strip().lower() not in ("", "0", "none", "false")
+
+    async def async_fetch_snapshot(
+        self, serial: str, url: str, encrypted: bool = False
+    ) -> bytes:
+        """Scarica l'immagine di un allarme e la decifra se serve.
+
+        La decifratura avviene anche se il flag manca ma i byte hanno
+        l'header HIK; la chiave della camera viene letta una volta e tenuta.
+        """
+        await self.async_ensure_client()
+        headers = {
+            "User-Agent": "EZVIZ/5.0",
+            "Authorization": f"Bearer {(self._token or {}).get('access_token')}",
+        }
+        data = await self._client.get_picture(url, headers=headers)
+        if not encrypted and data.find(HIK_ENCRYPTION_HEADER, 0, 1024) == -1:
+            return data
+
+        key = self._cam_keys.get(serial)
+        if key is None:
+            key = self._cam_keys[serial] = await self._client.get_cam_key(serial)
+        try:
+            # AES su qualche centinaio di KB: fuori dal loop
+            return await asyncio.get_running_loop().run_in_executor(
+                None, decrypt_image, data, key
+            )
+        except PyEzvizError:
+            # Chiave cambiata (es. reset del device): riletta al prossimo tentativo
+            self._cam_keys.pop(serial, None)
+            raise
+
+    def close(self) -> None:
+        """Chiude il push MQTT (bloccante); la sessione aiohttp è di Home Assistant."""
+        self.stop_push()
@@ -11,6 +11,7 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
+from .pylocalapi.alarm_kinds import AlarmKind
 
 
 def _to_bool(v) -> bool:
@@ -28,35 +29,28 @@ def _to_bool(v) -> bool:
     return False
 
 
-ALARM_FIELD = "alarm_name"
-ALARM_TIME_FIELD = "last_alarm_time"
-
 PULSE_SECONDS = 3
 
 SIMPLE_MAP = [
     ("Motion_Trigger", "motion_trigger", BinarySensorDeviceClass.MOTION),
 ]
 
+# Un binary sensor per tipo canonico (pylocalapi.alarm_kinds): niente confronti
+# sui titoli localizzati, il coordinator chiama solo l'entità del tipo giusto
 ALARM_MAP = [
-    (["Smart Detection Alarm"],
+    (AlarmKind.SMART_DETECTION,
      "Allarme Smart Detection", "smart_detection_alarm", None, "mdi:run"),
 
-    (["Intelligent Detection Alarm"],
+    (AlarmKind.INTELLIGENT_DETECTION,
      "Allarme Intelligente", "intelligent_detection_alarm", None, "mdi:account-search"),
 
-    (["Your doorbell is ringing"],
+    (AlarmKind.DOORBELL,
      "Citofono – Campanello", "doorbell_ringing", None, "mdi:doorbell"),
 
-    ([
-        "EZVIZ app open the gate",
-        "Monitor open the gate"
-     ],
+    (AlarmKind.GATE_OPEN,
      "Citofono – Cancello", "gate_open", None, "mdi:gate-open"),
 
-    ([
-        "EZVIZ app unlock the lock",
-        "Monitor unlock the lock"
-     ],
+    (AlarmKind.LOCK_OPEN,
      "Citofono – Serratura", "unlock_lock", None, "mdi:lock-open-variant"),
 ]
 
@@ -70,12 +64,12 @@ async def async_setup_entry(hass, entry, async_add_entities):
     for key, translation_key, dc in SIMPLE_MAP:
         ents.append(Hp7BinarySimple(coordinator, serial, key, translation_key, dc))
 
-    for match_values, name, unique_suffix, dc, icon in ALARM_MAP:
+    for kind, name, unique_suffix, dc, icon in ALARM_MAP:
         ents.append(
             Hp7BinaryAlarm(
                 coordinator,
                 serial,
-                match_values,
+                kind,
                 name,
                 unique_suffix,
                 dc,
@@ -99,7 +93,7 @@ class Hp7BinarySimple(CoordinatorEntity, BinarySensorEntity):
 
     @property
     def is_on(self) -> bool:
-        data = self.coordinator.data or {}
+        data = self.coordinator.device_data(self._serial)
         val = data.get(self._key)
         return _to_bool(val)
 
@@ -120,7 +114,7 @@ class Hp7BinaryAlarm(CoordinatorEntity, BinarySensorEntity):
         self,
         coordinator,
         serial: str,
-        match_values: list[str],
+        kind: AlarmKind,
         name: str,
         unique_suffix: str,
         device_class,
@@ -128,7 +122,7 @@ class Hp7BinaryAlarm(CoordinatorEntity, BinarySensorEntity):
     ):
         super().__init__(coordinator)
         self._serial = serial
-        self._match_values = match_values
+        self._kind = kind
 
         self._attr_name = name
         self._attr_unique_id = f"{DOMAIN}_{serial}_alarm_{unique_suffix}"
@@ -136,9 +130,16 @@ class Hp7BinaryAlarm(CoordinatorEntity, BinarySensorEntity):
         self._attr_icon = icon
 
         self._last_trigger = None
-        self._prev_alarm_time = None
         self._off_unsub = None
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_subscribe_alarm_kind(
+                self._serial, self._kind, self._handle_alarm
+            )
+        )
+
     @property
     def is_on(self) -> bool:
         """ON solo per PULSE_SECONDS dopo l'ultimo trigger."""
@@ -159,21 +160,10 @@ class Hp7BinaryAlarm(CoordinatorEntity, BinarySensorEntity):
         self._off_unsub = async_call_later(self.hass, PULSE_SECONDS, _cb)
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Chiamato quando arrivano nuovi dati dal coordinator."""
-        data = self.coordinator.data or {}
-        current_alarm = data.get(ALARM_FIELD)
-        current_alarm_time = data.get(ALARM_TIME_FIELD)
-
-        if (
-            current_alarm in self._match_values
-            and current_alarm_time is not None
-            and current_alarm_time != self._prev_alarm_time
-        ):
-            self._prev_alarm_time = current_alarm_time
-            self._last_trigger = dt_util.utcnow()
-            self._schedule_state_update()
-
+    def _handle_alarm(self, alarm: dict) -> None:
+        """Chiamato dal coordinator per ogni nuovo allarme di questo tipo."""
+        self._last_trigger = dt_util.utcnow()
+        self._schedule_state_update()
         self.async_write_ha_state()
 
     @property
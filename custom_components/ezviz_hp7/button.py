@@ -11,20 +11,22 @@ async def async_setup_entry(hass, entry, async_add_entities):
     data = hass.data[DOMAIN][entry.entry_id]
     api = data["api"]
     serial = data["serial"]
+    coordinator = data["coordinator"]
 
     entities = []
     if getattr(api, "supports_gate", False):
-        entities.append(EzvizHp7Button(api, serial, "unlock_gate"))
+        entities.append(EzvizHp7Button(api, coordinator, serial, "unlock_gate"))
     if getattr(api, "supports_door", False):
-        entities.append(EzvizHp7Button(api, serial, "unlock_door"))
+        entities.append(EzvizHp7Button(api, coordinator, serial, "unlock_door"))
     async_add_entities(entities)
 
 class EzvizHp7Button(ButtonEntity):
     """Button entity to unlock door or gate."""
     _attr_has_entity_name = True
 
-    def __init__(self, api: "Hp7Api", serial: str, action: str):
+    def __init__(self, api: "Hp7Api", coordinator, serial: str, action: str):
         self._api = api
+        self._coordinator = coordinator
         self._serial = serial
         self._action = action
         self._attr_translation_key = action
@@ -43,10 +45,12 @@ class EzvizHp7Button(ButtonEntity):
         """Handle button press."""
         _LOGGER.warning("EZVIZ HP7: button pressed '%s' (%s)", self._action, self._serial)
         if self._action == "unlock_gate":
-            ok = await self.hass.async_add_executor_job(self._api.unlock_gate, self._serial)
+            ok = await self._api.async_unlock_gate(self._serial)
             _LOGGER.log(logging.INFO if ok else logging.ERROR,
                         "EZVIZ HP7: 'Unlock Gate' %s.", "OK" if ok else "FAILED")
         elif self._action == "unlock_door":
-            ok = await self.hass.async_add_executor_job(self._api.unlock_door, self._serial)
+            ok = await self._api.async_unlock_door(self._serial)
             _LOGGER.log(logging.INFO if ok else logging.ERROR,
                         "EZVIZ HP7: 'Unlock Door' %s.", "OK" if ok else "FAILED")
+        # Dopo uno sblocco qualcuno è alla porta: polling rapido per il burst
+        self._coordinator.async_burst()
@@ -2,10 +2,10 @@ from __future__ import annotations
 import logging
 
 from homeassistant.components.camera import Camera
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo
 from .const import DOMAIN
+from .snapshot import resize_image, snapshot_key, thumbnail_bucket
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,26 +37,37 @@ class Hp7LastSnapshotCamera(Camera, CoordinatorEntity):
         )
 
     async def async_camera_image(self, width: int | None = None, height: int | None = None):
-        url = (self.coordinator.data or {}).get("last_alarm_pic")
+        data = self.coordinator.device_data(self._serial)
+        url = data.get("last_alarm_pic")
         if not url:
             return None
 
-        session = async_get_clientsession(self.hass)
-        headers = {
-            "User-Agent": "EZVIZ/5.0",
-            "Authorization": f"Bearer {self.coordinator.api._token.get('access_token')}"
-        }
-
+        # L'immagine cambia solo con un nuovo allarme: cache condivisa dell'account
+        api = self.coordinator.api
+        encrypted = api.is_encrypted(data.get("pic_crypt"))
+        key = snapshot_key(self._serial, url, data.get("pic_checksum"))
+        snapshots = self.coordinator.snapshots
         try:
-            async with session.get(url, headers=headers, timeout=15) as resp:
-                if resp.status == 200:
-                    return await resp.read()
-                else:
-                    _LOGGER.warning("Snapshot fetch failed: %s %s", resp.status, await resp.text())
+            image = await snapshots.async_get_or_fetch(
+                key, lambda: api.async_fetch_snapshot(self._serial, url, encrypted)
+            )
         except Exception as e:
             _LOGGER.warning("Errore download snapshot da %s: %s", url, e)
             return None
-    
+
+        # Miniatura per card piccole: calcolata una volta per bucket, fuori dal loop
+        bucket = thumbnail_bucket(width, height)
+        if not image or bucket is None:
+            return image
+
+        async def _async_thumbnail() -> bytes:
+            # Già piccola o Pillow assente: in cache l'originale, così la
+            # prossima richiesta non rifà la decodifica nell'executor
+            thumb = await self.hass.async_add_executor_job(resize_image, image, bucket)
+            return thumb or image
+
+        return await snapshots.async_get_or_fetch(f"{key}@{bucket}", _async_thumbnail)
+
 
     @property
     def supported_features(self) -> int:
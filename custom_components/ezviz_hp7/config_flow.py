@@ -1,7 +1,31 @@
 from __future__ import annotations
 import voluptuous as vol
 from homeassistant import config_entries
-from .const import DOMAIN, CONF_REGION, CONF_SERIAL
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from .const import (
+    DOMAIN,
+    CONF_REGION,
+    CONF_SERIAL,
+    CONF_BACKOFF_FACTOR,
+    CONF_BREAKER_RESET,
+    CONF_BREAKER_THRESHOLD,
+    CONF_BURST_DURATION,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_RETRY_BASE_DELAY,
+    CONF_RETRY_BUDGET,
+    CONF_RETRY_MAX_DELAY,
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_BREAKER_RESET_SEC,
+    DEFAULT_BREAKER_THRESHOLD,
+    DEFAULT_BURST_DURATION_SEC,
+    DEFAULT_MAX_INTERVAL_SEC,
+    DEFAULT_MIN_INTERVAL_SEC,
+    DEFAULT_RETRY_BASE_DELAY_SEC,
+    DEFAULT_RETRY_BUDGET,
+    DEFAULT_RETRY_MAX_DELAY_SEC,
+)
 from .api import Hp7Api
 import logging
 
@@ -24,6 +48,11 @@ def _looks_like_long_serial(s: str) -> bool:
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return OptionsFlowHandler()
+
     def __init__(self) -> None:
         self._cached_creds: dict | None = None
         self._device_options: dict[str, str] | None = None
@@ -33,9 +62,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is None:
             return self.async_show_form(step_id="user", data_schema=DATA_SCHEMA)
 
-        api = Hp7Api(user_input["username"], user_input["password"], user_input[CONF_REGION])
+        api = Hp7Api(
+            user_input["username"],
+            user_input["password"],
+            user_input[CONF_REGION],
+            session=async_get_clientsession(self.hass),
+        )
         try:
-            ok = await self.hass.async_add_executor_job(api.login)
+            ok = await api.async_login()
             if not ok:
                 raise RuntimeError("login_failed")
 
@@ -43,8 +77,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 user_input["token"] = api._token
 
             devices: dict[str, dict] = {}
-            if hasattr(api, "list_devices"):
-                devices = await self.hass.async_add_executor_job(api.list_devices)
+            if hasattr(api, "async_list_devices"):
+                devices = await api.async_list_devices()
         except Exception as e:
             _LOGGER.exception("EZVIZ login/list_devices failed: %s", e)
             return self.async_show_form(
@@ -145,3 +179,56 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         data = {**(self._cached_creds or {}), CONF_SERIAL: norm_serial}
         title = f"EZVIZ HP7 ({norm_serial})"
         return self.async_create_entry(title=title, data=data)
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Opzioni di polling adattivo e retry (condivise dalle entry dello stesso account)."""
+
+    async def async_step_init(self, user_input=None):
+        errors = {}
+        if user_input is not None:
+            if user_input[CONF_MAX_INTERVAL] < user_input[CONF_MIN_INTERVAL]:
+                errors["base"] = "interval_range"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = {**self.config_entry.options, **(user_input or {})}
+        schema = vol.Schema({
+            vol.Required(
+                CONF_MIN_INTERVAL,
+                default=options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL_SEC),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=300)),
+            vol.Required(
+                CONF_MAX_INTERVAL,
+                default=options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL_SEC),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+            vol.Required(
+                CONF_BACKOFF_FACTOR,
+                default=options.get(CONF_BACKOFF_FACTOR, DEFAULT_BACKOFF_FACTOR),
+            ): vol.All(vol.Coerce(float), vol.Range(min=1.0, max=4.0)),
+            vol.Required(
+                CONF_BURST_DURATION,
+                default=options.get(CONF_BURST_DURATION, DEFAULT_BURST_DURATION_SEC),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+            vol.Required(
+                CONF_RETRY_BASE_DELAY,
+                default=options.get(CONF_RETRY_BASE_DELAY, DEFAULT_RETRY_BASE_DELAY_SEC),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=30.0)),
+            vol.Required(
+                CONF_RETRY_MAX_DELAY,
+                default=options.get(CONF_RETRY_MAX_DELAY, DEFAULT_RETRY_MAX_DELAY_SEC),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=300)),
+            vol.Required(
+                CONF_RETRY_BUDGET,
+                default=options.get(CONF_RETRY_BUDGET, DEFAULT_RETRY_BUDGET),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=200)),
+            vol.Required(
+                CONF_BREAKER_THRESHOLD,
+                default=options.get(CONF_BREAKER_THRESHOLD, DEFAULT_BREAKER_THRESHOLD),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+            vol.Required(
+                CONF_BREAKER_RESET,
+                default=options.get(CONF_BREAKER_RESET, DEFAULT_BREAKER_RESET_SEC),
+            ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+        })
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
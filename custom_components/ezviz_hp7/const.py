@@ -2,4 +2,40 @@ DOMAIN = "ezviz_hp7"
 CONF_REGION = "region"
 CONF_SERIAL = "serial"
 PLATFORMS = ["button", "sensor", "binary_sensor", "camera"]
-UPDATE_INTERVAL_SEC = 2  # polling rapido per eventi
+UPDATE_INTERVAL_SEC = 2  # polling rapido per eventi (tier veloce: ultimo allarme)
+DEVICE_REFRESH_INTERVAL_SEC = 900  # tier lento: pagelist (firmware, wifi, ip)
+PUSH_FALLBACK_INTERVAL_SEC = 300  # polling di sicurezza quando il push MQTT è attivo
+SNAPSHOT_CACHE_MAX_BYTES = 8 * 1024 * 1024  # immagini allarme in memoria (per account)
+PUSH_CONFIRM_DELAY_SEC = 60  # refresh di conferma dopo un allarme push (finestra movimento)
+RECENT_ALARMS_MAX = 10  # allarmi recenti tenuti per device (attributo recent_alarms)
+DISPATCHED_ALARMS_MAX = 200  # allarmi già smistati ai binary sensor (stesso allarme da push e polling)
+DISPATCH_DEDUP_WINDOW_SEC = 5  # stesso serial e tipo entro questa distanza: stesso allarme
+EVENT_ALARM = f"{DOMAIN}_alarm"  # evento HA per ogni nuovo messaggio unifiedmsg
+
+# Storico allarmi locale (SQLite nella cartella di configurazione)
+ALARM_HISTORY_FILE = f"{DOMAIN}_alarms.db"
+ALARM_HISTORY_RETENTION_DAYS = 30  # allarmi più vecchi eliminati dallo storico
+ALARM_HISTORY_LIMIT = 100  # allarmi restituiti di default dal servizio alarm_history
+SERVICE_ALARM_HISTORY = "alarm_history"
+
+# Polling adattivo (opzioni dell'integrazione)
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
+CONF_BACKOFF_FACTOR = "backoff_factor"
+CONF_BURST_DURATION = "burst_duration"
+DEFAULT_MIN_INTERVAL_SEC = UPDATE_INTERVAL_SEC  # intervallo durante un burst (allarme, sblocco, push)
+DEFAULT_MAX_INTERVAL_SEC = 60  # intervallo massimo a riposo senza push
+DEFAULT_BACKOFF_FACTOR = 1.5  # allargamento dell'intervallo a ogni refresh senza novità
+DEFAULT_BURST_DURATION_SEC = 120  # durata del polling rapido dopo un evento
+
+# Retry e circuit breaker verso il cloud (opzioni dell'integrazione)
+CONF_RETRY_BASE_DELAY = "retry_base_delay"
+CONF_RETRY_MAX_DELAY = "retry_max_delay"
+CONF_RETRY_BUDGET = "retry_budget"
+CONF_BREAKER_THRESHOLD = "breaker_threshold"
+CONF_BREAKER_RESET = "breaker_reset"
+DEFAULT_RETRY_BASE_DELAY_SEC = 0.5  # primo ritardo prima di un retry (poi esponenziale con jitter)
+DEFAULT_RETRY_MAX_DELAY_SEC = 15  # tetto del singolo ritardo
+DEFAULT_RETRY_BUDGET = 20  # retry consecutivi concessi prima di rallentare a 1 ogni 5 s
+DEFAULT_BREAKER_THRESHOLD = 5  # errori di rete/5xx consecutivi prima di aprire il circuito
+DEFAULT_BREAKER_RESET_SEC = 60  # attesa a circuito aperto prima di una richiesta di prova
@@ -1,26 +1,412 @@
 from __future__ import annotations
+import asyncio
+from collections import OrderedDict, deque
 import logging
+import time
 from datetime import timedelta, datetime
+from typing import Any, Callable, Mapping
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from .const import UPDATE_INTERVAL_SEC
+from homeassistant.util import dt as dt_util
+from .const import (
+    CONF_BACKOFF_FACTOR,
+    CONF_BURST_DURATION,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_BURST_DURATION_SEC,
+    DEFAULT_MAX_INTERVAL_SEC,
+    DEFAULT_MIN_INTERVAL_SEC,
+    DEVICE_REFRESH_INTERVAL_SEC,
+    DISPATCH_DEDUP_WINDOW_SEC,
+    DISPATCHED_ALARMS_MAX,
+    DOMAIN,
+    EVENT_ALARM,
+    PUSH_CONFIRM_DELAY_SEC,
+    PUSH_FALLBACK_INTERVAL_SEC,
+    RECENT_ALARMS_MAX,
+    SNAPSHOT_CACHE_MAX_BYTES,
+)
 from .api import Hp7Api
+from .pylocalapi.alarm_kinds import AlarmKind, classify_alarm
+from .snapshot import SnapshotCache
 
 _LOGGER = logging.getLogger(__name__)
 
+# Campi che, se cambiano, indicano un evento e fanno ripartire il polling rapido
+EVENT_FIELDS = ("last_alarm_time", "alarm_name", "motion")
+
+
+def _alarm_moment(value: Any) -> datetime | None:
+    """Ora dell'allarme come datetime locale naive.
+
+    Il push riporta la stringa del device ("2026-10-18 08:15:02"), unifiedmsg
+    timeStr oppure l'epoch in ms: tutto ricondotto alla stessa forma.
+    """
+    if isinstance(value, str):
+        try:
+            return datetime.strptime(value.strip()[:19], "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            pass
+    if isinstance(value, bool):
+        return None
+    try:
+        stamp = float(value)
+    except (TypeError, ValueError):
+        return None
+    if stamp > 1e11:
+        stamp /= 1000.0
+    return dt_util.as_local(dt_util.utc_from_timestamp(stamp)).replace(tzinfo=None)
+
+
+class AdaptiveInterval:
+    """Intervallo di polling adattivo.
+
+    A riposo l'intervallo cresce di ``backoff`` a ogni refresh senza novità,
+    fino a ``max_interval`` (o al tetto passato a next_interval). Un evento
+    (allarme, sblocco, messaggio push) apre una finestra di ``burst_duration``
+    secondi in cui si torna a ``min_interval``.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = DEFAULT_MIN_INTERVAL_SEC,
+        max_interval: float = DEFAULT_MAX_INTERVAL_SEC,
+        backoff: float = DEFAULT_BACKOFF_FACTOR,
+        burst_duration: float = DEFAULT_BURST_DURATION_SEC,
+    ):
+        self.configure(min_interval, max_interval, backoff, burst_duration)
+        self.current = self.min_interval
+        self._burst_until = 0.0
+
+    def configure(
+        self,
+        min_interval: float,
+        max_interval: float,
+        backoff: float,
+        burst_duration: float,
+    ) -> None:
+        self.min_interval = max(1.0, float(min_interval))
+        self.max_interval = max(self.min_interval, float(max_interval))
+        self.backoff = max(1.0, float(backoff))
+        self.burst_duration = max(0.0, float(burst_duration))
+
+    def burst(self, now: float | None = None) -> float:
+        """Apre (o prolunga) la finestra di polling rapido."""
+        now = time.monotonic() if now is None else now
+        self._burst_until = now + self.burst_duration
+        self.current = self.min_interval
+        return self.current
+
+    def next_interval(
+        self, changed: bool, now: float | None = None, ceiling: float | None = None
+    ) -> float:
+        """Intervallo fino al prossimo refresh, dato l'esito di quello appena fatto."""
+        now = time.monotonic() if now is None else now
+        if changed:
+            return self.burst(now)
+        if now < self._burst_until:
+            self.current = self.min_interval
+        else:
+            limit = self.max_interval if ceiling is None else max(ceiling, self.min_interval)
+            self.current = min(self.current * self.backoff, limit)
+        return self.current
+
+
 class Hp7Coordinator(DataUpdateCoordinator):
-    """Gestisce l'aggiornamento periodico dei dati EZVIZ HP7."""
+    """Gestisce l'aggiornamento periodico dei dati EZVIZ HP7 di un account.
+
+    Un solo coordinator (e un solo client/login) per account EZVIZ: ogni
+    refresh interroga insieme tutti i serial configurati e i dati vengono
+    distribuiti alle entry come ``data[serial]``.
 
-    def __init__(self, hass, api: Hp7Api, serial: str):
+    Con il push MQTT attivo gli allarmi arrivano subito dal broker EZVIZ e il
+    polling diventa solo una rete di sicurezza (PUSH_FALLBACK_INTERVAL_SEC).
+
+    L'intervallo è adattivo (AdaptiveInterval): si allarga quando non cambia
+    nulla e torna rapido dopo un allarme, uno sblocco o un messaggio push.
+
+    Il polling è diviso in due tier: quello veloce (update_interval) legge solo
+    l'ultimo allarme, quello lento (DEVICE_REFRESH_INTERVAL_SEC) riscarica la
+    pagelist; l'ultimo risultato del tier lento viene unito a ogni update veloce.
+    """
+
+    def __init__(self, hass, api: Hp7Api):
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=None,
             name="EZVIZ HP7",
-            update_interval=timedelta(seconds=UPDATE_INTERVAL_SEC),
+            update_interval=timedelta(seconds=DEFAULT_MIN_INTERVAL_SEC),
         )
         self.api = api
-        self.serial = serial
+        self.scheduler = AdaptiveInterval()
+        self.snapshots = SnapshotCache(SNAPSHOT_CACHE_MAX_BYTES)
+        self.serials: set[str] = set()
+        self.push_active = False
+        self._push_confirm_unsub = None
+        # Rinnovo del push dopo un refresh del token: uno alla volta, vale l'ultimo token
+        self._push_session_task: asyncio.Task | None = None
+        self._push_session_token: dict[str, Any] | None = None
+        self._device_data: dict[str, dict[str, Any]] = {}
+        self._device_refreshed_at: float | None = None
+        self._recent_alarms: dict[str, deque[dict[str, Any]]] = {}
+        # Snapshot delle metriche HTTP preso una volta per refresh, letto dai sensori
+        self.metrics: dict[str, Any] = {}
+        # (serial, tipo canonico) -> entità iscritte: un lookup per allarme
+        self._kind_listeners: dict[tuple[str, str], list[Callable[[dict[str, Any]], None]]] = {}
+        # Allarmi già smistati, per msgId e per (serial, tipo, ora): push e
+        # polling non garantiscono lo stesso msgId per lo stesso allarme
+        self._dispatched: OrderedDict[str, None] = OrderedDict()
+        self._dispatched_moments: deque[tuple[str, str, datetime]] = deque(
+            maxlen=DISPATCHED_ALARMS_MAX
+        )
+
+    def add_serial(self, serial: str) -> None:
+        """Aggiunge un serial; il tier lento viene riletto al prossimo refresh."""
+        if serial not in self.serials:
+            self.serials.add(serial)
+            self._device_refreshed_at = None
+
+    def remove_serial(self, serial: str) -> None:
+        self.serials.discard(serial)
+        self._device_data.pop(serial, None)
+        self._recent_alarms.pop(serial, None)
+
+    def device_data(self, serial: str) -> dict[str, Any]:
+        """Dati correnti di un singolo device."""
+        return (self.data or {}).get(serial) or {}
+
+    def configure_scheduler(self, options: Mapping[str, Any]) -> None:
+        """Applica le opzioni di polling adattivo dell'entry (None = valore di default)."""
+
+        def option(key: str, default: float) -> Any:
+            value = options.get(key)
+            return default if value is None else value
+
+        self.scheduler.configure(
+            option(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL_SEC),
+            option(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL_SEC),
+            option(CONF_BACKOFF_FACTOR, DEFAULT_BACKOFF_FACTOR),
+            option(CONF_BURST_DURATION, DEFAULT_BURST_DURATION_SEC),
+        )
+        self._set_interval(self.scheduler.burst())
+
+    def _set_interval(self, seconds: float) -> None:
+        self.update_interval = timedelta(seconds=seconds)
+
+    @callback
+    def async_burst(self) -> None:
+        """Torna subito al polling rapido (es. dopo la pressione di uno sblocco)."""
+        self._set_interval(self.scheduler.burst())
+        self.hass.async_create_task(self.async_request_refresh())
+
+    def _idle_ceiling(self) -> float:
+        """Con il push attivo gli eventi arrivano dal broker: a riposo si può rallentare di più."""
+        if self.push_active:
+            return max(self.scheduler.max_interval, PUSH_FALLBACK_INTERVAL_SEC)
+        return self.scheduler.max_interval
+
+    def _has_new_events(self, data: dict[str, dict[str, Any]]) -> bool:
+        previous = self.data or {}
+        return any(
+            serial in previous
+            and any(values.get(f) != previous[serial].get(f) for f in EVENT_FIELDS)
+            for serial, values in data.items()
+        )
+
+    def _device_tier_due(self) -> bool:
+        return (
+            self._device_refreshed_at is None
+            or time.monotonic() - self._device_refreshed_at >= DEVICE_REFRESH_INTERVAL_SEC
+        )
 
     async def _async_update_data(self):
-        """Richiede i dati più recenti dall’API."""
-        return await self.hass.async_add_executor_job(self.api.get_status, self.serial)
+        """Richiede i dati più recenti dall’API per tutti i serial dell'account."""
+        serials = sorted(self.serials)
+        if not serials:
+            return {}
+
+        if self._device_tier_due():
+            device_data = await self.api.async_get_device_statuses(serials)
+            # Se il tier lento fallisce si tengono i dati precedenti
+            if device_data:
+                self._device_data.update(device_data)
+                self._device_refreshed_at = time.monotonic()
+
+        alarm_data = await self.api.async_get_alarm_statuses(serials)
+        for serial, values in alarm_data.items():
+            self._dispatch_new_alarms(serial, values.pop("new_alarms", ()))
+        data = {
+            serial: {
+                **self._device_data.get(serial, {}),
+                **alarm_data.get(serial, {}),
+                "recent_alarms": list(self._recent_alarms.get(serial, ())),
+            }
+            for serial in serials
+        }
+        # Il prossimo refresh viene programmato dopo il return con questo intervallo
+        changed = self._has_new_events(data)
+        self._set_interval(
+            self.scheduler.next_interval(changed, ceiling=self._idle_ceiling())
+        )
+        self.metrics = self.api.metrics_snapshot()
+        return data
+
+    def _dispatch_new_alarms(self, serial: str, alarms) -> None:
+        """Un evento HA per ogni nuovo allarme (in ordine) e coda dei recenti."""
+        if not alarms:
+            return
+        recent = self._recent_alarms.setdefault(serial, deque(maxlen=RECENT_ALARMS_MAX))
+        for alarm in alarms:
+            recent.appendleft(alarm)
+            self.hass.bus.async_fire(EVENT_ALARM, alarm)
+            self._dispatch_alarm_kind(
+                serial, alarm.get("msg_id"), alarm.get("kind"), alarm, alarm.get("time")
+            )
+
+    @callback
+    def async_subscribe_alarm_kind(
+        self,
+        serial: str,
+        kind: AlarmKind | str,
+        listener: Callable[[dict[str, Any]], None],
+    ) -> Callable[[], None]:
+        """Iscrive listener agli allarmi di un tipo canonico del serial; restituisce l'unsub."""
+        key = (serial, AlarmKind(kind).value)
+        self._kind_listeners.setdefault(key, []).append(listener)
+
+        @callback
+        def _unsubscribe() -> None:
+            listeners = self._kind_listeners.get(key, [])
+            if listener in listeners:
+                listeners.remove(listener)
+            if not listeners:
+                self._kind_listeners.pop(key, None)
+
+        return _unsubscribe
+
+    @callback
+    def _dispatch_alarm_kind(
+        self,
+        serial: str,
+        msg_id: Any,
+        kind: str | None,
+        alarm: dict[str, Any],
+        when: Any = None,
+    ) -> None:
+        """Chiama solo le entità iscritte al tipo dell'allarme, una volta per allarme.
+
+        Lo stesso allarme arriva prima dal push e poi dal polling di conferma:
+        è un duplicato se ha un msgId già visto oppure stesso serial e tipo
+        a meno di DISPATCH_DEDUP_WINDOW_SEC di distanza.
+        """
+        kind = kind or ""
+        if msg_id not in (None, ""):
+            msg_id = str(msg_id)
+            if msg_id in self._dispatched:
+                return
+            self._dispatched[msg_id] = None
+            if len(self._dispatched) > DISPATCHED_ALARMS_MAX:
+                self._dispatched.popitem(last=False)
+        moment = _alarm_moment(when)
+        if moment is not None:
+            for seen_serial, seen_kind, seen_moment in self._dispatched_moments:
+                if (
+                    seen_serial == serial
+                    and seen_kind == kind
+                    and abs((seen_moment - moment).total_seconds()) <= DISPATCH_DEDUP_WINDOW_SEC
+                ):
+                    return
+            self._dispatched_moments.append((serial, kind, moment))
+        for listener in tuple(self._kind_listeners.get((serial, kind), ())):
+            listener(alarm)
+
+    async def async_start_push(self) -> bool:
+        """Attiva il push MQTT; se fallisce resta il polling rapido."""
+        try:
+            await self.hass.async_add_executor_job(
+                self.api.start_push, self._handle_push_message
+            )
+        except Exception as e:
+            _LOGGER.warning("EZVIZ HP7: push MQTT non disponibile, resto in polling: %s", e)
+            return False
+
+        self.push_active = True
+        return True
+
+    @callback
+    def async_refresh_push_session(self, token: dict[str, Any]) -> None:
+        """Token rinnovato: il push lato server va riavviato con il nuovo sessionId."""
+        if not self.push_active:
+            return
+        self._push_session_token = token
+        if self._push_session_task is None or self._push_session_task.done():
+            self._push_session_task = self.hass.async_create_background_task(
+                self._async_refresh_push_session(), f"{DOMAIN} push session"
+            )
+
+    async def _async_refresh_push_session(self) -> None:
+        # Un refresh arrivato durante il rinnovo viene applicato al giro successivo
+        while (token := self._push_session_token) is not None:
+            self._push_session_token = None
+            try:
+                await self.hass.async_add_executor_job(self.api.refresh_push_session, token)
+            except Exception as e:
+                _LOGGER.warning("EZVIZ HP7: push MQTT non rinnovato con la nuova sessione: %s", e)
+
+    async def async_stop_push(self, *_: Any) -> None:
+        """Ferma il push MQTT, il refresh di conferma e l'eventuale rinnovo di sessione pendenti."""
+        if self._push_confirm_unsub:
+            self._push_confirm_unsub()
+            self._push_confirm_unsub = None
+        self._push_session_token = None
+        if self._push_session_task is not None:
+            self._push_session_task.cancel()
+            self._push_session_task = None
+        if not self.push_active:
+            return
+        self.push_active = False
+        self._set_interval(min(self.scheduler.current, self.scheduler.max_interval))
+        await self.hass.async_add_executor_job(self.api.stop_push)
+
+    def _handle_push_message(self, message: dict[str, Any]) -> None:
+        """Callback MQTT (thread di paho): inoltra al loop di HA i messaggi dei device."""
+        ext = message.get("ext") if isinstance(message.get("ext"), dict) else {}
+        device_serial = ext.get("device_serial")
+        for serial in tuple(self.serials):
+            if self.api.serial_matches(serial, device_serial):
+                self.hass.loop.call_soon_threadsafe(
+                    self._apply_push_message, serial, message
+                )
+                return
+
+    @callback
+    def _apply_push_message(self, serial: str, message: dict[str, Any]) -> None:
+        """Applica subito l'allarme push ai dati e programma un refresh di conferma."""
+        if serial not in self.serials:
+            return
+        alarm = self.api.alarm_from_push(message)
+        _LOGGER.debug("EZVIZ HP7: allarme push per %s: %s", serial, alarm)
+        data = dict(self.data or {})
+        data[serial] = {**data.get(serial, {}), **alarm}
+        # Il push è un segnale di attività: polling rapido per il burst
+        self._set_interval(self.scheduler.burst())
+        self.async_set_updated_data(data)
+        ext = message.get("ext") if isinstance(message.get("ext"), dict) else {}
+        self._dispatch_alarm_kind(
+            serial, ext.get("msgId"), classify_alarm(message).value, alarm, ext.get("time")
+        )
+
+        # Dopo la finestra movimento rilegge lo stato dal cloud (motion torna off,
+        # immagine definitiva dell'allarme).
+        if self._push_confirm_unsub:
+            self._push_confirm_unsub()
+        self._push_confirm_unsub = async_call_later(
+            self.hass, PUSH_CONFIRM_DELAY_SEC, self._async_confirm_push
+        )
 
+    async def _async_confirm_push(self, _now: datetime) -> None:
+        self._push_confirm_unsub = None
+        await self.async_request_refresh()
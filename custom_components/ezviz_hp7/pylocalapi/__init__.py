@@ -5,10 +5,20 @@ endpoints tailored for Home Assistant and light scripting. The
 submodules contain focused functionality (client, camera/light models,
 MQTT push, CAS, utilities) and this package exports the most useful
 symbols for convenient imports.
+
+Modules with heavy dependencies (the aiohttp client, CAS with pycryptodome
+and xmltodict, MQTT with paho-mqtt) are imported on first attribute access,
+so ``import pylocalapi`` and the sync client stay cheap.
 """
 
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+from .alarm_kinds import AlarmKind, classify_alarm, register_alarm_kind
+from .auth import TokenManager
+from .bulk import BulkOperation, BulkReport, BulkResult
 from .camera import EzvizCamera
-from .cas import EzvizCAS
+from .changes import ChangeSet, DeviceStateTracker
 from .client import EzvizClient
 from .constants import (
     AlarmDetectHumanCar,
@@ -29,6 +39,7 @@ from .exceptions import (
     DeviceException,
     EzvizAuthTokenExpired,
     EzvizAuthVerificationCode,
+    EzvizCircuitOpen,
     HTTPError,
     InvalidHost,
     InvalidURL,
@@ -63,24 +74,53 @@ from .feature import (
     support_ext_value,
 )
 from .light_bulb import EzvizLightBulb
+from .message_stream import MessageCursor, MessageStream
+from .messages import MessageBatch, MessageSync
+from .metrics import RequestMetrics
+from .retry import RetryPolicy
 from .models import EzvizDeviceRecord, build_device_records_map
-from .mqtt import EzvizToken, MQTTClient, MqttData, ServiceUrls
 from .test_cam_rtsp import TestRTSPAuth
 
+if TYPE_CHECKING:
+    from .async_client import AsyncEzvizClient
+    from .cas import EzvizCAS
+    from .mqtt import EzvizToken, MQTTClient, MqttData, ServiceUrls
+    from .store import AlarmStore
+
+# Exported name -> submodule providing it, imported on first access
+_LAZY_EXPORTS = {
+    "AlarmStore": ".store",
+    "AsyncEzvizClient": ".async_client",
+    "EzvizCAS": ".cas",
+    "EzvizToken": ".mqtt",
+    "MQTTClient": ".mqtt",
+    "MqttData": ".mqtt",
+    "ServiceUrls": ".mqtt",
+}
+
 __all__ = [
     "AlarmDetectHumanCar",
+    "AlarmKind",
+    "AlarmStore",
+    "AsyncEzvizClient",
     "AuthTestResultFailed",
     "BatteryCameraNewWorkMode",
     "BatteryCameraWorkMode",
+    "BulkOperation",
+    "BulkReport",
+    "BulkResult",
+    "ChangeSet",
     "DefenseModeType",
     "DeviceCatagories",
     "DeviceException",
+    "DeviceStateTracker",
     "DeviceSwitchType",
     "DisplayMode",
     "EzvizAuthTokenExpired",
     "EzvizAuthVerificationCode",
     "EzvizCAS",
     "EzvizCamera",
+    "EzvizCircuitOpen",
     "EzvizClient",
     "EzvizDeviceRecord",
     "EzvizLightBulb",
@@ -90,15 +130,23 @@ __all__ = [
     "InvalidHost",
     "InvalidURL",
     "MQTTClient",
+    "MessageBatch",
+    "MessageCursor",
     "MessageFilterType",
+    "MessageStream",
+    "MessageSync",
     "MqttData",
     "NightVisionMode",
     "PyEzvizError",
+    "RequestMetrics",
+    "RetryPolicy",
     "ServiceUrls",
     "SoundMode",
     "SupportExt",
     "TestRTSPAuth",
+    "TokenManager",
     "build_device_records_map",
+    "classify_alarm",
     "day_night_mode_value",
     "day_night_sensitivity_value",
     "device_icr_dss_config",
@@ -120,9 +168,25 @@ __all__ = [
     "port_security_config",
     "port_security_has_port",
     "port_security_port_enabled",
+    "register_alarm_kind",
     "resolve_channel",
     "supplement_light_available",
     "supplement_light_enabled",
     "supplement_light_params",
     "support_ext_value",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import lazily exported names on first access."""
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Include lazily exported names."""
+    return sorted({*globals(), *__all__})
@@ -6,13 +6,13 @@ Small utility CLI for testing and scripting Ezviz operations.
 from __future__ import annotations
 
 import argparse
+import datetime
 import json
 import logging
 from pathlib import Path
 import sys
-from typing import Any, cast
-
-import pandas as pd
+import time
+from typing import TYPE_CHECKING, Any, cast
 
 from .camera import EzvizCamera
 from .client import EzvizClient
@@ -20,8 +20,15 @@ from .constants import BatteryCameraWorkMode, DefenseModeType, DeviceSwitchType
 from .exceptions import EzvizAuthVerificationCode, PyEzvizError
 from .light_bulb import EzvizLightBulb
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .store import AlarmStore
+
 _LOGGER = logging.getLogger(__name__)
 
+DEFAULT_ALARM_STORE = "ezviz_alarms.db"
+
 
 def _setup_logging(debug: bool) -> None:
     """Configure root logger for CLI usage."""
@@ -260,6 +267,33 @@ def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         "--serial", required=False, help="Optional serial to filter a single device"
     )
 
+    # Poll devices and print only what changed between refreshes
+    parser_watch = subparsers.add_parser(
+        "watch", help="Poll devices and print change sets as JSON lines"
+    )
+    parser_watch.add_argument(
+        "--interval",
+        type=float,
+        default=30.0,
+        help="Seconds between refreshes (default: 30)",
+    )
+    parser_watch.add_argument(
+        "--sections",
+        required=False,
+        help="Comma-separated pagelist sections to refresh (default: all)",
+    )
+    parser_watch.add_argument(
+        "--count",
+        type=int,
+        default=0,
+        help="Stop after this many refreshes (default: run until interrupted)",
+    )
+    parser_watch.add_argument(
+        "--store",
+        required=False,
+        help="Also sync new alarms into this history database on every refresh",
+    )
+
     parser_unified = subparsers.add_parser(
         "unifiedmsg",
         help="Fetch unified message list (alarm feed) and dump URLs/metadata",
@@ -290,6 +324,86 @@ def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         action="store_true",
         help="Print only deviceSerial + media URLs instead of full metadata",
     )
+    parser_unified.add_argument(
+        "--store",
+        required=False,
+        help="Also save the fetched messages into this history database",
+    )
+
+    # Streams every page of a date range; pages are fetched ahead in background
+    parser_export = subparsers.add_parser(
+        "export", help="Stream unified messages of a date range as JSON lines"
+    )
+    parser_export.add_argument(
+        "--since", required=True, help="Oldest day to export, YYYYMMDD"
+    )
+    parser_export.add_argument(
+        "--until", required=False, help="Newest day to export, YYYYMMDD (default: today)"
+    )
+    parser_export.add_argument(
+        "--serials",
+        required=False,
+        help="Comma-separated serials to filter (default: all devices)",
+    )
+    parser_export.add_argument(
+        "--cursor",
+        required=False,
+        help="Resume after this position (printed when an export is interrupted)",
+    )
+    parser_export.add_argument(
+        "--prefetch",
+        type=int,
+        default=2,
+        help="Pages fetched ahead while writing (0 disables; default: 2)",
+    )
+    parser_export.add_argument(
+        "--store",
+        required=False,
+        help="Also save the exported messages into this history database",
+    )
+
+    # Answered from the local database; the cloud is only used with --sync
+    parser_history = subparsers.add_parser(
+        "history", help="Query the local alarm history database"
+    )
+    parser_history.add_argument(
+        "--store",
+        default=DEFAULT_ALARM_STORE,
+        help=f"History database file (default: {DEFAULT_ALARM_STORE})",
+    )
+    parser_history.add_argument(
+        "--serials",
+        required=False,
+        help="Comma-separated serials to filter (default: all devices)",
+    )
+    parser_history.add_argument(
+        "--type",
+        dest="alarm_types",
+        required=False,
+        help="Comma-separated alarmType codes to filter (default: all)",
+    )
+    parser_history.add_argument(
+        "--date",
+        required=False,
+        help="First day in YYYYMMDD format (default: today, local time)",
+    )
+    parser_history.add_argument(
+        "--days",
+        type=int,
+        default=1,
+        help="Number of days from --date to include (default: 1)",
+    )
+    parser_history.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Maximum number of alarms to print (default: all)",
+    )
+    parser_history.add_argument(
+        "--sync",
+        action="store_true",
+        help="Fetch alarms newer than the stored ones from the cloud first",
+    )
 
     return parser.parse_args(argv)
 
@@ -313,6 +427,13 @@ def _write_json(obj: Any) -> None:
     sys.stdout.write(json.dumps(obj, indent=2) + "\n")
 
 
+def _pandas() -> Any:
+    """Import pandas on first table output; JSON output never loads it."""
+    import pandas
+
+    return pandas
+
+
 def _write_df(df: pd.DataFrame) -> None:
     """Write a DataFrame to stdout as a formatted table."""
     sys.stdout.write(df.to_string() + "\n")
@@ -387,7 +508,7 @@ def _handle_devices(args: argparse.Namespace, client: EzvizClient) -> int:
                 payload["ir_led"] = flags.get("infrared_light")
                 payload["state_led"] = flags.get("light")
 
-            df = pd.DataFrame.from_dict(
+            df = _pandas().DataFrame.from_dict(
                 data=data,
                 orient="index",
                 columns=[
@@ -430,7 +551,7 @@ def _handle_devices_light(args: argparse.Namespace, client: EzvizClient) -> int:
         if args.json:
             _write_json(data)
         else:
-            df = pd.DataFrame.from_dict(
+            df = _pandas().DataFrame.from_dict(
                 data=data,
                 orient="index",
                 columns=[
@@ -468,6 +589,28 @@ def _handle_device_infos(args: argparse.Namespace, client: EzvizClient) -> int:
     return 0
 
 
+def _handle_watch(args: argparse.Namespace, client: EzvizClient) -> int:
+    """Print one JSON line per refresh that changed something."""
+    sections = args.sections.split(",") if args.sections else None
+    store = _open_store(args.store) if args.store else None
+    refreshes = 0
+    try:
+        while True:
+            changes = client.get_device_changes(sections)
+            if changes:
+                sys.stdout.write(json.dumps(changes.as_dict(), default=str) + "\n")
+                sys.stdout.flush()
+            if store is not None:
+                store.add_many(client.sync_messages().read)
+            refreshes += 1
+            if args.count and refreshes >= args.count:
+                return 0
+            time.sleep(args.interval)
+    finally:
+        if store is not None:
+            store.close()
+
+
 def _handle_unifiedmsg(args: argparse.Namespace, client: EzvizClient) -> int:
     """Fetch unified message list and optionally dump media URLs."""
 
@@ -483,6 +626,10 @@ def _handle_unifiedmsg(args: argparse.Namespace, client: EzvizClient) -> int:
     if not isinstance(raw_messages, list):
         raw_messages = []
     messages: list[dict[str, Any]] = [msg for msg in raw_messages if isinstance(msg, dict)]
+    if args.store:
+        with _open_store(args.store) as store:
+            added = store.add_many(messages)
+        _LOGGER.info("Saved %s new of %s messages to %s", added, len(messages), args.store)
 
     def _extract_url(message: dict[str, Any]) -> str | None:
         url = message.get("pic")
@@ -525,13 +672,104 @@ def _handle_unifiedmsg(args: argparse.Namespace, client: EzvizClient) -> int:
         )
 
     if rows:
-        df = pd.DataFrame(rows)
+        df = _pandas().DataFrame(rows)
         _write_df(df)
     else:
         sys.stdout.write("No unified messages returned.\n")
     return 0
 
 
+def _handle_export(args: argparse.Namespace, client: EzvizClient) -> int:
+    """Write the messages of a date range to stdout, one JSON object per line."""
+    store = _open_store(args.store) if args.store else None
+    pending: list[dict[str, Any]] = []
+    exported = 0
+    stream = client.iter_messages(
+        args.since,
+        args.until,
+        serials=args.serials.split(",") if args.serials else None,
+        prefetch=args.prefetch,
+        cursor=args.cursor,
+    )
+    try:
+        with stream:
+            for message in stream:
+                sys.stdout.write(json.dumps(message, default=str) + "\n")
+                exported += 1
+                if store is not None:
+                    pending.append(message)
+                    if len(pending) >= 500:
+                        store.add_many(pending)
+                        pending.clear()
+    except (PyEzvizError, KeyboardInterrupt):
+        if stream.cursor is not None:
+            _LOGGER.error("Export stopped, resume with --cursor %s", stream.cursor)
+        raise
+    finally:
+        if store is not None:
+            store.add_many(pending)
+            store.close()
+        sys.stdout.flush()
+    _LOGGER.info("Exported %s messages from %s pages", exported, stream.pages)
+    return 0
+
+
+def _open_store(path: str) -> AlarmStore:
+    """Open the alarm history database at `path`."""
+    from .store import AlarmStore
+
+    return AlarmStore(path)
+
+
+def _handle_history(args: argparse.Namespace, client: EzvizClient | None) -> int:
+    """Print alarms of a day range from the local history database."""
+    from .store import start_of_day
+
+    if args.date:
+        try:
+            first_day = datetime.datetime.strptime(args.date, "%Y%m%d").date()
+        except ValueError:
+            _LOGGER.error("Invalid --date, expected YYYYMMDD: %s", args.date)
+            return 2
+    else:
+        first_day = datetime.date.today()
+    since = start_of_day(first_day)
+    until = start_of_day(first_day + datetime.timedelta(days=max(1, args.days)))
+    serials = args.serials.split(",") if args.serials else None
+
+    with _open_store(args.store) as store:
+        if client is not None:
+            added = store.add_many(client.sync_messages(serials).read)
+            _LOGGER.info("Synced %s new alarms into %s", added, args.store)
+        alarms = store.query(
+            serials,
+            since=since,
+            until=until,
+            alarm_type=args.alarm_types.split(",") if args.alarm_types else None,
+            limit=args.limit,
+        )
+
+    if args.json:
+        _write_json(alarms)
+        return 0
+    if not alarms:
+        sys.stdout.write("No alarms stored for this period.\n")
+        return 0
+    rows = [
+        {
+            "deviceSerial": alarm.get("deviceSerial"),
+            "time": alarm.get("alarmStartTimeStr") or alarm.get("alarmStartTime"),
+            "alarmType": alarm.get("alarmType"),
+            "name": alarm.get("sampleName"),
+            "url": alarm.get("picUrl") or "",
+            "msgId": alarm.get("alarmId"),
+        }
+        for alarm in alarms
+    ]
+    _write_df(_pandas().DataFrame(rows))
+    return 0
+
+
 def _handle_light(args: argparse.Namespace, client: EzvizClient) -> int:
     """Handle `light` subcommands (toggle/status)."""
     light_bulb = EzvizLightBulb(client, args.serial)
@@ -669,6 +907,10 @@ def main(argv: list[str] | None = None) -> int:
     args = _parse_args(argv)
     _setup_logging(args.debug)
 
+    if args.action == "history" and not args.sync:
+        # Local only: no credentials, no cloud round trip
+        return _handle_history(args, None)
+
     token = _load_token_file(args.token_file)
     if not token and (not args.username or not args.password):
         _LOGGER.error("Provide --token-file (existing) or --username/--password")
@@ -694,8 +936,14 @@ def main(argv: list[str] | None = None) -> int:
             return _handle_pagelist(client)
         if args.action == "device_infos":
             return _handle_device_infos(args, client)
+        if args.action == "watch":
+            return _handle_watch(args, client)
         if args.action == "unifiedmsg":
             return _handle_unifiedmsg(args, client)
+        if args.action == "history":
+            return _handle_history(args, client)
+        if args.action == "export":
+            return _handle_export(args, client)
 
     except PyEzvizError as exp:
         _LOGGER.error("%s", exp)
@@ -0,0 +1,176 @@
+"""Classification of alarms into canonical event kinds.
+
+The ``title`` of a unified message (``sampleName`` once normalized, ``alert``
+in an MQTT push) is localized to the account language, so it cannot tell a
+doorbell ring from a gate opening on every account. The numeric codes are
+language independent: ``alarmType`` (``ext.alarmType`` of a unified
+message), ``subType`` and ``alert_type_code`` (MQTT ``ext``, same code space
+as ``alarmType``).
+
+:func:`classify` checks three precomputed dicts in order, each lookup a single
+dict access:
+
+1. codes that belong to one event only (``_ALARM_TYPE_KINDS``), intercom
+   events included, whatever the account language;
+2. the English titles, as a last resort for events whose own code is not
+   mapped yet;
+3. the generic codes (``_GENERIC_ALARM_TYPE_KINDS`` and the motion, person,
+   vehicle and sound ``subType``\\s), which intercom events may carry too.
+
+:func:`register_alarm_kind` extends the tables, e.g. with codes reported by
+:func:`classify` at debug level.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from enum import Enum, unique
+import logging
+from typing import Any
+
+from .constants import MessageFilterType
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@unique
+class AlarmKind(str, Enum):
+    """Canonical event kinds, independent of the account language."""
+
+    MOTION = "motion"
+    PERSON = "person"
+    VEHICLE = "vehicle"
+    SOUND = "sound"
+    SMART_DETECTION = "smart_detection"
+    INTELLIGENT_DETECTION = "intelligent_detection"
+    DOORBELL = "doorbell"
+    GATE_OPEN = "gate_open"
+    LOCK_OPEN = "lock_open"
+    UNKNOWN = "unknown"
+
+
+# alarmType / alert_type_code -> kind, for codes that name one event only
+# (EZVIZ open platform alarm types)
+_ALARM_TYPE_KINDS: dict[str, AlarmKind] = {
+    "10002": AlarmKind.MOTION,  # motion detection
+    "10016": AlarmKind.DOORBELL,  # smart doorbell
+}
+
+# alarmType / alert_type_code -> kind, for codes shared by several events:
+# PIR (human body sensing) also fires with doorbell rings and gate openings
+_GENERIC_ALARM_TYPE_KINDS: dict[str, AlarmKind] = {
+    "10000": AlarmKind.MOTION,
+}
+
+# subType -> kind (the unified list filters double as message subtypes);
+# generic as well, checked after the titles
+_SUB_TYPE_KINDS: dict[str, AlarmKind] = {
+    str(MessageFilterType.FILTER_TYPE_MOTION.value): AlarmKind.MOTION,
+    str(MessageFilterType.FILTER_TYPE_PERSON.value): AlarmKind.PERSON,
+    str(MessageFilterType.FILTER_TYPE_VEHICLE.value): AlarmKind.VEHICLE,
+    str(MessageFilterType.FILTER_TYPE_SOUND.value): AlarmKind.SOUND,
+}
+
+# Casefolded English titles: last resort for events whose code is not mapped
+_TITLE_KINDS: dict[str, AlarmKind] = {
+    "smart detection alarm": AlarmKind.SMART_DETECTION,
+    "intelligent detection alarm": AlarmKind.INTELLIGENT_DETECTION,
+    "your doorbell is ringing": AlarmKind.DOORBELL,
+    "ezviz app open the gate": AlarmKind.GATE_OPEN,
+    "monitor open the gate": AlarmKind.GATE_OPEN,
+    "ezviz app unlock the lock": AlarmKind.LOCK_OPEN,
+    "monitor unlock the lock": AlarmKind.LOCK_OPEN,
+}
+
+_MAX_REPORTED_UNKNOWN = 256
+_reported_unknown: set[tuple[str, str, str]] = set()
+
+
+def _code(value: Any) -> str:
+    """Return a code as the string used as table key ("" when missing)."""
+    if value is None or isinstance(value, bool):
+        return ""
+    return str(getattr(value, "value", value)).strip()
+
+
+def register_alarm_kind(
+    kind: AlarmKind | str,
+    *,
+    alarm_types: Iterable[Any] = (),
+    sub_types: Iterable[Any] = (),
+    titles: Iterable[str] = (),
+) -> None:
+    """Map more codes or titles to ``kind``; later registrations win.
+
+    ``alarm_types`` are taken as specific to ``kind`` and checked first.
+    """
+    kind = AlarmKind(kind)
+    for code in alarm_types:
+        _ALARM_TYPE_KINDS[_code(code)] = kind
+    for code in sub_types:
+        _SUB_TYPE_KINDS[_code(code)] = kind
+    for title in titles:
+        _TITLE_KINDS[title.strip().casefold()] = kind
+    _reported_unknown.clear()
+
+
+def classify(
+    alarm_type: Any = None, sub_type: Any = None, title: str | None = None
+) -> AlarmKind:
+    """Return the kind of an alarm; see the module docstring for the order.
+
+    Args:
+        alarm_type: ``alarmType`` or MQTT ``alert_type_code``.
+        sub_type: Unified message ``subType``.
+        title: Alarm title, only matched against the known English titles.
+
+    Example:
+        >>> classify("10016", title="Il campanello sta suonando")
+        <AlarmKind.DOORBELL: 'doorbell'>
+        >>> classify("10000", title="Your doorbell is ringing")
+        <AlarmKind.DOORBELL: 'doorbell'>
+        >>> classify("10000", title="Rilevato movimento")
+        <AlarmKind.MOTION: 'motion'>
+    """
+    alarm_code = _code(alarm_type)
+    kind = _ALARM_TYPE_KINDS.get(alarm_code)
+    if kind is not None:
+        return kind
+    if title:
+        kind = _TITLE_KINDS.get(title.strip().casefold())
+        if kind is not None:
+            return kind
+    kind = _GENERIC_ALARM_TYPE_KINDS.get(alarm_code)
+    if kind is not None:
+        return kind
+    sub_code = _code(sub_type)
+    kind = _SUB_TYPE_KINDS.get(sub_code)
+    if kind is not None:
+        return kind
+    key = (alarm_code, sub_code, title or "")
+    if key not in _reported_unknown and len(_reported_unknown) < _MAX_REPORTED_UNKNOWN:
+        _reported_unknown.add(key)
+        _LOGGER.debug(
+            "Unclassified alarm: alarmType=%s subType=%s title=%r",
+            alarm_code,
+            sub_code,
+            title,
+        )
+    return AlarmKind.UNKNOWN
+
+
+def classify_alarm(message: Mapping[str, Any]) -> AlarmKind:
+    """Return the kind of a unified message, normalized alarm or MQTT push."""
+    ext = message.get("ext")
+    if not isinstance(ext, Mapping):
+        ext = {}
+    alarm_type = message.get("alarmType") or ext.get("alarmType")
+    if alarm_type in (None, ""):
+        alarm_type = ext.get("alert_type_code")
+    title = (
+        message.get("title")
+        or message.get("alert")
+        or message.get("sampleName")
+        or message.get("detail")
+    )
+    return classify(alarm_type, message.get("subType"), title)
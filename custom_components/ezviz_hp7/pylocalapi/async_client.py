@@ -0,0 +1,919 @@
+"""Asyncio Ezviz API client built on aiohttp.
+
+:class:`AsyncEzvizClient` implements the subset of :class:`~.client.EzvizClient`
+needed to poll devices and alarms and to drive locks without blocking an
+event loop. Request builders and response validation come from
+:class:`~.client.EzvizClientBase`, so both clients speak the same protocol.
+
+The caller owns the :class:`aiohttp.ClientSession` (for example Home
+Assistant's shared session); the client never closes it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+import contextlib
+import datetime as dt
+import functools
+import hashlib
+import logging
+import time
+from typing import Any, cast
+
+import aiohttp
+
+from .api_endpoints import (
+    API_ENDPOINT_CAM_ENCRYPTKEY,
+    API_ENDPOINT_LOGIN,
+    API_ENDPOINT_PAGELIST,
+    API_ENDPOINT_REFRESH_SESSION_ID,
+    API_ENDPOINT_REMOTE_LOCK,
+    API_ENDPOINT_REMOTE_UNLOCK,
+    API_ENDPOINT_SEND_CODE,
+    API_ENDPOINT_SERVER_INFO,
+    API_ENDPOINT_UNIFIEDMSG_LIST_GET,
+)
+from .auth import TokenManager
+from .changes import ChangeSet, DeviceStateTracker
+from .client import (
+    MAX_UNIFIEDMSG_PAGES,
+    PAGELIST_FULL_FILTER,
+    PAGELIST_MAX_PARALLEL,
+    UNIFIEDMSG_MAX_PARALLEL,
+    ClientToken,
+    EzvizClientBase,
+)
+from .codec import loads as json_loads
+from .constants import (
+    DEFAULT_TIMEOUT,
+    DEFAULT_UNIFIEDMSG_STYPE,
+    MAX_RETRIES,
+    REQUEST_HEADER,
+)
+from .exceptions import EzvizAuthTokenExpired, HTTPError, InvalidURL, PyEzvizError
+from .message_stream import (
+    DEFAULT_STREAM_PAGE_SIZE,
+    DEFAULT_STREAM_PREFETCH,
+    MessageCursor,
+    RangePager,
+)
+from .messages import FillChunk, MessageBatch, MessageSync
+from .metrics import RequestMetrics
+from .models import EzvizDeviceRecord, build_device_records_map
+from .pagelist import PagelistIndex, projection_sections
+from .retry import AUTH, READ, TRANSIENT_STATUSES, RetryPolicy
+from .utils import merge_pages
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AsyncMessageStream(AsyncIterator[dict[str, Any]]):
+    """Async counterpart of :class:`~.message_stream.MessageStream`.
+
+    The read-ahead runs as a task on the running loop, started by the first
+    ``__anext__``; :meth:`aclose` (or leaving ``async with``) cancels it.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[..., Awaitable[dict[str, Any]]],
+        pager: RangePager,
+        prefetch: int = DEFAULT_STREAM_PREFETCH,
+    ) -> None:
+        """Stream the pages of ``pager``, awaiting ``fetch(**request)`` for each."""
+        self._fetch = fetch
+        self._pager = pager
+        self._prefetch = prefetch
+        self._page: Iterator[dict[str, Any]] = iter(())
+        self._page_date: str | None = pager.date
+        self._cursor: MessageCursor | None = None
+        self._queue: asyncio.Queue[Any] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._closed = False
+        self.pages = 0
+
+    @property
+    def cursor(self) -> MessageCursor | None:
+        """Return the position after the last message returned, if any."""
+        return self._cursor
+
+    def __aiter__(self) -> AsyncMessageStream:
+        """Return the stream itself."""
+        return self
+
+    async def __aenter__(self) -> AsyncMessageStream:
+        """Return the stream itself."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Cancel the read-ahead task."""
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Stop reading ahead; the stream raises StopAsyncIteration from now on."""
+        self._closed = True
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+    async def _next_page(self) -> tuple[str, list[dict[str, Any]]] | None:
+        request = self._pager.next_request()
+        if request is None:
+            return None
+        return request["date"], self._pager.feed(await self._fetch(**request))
+
+    async def _read_ahead(self) -> None:
+        assert self._queue is not None
+        try:
+            while (page := await self._next_page()) is not None:
+                await self._queue.put(page)
+        except Exception as err:  # re-raised in the consumer
+            await self._queue.put(err)
+            return
+        await self._queue.put(None)
+
+    async def __anext__(self) -> dict[str, Any]:
+        """Return the next message, fetching pages as needed."""
+        while True:
+            if self._closed:
+                raise StopAsyncIteration
+            message = next(self._page, None)
+            if message is not None:
+                self._cursor = MessageCursor(
+                    self._page_date or "", str(message.get("msgId") or "")
+                )
+                return message
+            if self._prefetch <= 0:
+                page = await self._next_page()
+            else:
+                if self._queue is None:
+                    self._queue = asyncio.Queue(maxsize=self._prefetch)
+                    self._task = asyncio.create_task(self._read_ahead())
+                item = await self._queue.get()
+                if isinstance(item, Exception):
+                    self._closed = True
+                    raise item
+                page = item
+            if page is None:
+                self._closed = True
+                raise StopAsyncIteration
+            self.pages += 1
+            self._page_date, messages = page
+            self._page = iter(messages)
+
+
+class AsyncEzvizClient(EzvizClientBase):
+    """Asyncio counterpart of :class:`~.client.EzvizClient`."""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        account: str | None = None,
+        password: str | None = None,
+        url: str = "apiieu.ezvizlife.com",
+        timeout: int = DEFAULT_TIMEOUT,
+        token: dict | None = None,
+        retry_policy: RetryPolicy | None = None,
+        unifiedmsg_parallel: int = UNIFIEDMSG_MAX_PARALLEL,
+    ) -> None:
+        """Initialize the client on a caller-owned aiohttp session.
+
+        ``unifiedmsg_parallel`` caps the per-device alarm queries
+        :meth:`sync_messages` runs at once.
+        """
+        self.account = account
+        self.password = (
+            hashlib.md5(password.encode("utf-8")).hexdigest() if password else None
+        )  # Ezviz API sends md5 of password
+        self._session = session
+        # Own copy: the caller's dict (e.g. a stored config) must not change
+        # under it when the session is refreshed
+        self._token: ClientToken = cast(
+            ClientToken,
+            dict(token)
+            if token
+            else {
+                "session_id": None,
+                "rf_session_id": None,
+                "username": None,
+                "api_url": url,
+            },
+        )
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        # Concurrent 401s share a single re-login
+        self._login_lock = asyncio.Lock()
+        self.metrics = RequestMetrics()
+        self.device_state = DeviceStateTracker()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.tokens = TokenManager()
+        self.message_sync = MessageSync(max_pages=MAX_UNIFIEDMSG_PAGES)
+        self._message_lock = asyncio.Lock()
+        self._unifiedmsg_parallel = max(1, unifiedmsg_parallel)
+
+    # ---- Internal HTTP helpers -------------------------------------------------
+
+    def _headers(self) -> dict[str, str]:
+        """Return request headers carrying the current session id."""
+        headers = dict(REQUEST_HEADER)
+        if self._token.get("session_id"):
+            headers["sessionId"] = str(self._token["session_id"])
+        return headers
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: dict | None = None,
+        data: dict | str | None = None,
+        json_body: dict | None = None,
+    ) -> tuple[int, bytes]:
+        """Send one request and return ``(status, body)``.
+
+        Raises:
+            aiohttp.ClientResponseError: For HTTP error statuses.
+            InvalidURL: On connection errors or timeouts.
+            EzvizCircuitOpen: Without sending anything while the circuit is open.
+        """
+        self.retry_policy.before_request()
+        started = time.perf_counter()
+        status: int | None = None
+        size: int | None = None
+        try:
+            async with self._session.request(
+                method,
+                url,
+                params=params,
+                data=data,
+                json=json_body,
+                headers=self._headers(),
+                timeout=self._timeout,
+                allow_redirects=False,
+            ) as resp:
+                status = resp.status
+                body = await resp.read()
+                size = len(body)
+                resp.raise_for_status()
+                return resp.status, body
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+            raise InvalidURL("A Invalid URL or Proxy error occurred") from err
+        finally:
+            self.retry_policy.record_outcome(status)
+            self.metrics.record_request(
+                method,
+                url,
+                status=status,
+                elapsed=time.perf_counter() - started,
+                size=size,
+                error=status is None or status >= 400,
+            )
+
+    async def _http_request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: dict | None = None,
+        data: dict | str | None = None,
+        json_body: dict | None = None,
+        retry_401: bool = True,
+        max_retries: int = 0,
+    ) -> tuple[int, bytes]:
+        """Perform an HTTP request with optional 401 retry via re-login."""
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "HTTP %s %s params=%s data=%s json=%s",
+                method,
+                url,
+                self._summarize_payload(params),
+                self._summarize_payload(data),
+                self._summarize_payload(json_body),
+            )
+        await self._ensure_fresh_session()
+        attempt = 0
+        while True:
+            session_id = self._token.get("session_id")
+            try:
+                status, body = await self._send(
+                    method, url, params=params, data=data, json_body=json_body
+                )
+            except aiohttp.ClientResponseError as err:
+                if retry_401 and err.status == 401:
+                    delay = self._relogin_delay(max_retries)
+                    if delay is None:
+                        raise HTTPError from err
+                    await asyncio.sleep(delay)
+                    await self._relogin(session_id, "http_401")
+                    return await self._http_request(
+                        method,
+                        url,
+                        params=params,
+                        data=data,
+                        json_body=json_body,
+                        retry_401=retry_401,
+                        max_retries=max_retries + 1,
+                    )
+                if err.status in TRANSIENT_STATUSES:
+                    delay = self._transport_retry_delay(
+                        method, url, attempt, f"http_{err.status}"
+                    )
+                    if delay is not None:
+                        await asyncio.sleep(delay)
+                        attempt += 1
+                        continue
+                raise HTTPError from err
+            except InvalidURL as err:
+                reason = type(err.__cause__ or err).__name__
+                delay = self._transport_retry_delay(method, url, attempt, reason)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            _LOGGER.debug("HTTP %s %s -> %s (%s bytes)", method, url, status, len(body))
+            return status, body
+
+    @staticmethod
+    def _parse_json(body: bytes) -> dict:
+        """Parse JSON or raise a friendly error."""
+        try:
+            return cast(dict, json_loads(body))
+        except ValueError as err:
+            raise PyEzvizError(
+                "Impossible to decode response: "
+                + str(err)
+                + "\nResponse was: "
+                + body.decode(errors="replace")
+            ) from err
+
+    async def _request_json(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict | None = None,
+        data: dict | str | None = None,
+        json_body: dict | None = None,
+        retry_401: bool = True,
+        max_retries: int = 0,
+    ) -> dict:
+        """Perform request and parse JSON in one step."""
+        status, body = await self._http_request(
+            method,
+            self._url(path),
+            params=params,
+            data=data,
+            json_body=json_body,
+            retry_401=retry_401,
+            max_retries=max_retries,
+        )
+        payload = self._parse_json(body)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "JSON %s %s -> status=%s meta=%s keys=%s",
+                method,
+                path,
+                status,
+                self._response_code(payload),
+                ", ".join(sorted(payload.keys())),
+            )
+        return payload
+
+    async def _retry_json(
+        self,
+        producer: Callable[[], Awaitable[dict]],
+        *,
+        attempts: int,
+        should_retry: Callable[[dict], bool],
+        log: str,
+        serial: str | None = None,
+    ) -> dict:
+        """Await a JSON-producing coroutine factory with retry policy.
+
+        Same contract as :meth:`EzvizClient._retry_json`.
+
+        Raises:
+            PyEzvizError: If retries are exhausted without a successful payload.
+        """
+        total = max(0, attempts)
+        for attempt in range(total + 1):
+            payload = await producer()
+            if not should_retry(payload):
+                return payload
+            if attempt < total:
+                delay = self._retry_delay(READ, attempt, log)
+                if delay is None:
+                    break
+                self._log_retry(payload, log, serial)
+                await asyncio.sleep(delay)
+        raise PyEzvizError(f"{log}: exceeded retries")
+
+    # ---- Authentication --------------------------------------------------------
+
+    async def _relogin(self, stale_session_id: str | None, reason: str) -> None:
+        """Refresh the session once for all callers that saw the same 401."""
+        async with self._login_lock:
+            if self._token.get("session_id") != stale_session_id:
+                # Another request already renewed the session
+                return
+            self.metrics.record_relogin(reason)
+            await self.login()
+
+    async def _ensure_fresh_session(self) -> None:
+        """Refresh the session shortly before it expires, once per session.
+
+        Same contract as :meth:`EzvizClient._ensure_fresh_session`.
+        """
+        if not self.tokens.needs_refresh(self._token):
+            return
+        self.tokens.mark_attempted(self._token)
+        try:
+            await self._relogin(self._token.get("session_id"), "proactive")
+        except PyEzvizError as err:
+            _LOGGER.debug("Proactive session refresh failed: %s", err)
+
+    async def _post_form(
+        self, method: str, url: str, data: dict[str, Any]
+    ) -> dict:
+        """Send a form request for the login calls (no 401 re-login loop)."""
+        # requests drops None form fields, aiohttp would send "None"
+        form = {key: value for key, value in data.items() if value is not None}
+        try:
+            _, body = await self._send(method, url, data=form)
+        except aiohttp.ClientResponseError as err:
+            raise HTTPError from err
+        return self._parse_json(body)
+
+    async def _login(self, smscode: int | None = None) -> dict[Any, Any]:
+        """Login to Ezviz API."""
+        self._expand_region_url()
+
+        json_result = await self._post_form(
+            "POST",
+            f"https://{self._token['api_url']}{API_ENDPOINT_LOGIN}",
+            self._login_payload(smscode),
+        )
+
+        if json_result["meta"]["code"] == 200:
+            self._token = self._token_from_login(json_result)
+            self._token["service_urls"] = await self.get_service_urls()
+            self.tokens.publish(self._token)
+            return dict(self._token)
+
+        if json_result["meta"]["code"] == 1100:
+            self._token["api_url"] = json_result["loginArea"]["apiDomain"]
+            _LOGGER.warning(
+                "Region_incorrect: serial=%s code=%s msg=%s",
+                "unknown",
+                1100,
+                self._token["api_url"],
+            )
+            return await self.login()
+
+        if json_result["meta"]["code"] == 6002:
+            await self.send_mfa_code()
+
+        self._raise_login_error(json_result)
+
+    async def login(self, sms_code: int | None = None) -> dict[Any, Any]:
+        """Get or refresh ezviz login token."""
+        if self._token["session_id"] and self._token["rf_session_id"]:
+            json_result = await self._post_form(
+                "PUT",
+                f"https://{self._token['api_url']}{API_ENDPOINT_REFRESH_SESSION_ID}",
+                self._refresh_payload(),
+            )
+
+            if json_result["meta"]["code"] == 200:
+                self._token["session_id"] = str(json_result["sessionInfo"]["sessionId"])
+                self._token["rf_session_id"] = str(
+                    json_result["sessionInfo"]["refreshSessionId"]
+                )
+                if not self._token.get("service_urls"):
+                    self._token["service_urls"] = await self.get_service_urls()
+                self.tokens.publish(self._token)
+                return dict(self._token)
+
+            if json_result["meta"]["code"] == 403:
+                if self.account and self.password:
+                    self._token = {
+                        "session_id": None,
+                        "rf_session_id": None,
+                        "username": None,
+                        "api_url": self._token["api_url"],
+                    }
+                    return await self.login()
+
+                raise EzvizAuthTokenExpired(
+                    f"Token expired, Login with username and password required: {json_result}"
+                )
+
+            raise PyEzvizError(f"Error renewing login token: {json_result['meta']}")
+
+        if self.account and self.password:
+            return await self._login(sms_code)
+
+        raise PyEzvizError("Login with account and password required")
+
+    async def send_mfa_code(self) -> bool:
+        """Send verification code."""
+        json_output = await self._request_json(
+            "POST",
+            API_ENDPOINT_SEND_CODE,
+            data={"from": self.account, "bizType": "TERMINAL_BIND"},
+            retry_401=False,
+        )
+        if not self._meta_ok(json_output):
+            raise PyEzvizError(f"Could not request MFA code: Got {json_output})")
+        return True
+
+    async def get_service_urls(self) -> Any:
+        """Get Ezviz service urls."""
+        if not self._token["session_id"]:
+            raise PyEzvizError("No Login token present!")
+        json_output = await self._request_json("GET", API_ENDPOINT_SERVER_INFO)
+        return self._service_urls_from(json_output)
+
+    def export_token(self) -> dict[str, Any]:
+        """Return a shallow copy of the current authentication token."""
+        return dict(self._token)
+
+    # ---- Devices ---------------------------------------------------------------
+
+    async def _api_get_pagelist(
+        self,
+        page_filter: str,
+        json_key: str | None = None,
+        group_id: int = -1,
+        limit: int = 30,
+        offset: int = 0,
+        max_retries: int = 0,
+    ) -> Any:
+        """Get data from pagelist API.
+
+        Same paging strategy as :meth:`EzvizClient._api_get_pagelist`: the
+        offsets announced by the first page are fetched concurrently.
+        """
+        if page_filter is None:
+            raise PyEzvizError("Trying to call get_pagelist without filter")
+
+        semaphore = asyncio.Semaphore(PAGELIST_MAX_PARALLEL)
+
+        async def _fetch(page_offset: int) -> dict:
+            async with semaphore:
+                return await self._get_pagelist_page(
+                    page_filter, group_id, limit, page_offset, max_retries
+                )
+
+        pages = [await _fetch(offset)]
+        offsets = self._pagelist_remaining_offsets(pages[0], limit, offset)
+        pages.extend(await asyncio.gather(*(_fetch(off) for off in offsets)))
+
+        # Without totalResults (or if the account grew meanwhile) keep paging
+        last_offset = offsets[-1] if offsets else offset
+        while self._pagelist_has_next(pages[-1]):
+            last_offset += limit
+            pages.append(await _fetch(last_offset))
+
+        return merge_pages(page[json_key] if json_key else page for page in pages)
+
+    async def _get_pagelist_page(
+        self,
+        page_filter: str,
+        group_id: int,
+        limit: int,
+        offset: int,
+        max_retries: int = 0,
+    ) -> dict:
+        """Fetch one pagelist page, re-logging in when the session is rejected."""
+        while True:
+            if max_retries > MAX_RETRIES:
+                raise PyEzvizError("Can't gather proper data. Max retries exceeded.")
+
+            session_id = self._token.get("session_id")
+            json_output = await self._request_json(
+                "GET",
+                API_ENDPOINT_PAGELIST,
+                params=self._pagelist_params(page_filter, group_id, limit, offset),
+                retry_401=True,
+                max_retries=max_retries,
+            )
+            if self._meta_code(json_output) == 200:
+                return json_output
+
+            # session is wrong, need to relogin and retry (with backoff)
+            delay = self._retry_delay(AUTH, max_retries, "pagelist_relogin")
+            if delay is None:
+                raise PyEzvizError("Can't gather proper data. Retry budget exhausted.")
+            self._log_retry(json_output, "pagelist_relogin", None)
+            await asyncio.sleep(delay)
+            await self._relogin(session_id, "pagelist")
+            max_retries += 1
+
+    async def get_page_list(self) -> Any:
+        """Return the full pagelist payload without filtering."""
+        return await self._api_get_pagelist(
+            page_filter=PAGELIST_FULL_FILTER, json_key=None
+        )
+
+    async def get_device_infos(
+        self,
+        serial: str | None = None,
+        sections: Iterable[str] | None = None,
+    ) -> dict[Any, Any]:
+        """Load all devices and build dict per device serial."""
+        index = await self.get_device_index(sections)
+        return self._device_infos_from_index(index, serial)
+
+    async def get_device_index(
+        self, sections: Iterable[str] | None = None
+    ) -> PagelistIndex:
+        """Load all devices and return an index that builds them on demand.
+
+        With ``sections``, only those are fetched once a full pagelist is
+        cached (see :meth:`EzvizClient.get_device_index`).
+        """
+        if sections is not None and self._pagelist_index is not None:
+            wanted = projection_sections(sections)
+            partial = await self._api_get_pagelist(
+                page_filter=",".join(wanted), json_key=None
+            )
+            index = self._merge_projection(partial, wanted)
+            if index is not None:
+                return index
+        return self._index_pagelist(await self.get_page_list())
+
+    async def get_device_changes(
+        self, sections: Iterable[str] | None = None
+    ) -> ChangeSet:
+        """Refresh devices and return what changed since the previous call.
+
+        The first call reports every device as added; the latest device dicts
+        stay available through ``device_state.state(serial)``. ``sections``
+        works as in :meth:`get_device_index`.
+        """
+        index = await self.get_device_index(sections)
+        return self.device_state.update(index.devices())
+
+    async def get_device_records(
+        self,
+        serial: str | None = None,
+        sections: Iterable[str] | None = None,
+    ) -> dict[str, EzvizDeviceRecord] | EzvizDeviceRecord | dict[Any, Any]:
+        """Return devices as EzvizDeviceRecord mapping (or single record)."""
+        devices = await self.get_device_infos(sections=sections)
+        records = build_device_records_map(devices)
+        if serial is None:
+            return records
+        return records.get(serial) or devices.get(serial, {})
+
+    # ---- Alarms ----------------------------------------------------------------
+
+    async def get_device_messages_list(
+        self,
+        serials: str | None = None,
+        s_type: str | int | Iterable[str | int] | None = DEFAULT_UNIFIEDMSG_STYPE,
+        *,
+        limit: int = 20,
+        date: str | dt.date | dt.datetime | None = None,
+        end_time: str | int | None = "",
+        max_retries: int = 0,
+    ) -> dict:
+        """Return unified alarm/message list for the requested devices.
+
+        Same arguments as :meth:`EzvizClient.get_device_messages_list`.
+        """
+        if max_retries > MAX_RETRIES:
+            raise PyEzvizError("Can't gather proper data. Max retries exceeded.")
+
+        json_output = await self._request_json(
+            "GET",
+            API_ENDPOINT_UNIFIEDMSG_LIST_GET,
+            params=self._unifiedmsg_params(
+                serials, s_type, limit=limit, date=date, end_time=end_time
+            ),
+            retry_401=True,
+            max_retries=max_retries,
+        )
+        self._ensure_ok(json_output, "Could not get unified message list")
+        return json_output
+
+    async def sync_messages(
+        self, serials: Iterable[str] | None = None
+    ) -> MessageBatch:
+        """Read the unified messages that arrived since the previous call.
+
+        Same contract as :meth:`EzvizClient.sync_messages`.
+        """
+        semaphore = asyncio.Semaphore(self._unifiedmsg_parallel)
+
+        async def _run_chunk(chunk: FillChunk) -> FillChunk:
+            async with semaphore:
+                while (request := chunk.next_request()) is not None:
+                    try:
+                        response = await self.get_device_messages_list(
+                            **request, max_retries=1
+                        )
+                    except PyEzvizError as err:
+                        # Kept in the chunk: the other chunks still merge
+                        chunk.fail(err)
+                    else:
+                        chunk.feed(response)
+            return chunk
+
+        async with self._message_lock:
+            run = self.message_sync.begin(serials)
+            while (request := run.next_request()) is not None:
+                try:
+                    response = await self.get_device_messages_list(
+                        **request, max_retries=1
+                    )
+                except PyEzvizError as err:
+                    run.fail(err)
+                else:
+                    run.feed(response)
+            # gather keeps chunk order, so the merge does not depend on timing
+            for chunk in await asyncio.gather(*map(_run_chunk, run.fill_chunks())):
+                run.feed_chunk(chunk)
+            return run.finish()
+
+    def iter_messages(
+        self,
+        since: str | dt.date | dt.datetime,
+        until: str | dt.date | dt.datetime | None = None,
+        *,
+        serials: Iterable[str] | None = None,
+        page_size: int = DEFAULT_STREAM_PAGE_SIZE,
+        prefetch: int = DEFAULT_STREAM_PREFETCH,
+        cursor: MessageCursor | str | None = None,
+    ) -> AsyncMessageStream:
+        """Iterate the unified messages of a date range, newest first.
+
+        Same arguments as :meth:`EzvizClient.iter_messages`; use with
+        ``async for`` (and ``async with`` to stop the read-ahead early).
+        """
+        pager = RangePager(
+            since,
+            until,
+            serials=",".join(serials) if serials else None,
+            page_size=page_size,
+            cursor=cursor,
+        )
+        return AsyncMessageStream(
+            functools.partial(self.get_device_messages_list, max_retries=1),
+            pager,
+            prefetch,
+        )
+
+    async def _prefetch_latest_camera_alarms(
+        self, serials: Iterable[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Return the most recent unified message per camera serial.
+
+        Same contract as :meth:`EzvizClient._prefetch_latest_camera_alarms`.
+        """
+        serial_list = [serial for serial in serials if serial]
+        if not serial_list:
+            return {}
+        try:
+            return (await self.sync_messages(serial_list)).latest
+        except PyEzvizError as err:
+            _LOGGER.debug(
+                "alarm_prefetch_failed: serials=%s error=%r", ",".join(serial_list), err
+            )
+        latest = {
+            serial: self.message_sync.latest(serial) for serial in serial_list
+        }
+        return {serial: item for serial, item in latest.items() if item is not None}
+
+    # ---- Pictures --------------------------------------------------------------
+
+    async def get_cam_key(
+        self, serial: str, smscode: int | None = None, max_retries: int = 0
+    ) -> Any:
+        """Get the camera encryption key used for encrypted alarm pictures.
+
+        Same contract as :meth:`EzvizClient.get_cam_key`.
+        """
+        form = {
+            key: value
+            for key, value in self._cam_key_form(serial, smscode).items()
+            if value is not None
+        }
+        attempts = max(0, max_retries)
+        for attempt in range(attempts + 1):
+            json_output = await self._request_json(
+                "POST",
+                API_ENDPOINT_CAM_ENCRYPTKEY,
+                data=form,
+                retry_401=True,
+                max_retries=0,
+            )
+            key = self._cam_key_from(json_output, serial, attempt < attempts)
+            if key is not None:
+                return key
+
+        raise PyEzvizError("Could not get camera encryption key: exceeded retries")
+
+    async def get_picture(
+        self, url: str, headers: dict[str, str] | None = None
+    ) -> bytes:
+        """Download an alarm picture from its (pre-signed) URL.
+
+        The session id is not sent: picture URLs point at storage hosts.
+        """
+        try:
+            async with self._session.get(
+                url, headers=headers, timeout=self._timeout
+            ) as resp:
+                resp.raise_for_status()
+                return await resp.read()
+        except aiohttp.ClientResponseError as err:
+            raise HTTPError from err
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+            raise InvalidURL("A Invalid URL or Proxy error occurred") from err
+
+    # ---- Locks -----------------------------------------------------------------
+
+    async def remote_unlock(
+        self,
+        serial: str,
+        user_id: str,
+        lock_no: int,
+        *,
+        resource_id: str | None = None,
+        local_index: str | int | None = None,
+        stream_token: str | None = None,
+        lock_type: str | None = None,
+    ) -> bool:
+        """Send a remote command to unlock a specific lock.
+
+        Same arguments as :meth:`EzvizClient.remote_unlock`.
+
+        Raises:
+            PyEzvizError: If the response indicates failure.
+            HTTPError: If an HTTP error occurs (other than a 401, which triggers re-login).
+        """
+        return await self._lock_action(
+            API_ENDPOINT_REMOTE_UNLOCK,
+            "remote_unlock",
+            serial,
+            user_id,
+            lock_no,
+            resource_id=resource_id,
+            local_index=local_index,
+            stream_token=stream_token,
+            lock_type=lock_type,
+        )
+
+    async def remote_lock(
+        self,
+        serial: str,
+        user_id: str,
+        lock_no: int,
+        *,
+        resource_id: str | None = None,
+        local_index: str | int | None = None,
+        stream_token: str | None = None,
+        lock_type: str | None = None,
+    ) -> bool:
+        """Send a remote lock command to a specific lock."""
+        return await self._lock_action(
+            API_ENDPOINT_REMOTE_LOCK,
+            "remote_lock",
+            serial,
+            user_id,
+            lock_no,
+            resource_id=resource_id,
+            local_index=local_index,
+            stream_token=stream_token,
+            lock_type=lock_type,
+        )
+
+    async def _lock_action(
+        self,
+        endpoint: str,
+        log: str,
+        serial: str,
+        user_id: str,
+        lock_no: int,
+        **route: Any,
+    ) -> bool:
+        path, payload = self._lock_request(endpoint, serial, user_id, lock_no, **route)
+        json_result = await self._request_json(
+            "PUT",
+            path,
+            json_body=payload,
+            retry_401=True,
+            max_retries=0,
+        )
+        _LOGGER.debug(
+            "http_debug: serial=%s code=%s msg=%s",
+            serial,
+            self._response_code(json_result),
+            log,
+        )
+        self._ensure_ok(json_result, f"Could not send {log} command")
+        return True
@@ -0,0 +1,111 @@
+"""Session lifetime tracking and token change notifications.
+
+EZVIZ session ids are JWTs whose ``exp`` claim tells when the cloud starts
+answering 401. :class:`TokenManager` reads that claim (without verifying the
+signature, it is only used for scheduling) so the clients can refresh a
+little before expiry instead of letting every in-flight request fail at
+once, and lets callers subscribe to refreshed tokens to persist them.
+
+The clients own the locking: ``EzvizClient`` serializes refreshes behind a
+``threading`` lock, ``AsyncEzvizClient`` behind an ``asyncio`` lock. Either
+way only one refresh is in flight and the other callers reuse its result.
+"""
+
+from __future__ import annotations
+
+import base64
+from collections.abc import Callable, Mapping
+import json
+import logging
+import threading
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_MARGIN = 300.0
+
+TokenListener = Callable[[dict[str, Any]], None]
+
+
+def session_claims(session_id: str | None) -> dict[str, Any]:
+    """Return the JWT claims of a session id, or {} when it is not a JWT."""
+    if not session_id or session_id.count(".") != 2:
+        return {}
+    payload = session_id.split(".")[1]
+    try:
+        decoded = base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        claims = json.loads(decoded)
+    except (ValueError, TypeError):
+        return {}
+    return claims if isinstance(claims, dict) else {}
+
+
+class TokenManager:
+    """Decide when to refresh the session and fan out refreshed tokens."""
+
+    def __init__(self, refresh_margin: float = DEFAULT_REFRESH_MARGIN) -> None:
+        """Refresh ``refresh_margin`` seconds before the session expires.
+
+        The margin is capped to a quarter of the session lifetime so a short
+        lived session is not refreshed on every request.
+        """
+        self.refresh_margin = refresh_margin
+        self._listeners: list[TokenListener] = []
+        self._listeners_lock = threading.Lock()
+        self._attempted: str | None = None
+        self.refreshes = 0
+
+    def expires_at(self, token: Mapping[str, Any]) -> float | None:
+        """Return the session expiry as a UNIX timestamp, if known."""
+        exp = session_claims(token.get("session_id")).get("exp")
+        return float(exp) if isinstance(exp, (int, float)) else None
+
+    def needs_refresh(self, token: Mapping[str, Any], now: float | None = None) -> bool:
+        """Return True when the session should be refreshed proactively.
+
+        Only sessions with a refresh id and a readable expiry qualify, and a
+        session is attempted at most once: if that refresh fails, the normal
+        401 handling takes over.
+        """
+        session_id = token.get("session_id")
+        if not session_id or not token.get("rf_session_id"):
+            return False
+        if session_id == self._attempted:
+            return False
+        claims = session_claims(session_id)
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)):
+            return False
+        margin = self.refresh_margin
+        iat = claims.get("iat")
+        if isinstance(iat, (int, float)) and exp > iat:
+            margin = min(margin, (exp - iat) / 4)
+        return (time.time() if now is None else now) >= exp - margin
+
+    def mark_attempted(self, token: Mapping[str, Any]) -> None:
+        """Remember that a proactive refresh was tried for this session."""
+        self._attempted = token.get("session_id")
+
+    def subscribe(self, listener: TokenListener) -> Callable[[], None]:
+        """Call ``listener`` with a copy of every new token; returns an unsubscribe."""
+        with self._listeners_lock:
+            self._listeners.append(listener)
+
+        def _unsubscribe() -> None:
+            with self._listeners_lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return _unsubscribe
+
+    def publish(self, token: Mapping[str, Any]) -> None:
+        """Notify subscribers of a new token; listener errors are logged."""
+        self.refreshes += 1
+        with self._listeners_lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(dict(token))
+            except Exception:
+                _LOGGER.exception("Token listener %r failed", listener)
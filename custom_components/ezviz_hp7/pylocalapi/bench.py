@@ -0,0 +1,516 @@
+"""Offline benchmarks for pylocalapi hot paths.
+
+Runs against synthetic payloads and a stubbed transport, so no account or
+network is needed::
+
+    python -m pylocalapi.bench pagelist --devices 30 300 3000 --latency 80
+    python -m pylocalapi.bench codec --devices 300 3000 --payload pagelist.json
+    python -m pylocalapi.bench importtime
+    python -m pylocalapi.bench unifiedmsg --serials 20 200 1000 --latency 40
+
+Each benchmark prints wall time and peak traced allocations for the old and
+the current implementation side by side. ``unifiedmsg`` instead serves the
+unified message list from a local HTTP server, so the real client stack
+(session pool, retry policy, JSON decoding) runs end to end.
+``importtime`` runs ``python -X importtime`` in a subprocess and exits with
+1 when a heavy dependency is loaded eagerly again, so it can guard start-up
+time in CI.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+import functools
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any
+import urllib.parse
+
+from . import codec
+from .api_endpoints import API_ENDPOINT_UNIFIEDMSG_LIST_GET
+from .client import UNIFIEDMSG_MAX_PARALLEL, EzvizClient
+from .utils import deep_merge, merge_pages
+
+PAGE_LIMIT = 30
+
+# Modules that must not be imported until the feature needing them is used
+LAZY_DEPENDENCIES = ("Crypto", "xmltodict", "paho", "pandas", "aiohttp")
+IMPORT_TARGETS = ("pylocalapi", "pylocalapi.client", "pylocalapi.__main__")
+
+
+# ---------------------------------------------------------------------------
+# Synthetic payloads
+# ---------------------------------------------------------------------------
+
+
+def _device_sections(index: int) -> dict[str, Any]:
+    """Return pagelist sections for one fake device."""
+    serial = f"BE{index:07d}"
+    res_id = f"{index:032x}"
+    return {
+        "deviceInfos": [
+            {
+                "deviceSerial": serial,
+                "name": f"Device {index}",
+                "deviceCategory": "BDoorBell",
+                "version": "V5.3.8 build 240101",
+                "status": 1,
+                "supportExt": json.dumps({str(code): "1" for code in range(40)}),
+            }
+        ],
+        "resourceInfos": [
+            {
+                "resourceId": res_id,
+                "deviceSerial": serial,
+                "localIndex": "1",
+                "resourceName": f"Device {index}",
+                "streamToken": "",
+            }
+        ],
+        "CLOUD": {res_id: {"deviceSerial": serial, "status": 0}},
+        "VTM": {res_id: {"domain": "vtm.example", "port": 8554}},
+        "CHANNEL": {res_id: {"channelNo": 1, "show": True}},
+        "VIDEO_QUALITY": {res_id: [{"videoLevel": 2}, {"videoLevel": 3}]},
+        "STATUS": {
+            serial: {
+                "globalStatus": 0,
+                "optionals": json.dumps({"timeZone": "UTC+01:00", "latestUnbandingTime": ""}),
+            }
+        },
+        "WIFI": {serial: {"ssid": "home", "signal": 70, "address": "192.168.1.10"}},
+        "CONNECTION": {serial: {"localIp": "192.168.1.10", "netIp": "203.0.113.1"}},
+        "SWITCH": {serial: [{"type": code, "enable": True} for code in range(12)]},
+        "KMS": {serial: {"secretKey": "x" * 32, "version": "101"}},
+        "P2P": {serial: [{"ip": "198.51.100.1", "port": 6000}]},
+        "FEATURE": {serial: {"featureCode": "f" * 16}},
+        "UPGRADE": {serial: {"isNeedUpgrade": 0, "upgradePercent": 0}},
+    }
+
+
+def build_pagelist_pages(devices: int, limit: int = PAGE_LIMIT) -> list[dict[str, Any]]:
+    """Return the pagelist responses an account with ``devices`` devices yields."""
+    pages: list[dict[str, Any]] = []
+    for offset in range(0, max(devices, 1), limit):
+        page: dict[str, Any] = {}
+        for index in range(offset, min(offset + limit, devices)):
+            for key, value in _device_sections(index).items():
+                if isinstance(value, list):
+                    page.setdefault(key, []).extend(value)
+                else:
+                    page.setdefault(key, {}).update(value)
+        page["meta"] = {"code": 200}
+        page["page"] = {
+            "offset": offset,
+            "limit": limit,
+            "totalResults": devices,
+            "hasNext": offset + limit < devices,
+        }
+        pages.append(page)
+    return pages
+
+
+class _StubPagelistClient(EzvizClient):
+    """EzvizClient whose pagelist requests are served from memory after a delay."""
+
+    def __init__(self, pages: list[dict[str, Any]], latency: float) -> None:
+        super().__init__("bench", "bench", url="bench.invalid")
+        self._raw_pages = {page["page"]["offset"]: json.dumps(page) for page in pages}
+        self._latency = latency
+
+    def _request_json(self, method: str, path: str, **kwargs: Any) -> dict:
+        time.sleep(self._latency)
+        offset = int(kwargs["params"]["offset"])
+        return json.loads(self._raw_pages[offset])
+
+    def legacy_pagelist(self, offset: int = 0) -> Any:
+        """Old recursive pager: sequential requests, deep_merge at each level."""
+        page = self._request_json(
+            "GET", "", params={"offset": offset, "limit": PAGE_LIMIT}
+        )
+        if (page.get("page") or {}).get("hasNext"):
+            page = deep_merge(page, self.legacy_pagelist(offset + PAGE_LIMIT))
+        return page
+
+
+def build_unifiedmsg_list(serials: int) -> list[dict[str, Any]]:
+    """Return an account's unified messages, newest first.
+
+    A few busy devices fill the newest pages, as on real accounts, so the
+    account-wide scan misses most serials and the per-device chunks do the
+    work. Every device has two older messages.
+    """
+    busy = max(1, serials // 20)
+    messages: list[dict[str, Any]] = []
+    stamp = 1_700_000_000_000
+    for index in range(300):
+        messages.append(
+            {"msgId": f"busy{index}", "deviceSerial": f"BE{index % busy:07d}"}
+        )
+    for index in range(serials * 2):
+        messages.append(
+            {"msgId": f"old{index}", "deviceSerial": f"BE{index % serials:07d}"}
+        )
+    for message in messages:
+        stamp -= 1000
+        message.update(
+            time=stamp, title="Motion", ext={"alarmType": "10000"}, subType="92"
+        )
+    return messages
+
+
+class _MockCloud(ThreadingHTTPServer):
+    """Local HTTP server answering the unified message list after a delay."""
+
+    daemon_threads = True
+
+    def __init__(self, messages: list[dict[str, Any]], latency: float) -> None:
+        super().__init__(("127.0.0.1", 0), _MockCloudHandler)
+        self.messages = messages
+        self.latency = latency
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+
+    def page(self, query: dict[str, str]) -> dict[str, Any]:
+        """Return the response for one unified message list query."""
+        wanted = set(query["serials"].split(",")) if query.get("serials") else None
+        items = [
+            message
+            for message in self.messages
+            if wanted is None or message["deviceSerial"] in wanted
+        ]
+        if query.get("endTime"):
+            ids = [message["msgId"] for message in items]
+            items = items[ids.index(query["endTime"]) + 1 :]
+        limit = int(query.get("limit", 20))
+        return {
+            "meta": {"code": 200},
+            "message": items[:limit],
+            "hasNext": len(items) > limit,
+        }
+
+
+class _MockCloudHandler(BaseHTTPRequestHandler):
+    server: _MockCloud
+
+    def do_GET(self) -> None:
+        path, _, raw_query = self.path.partition("?")
+        query = dict(urllib.parse.parse_qsl(raw_query))
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.in_flight += 1
+            self.server.peak_in_flight = max(
+                self.server.peak_in_flight, self.server.in_flight
+            )
+        try:
+            time.sleep(self.server.latency)
+            if path != API_ENDPOINT_UNIFIEDMSG_LIST_GET:
+                self.send_error(404)
+                return
+            body = json.dumps(self.server.page(query)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with self.server.lock:
+                self.server.in_flight -= 1
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep the benchmark output clean."""
+
+
+class _LocalClient(EzvizClient):
+    """EzvizClient pointed at a :class:`_MockCloud` over plain HTTP."""
+
+    def __init__(self, port: int, parallel: int) -> None:
+        super().__init__(
+            token={
+                "session_id": "bench",
+                "rf_session_id": "bench",
+                "username": "bench",
+                "api_url": f"127.0.0.1:{port}",
+            },
+            unifiedmsg_parallel=parallel,
+        )
+
+    def _url(self, path: str) -> str:
+        return f"http://{self._token['api_url']}{path}"
+
+
+def build_mqtt_message() -> bytes:
+    """Return an MQTT push payload shaped like the ones the broker sends."""
+    ext = ",".join(
+        [
+            "1",
+            "2024-01-01 12:00:00",
+            "BE0000001",
+            "Front door",
+            "2",
+            "https://alarm.example/picture.jpg?x=" + "a" * 64,
+        ]
+        + ["0"] * 20
+    )
+    return json.dumps(
+        {"id": "123456", "alert": "Motion detected", "ext": ext, "time": 1704110400}
+    ).encode()
+
+
+# ---------------------------------------------------------------------------
+# Measurement helpers
+# ---------------------------------------------------------------------------
+
+
+def measure(func: Callable[[], Any]) -> tuple[float, int, Any]:
+    """Return (wall seconds, peak traced bytes, result) of one call."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = func()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def best_of(func: Callable[[], Any], rounds: int) -> float:
+    """Return the fastest of ``rounds`` calls, in seconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _row(label: str, elapsed: float, peak: int) -> str:
+    return f"  {label:<28} {elapsed * 1000:>10.1f} ms {peak / 1024:>12.0f} KiB"
+
+
+def _time_row(label: str, elapsed: float) -> str:
+    return f"  {label:<28} {elapsed * 1e6:>10.0f} us"
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+
+def bench_pagelist(devices: list[int], latency_ms: float) -> int:
+    """Compare recursive/deep_merge paging with the concurrent linear pager."""
+    latency = latency_ms / 1000
+    for count in devices:
+        pages = build_pagelist_pages(count)
+        print(f"{count} devices, {len(pages)} pages, {latency_ms:g} ms per request")
+
+        raw = [json.dumps(page) for page in pages]
+        merge_old = measure(
+            lambda: functools.reduce(
+                lambda acc, page: deep_merge(acc, page), (json.loads(r) for r in raw)
+            )
+        )
+        merge_new = measure(lambda: merge_pages(json.loads(r) for r in raw))
+        if merge_old[2] != merge_new[2]:
+            print("  merge results differ!", file=sys.stderr)
+            return 1
+        print(_row("merge: deep_merge fold", *merge_old[:2]))
+        print(_row("merge: merge_pages", *merge_new[:2]))
+
+        client = _StubPagelistClient(pages, latency)
+        fetch_old = measure(client.legacy_pagelist)
+        fetch_new = measure(
+            lambda: client._api_get_pagelist(page_filter="BENCH", json_key=None)
+        )
+        print(_row("fetch: recursive sequential", *fetch_old[:2]))
+        print(_row("fetch: concurrent linear", *fetch_new[:2]))
+    return 0
+
+
+def bench_codec(devices: list[int], payloads: list[Path], rounds: int) -> int:
+    """Compare text decode + stdlib json with every installed codec backend.
+
+    ``payloads`` are recorded response bodies (e.g. a pagelist saved from the
+    CLI); synthetic pagelist pages and an MQTT message are always included.
+    """
+    samples: list[tuple[str, bytes]] = [
+        (
+            f"pagelist {count} devices",
+            json.dumps(merge_pages(build_pagelist_pages(count))).encode(),
+        )
+        for count in devices
+    ]
+    samples.append(("mqtt message", build_mqtt_message()))
+    samples.extend((path.name, path.read_bytes()) for path in payloads)
+
+    current = codec.backend()
+    try:
+        for label, body in samples:
+            print(f"{label}: {len(body):,} bytes")
+            expected = json.loads(body.decode("utf-8"))
+            baseline = best_of(lambda: json.loads(body.decode("utf-8")), rounds)
+            print(_time_row("text decode + json.loads", baseline))
+            for name in codec.available_backends():
+                codec.use_backend(name)
+                if codec.loads(body) != expected:
+                    print(f"  {name} result differs!", file=sys.stderr)
+                    return 1
+                elapsed = best_of(lambda: codec.loads(body), rounds)
+                print(
+                    _time_row(f"codec.loads [{name}]", elapsed)
+                    + f"  x{baseline / elapsed:.1f}"
+                )
+    finally:
+        codec.use_backend(current)
+    return 0
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Return ``{imported module: cumulative microseconds}`` for a fresh import.
+
+    The subprocess runs from the directory holding this package, so
+    ``pylocalapi`` resolves to this checkout.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            times[parts[2].strip()] = int(parts[1])
+    return times
+
+
+def bench_importtime(targets: list[str], top: int, budget_ms: float | None) -> int:
+    """Report import cost per target and fail on eagerly loaded heavy modules."""
+    failed = False
+    for target in targets:
+        times = import_times(target)
+        total = max(times.values(), default=0)
+        print(f"import {target}: {total / 1000:.1f} ms, {len(times)} modules")
+        for name, cumulative in sorted(times.items(), key=lambda i: -i[1])[1 : top + 1]:
+            print(f"  {name:<40} {cumulative / 1000:>8.1f} ms")
+        eager = sorted(
+            {
+                name.split(".")[0]
+                for name in times
+                if name.split(".")[0] in LAZY_DEPENDENCIES
+            }
+        )
+        if eager:
+            print(f"  eagerly imported: {', '.join(eager)}", file=sys.stderr)
+            failed = True
+        if budget_ms is not None and total / 1000 > budget_ms:
+            print(f"  over budget of {budget_ms:g} ms", file=sys.stderr)
+            failed = True
+    return 1 if failed else 0
+
+
+def bench_unifiedmsg(serials: list[int], latency_ms: float, parallel: list[int]) -> int:
+    """Time a cold sync_messages (baseline of every serial) per parallelism."""
+    for count in serials:
+        server = _MockCloud(build_unifiedmsg_list(count), latency_ms / 1000)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        wanted = [f"BE{index:07d}" for index in range(count)]
+        print(f"{count} serials, {latency_ms:g} ms per request")
+        reference: Any = None
+        try:
+            for workers in parallel:
+                server.requests = server.peak_in_flight = 0
+                client = _LocalClient(server.server_address[1], workers)
+                started = time.perf_counter()
+                batch = client.sync_messages(wanted)
+                elapsed = time.perf_counter() - started
+                client.close_session()
+                merged = (
+                    {serial: msg["msgId"] for serial, msg in batch.latest.items()},
+                    [msg["msgId"] for msg in batch.read],
+                )
+                if reference is None:
+                    reference = merged
+                elif merged != reference:
+                    print("  results differ between parallelism levels!", file=sys.stderr)
+                    return 1
+                print(
+                    f"  {'parallel ' + str(workers):<28} {elapsed * 1000:>10.1f} ms"
+                    f" {server.requests:>5} requests, {server.peak_in_flight} in flight,"
+                    f" {len(batch.latest)}/{count} devices"
+                )
+        finally:
+            server.shutdown()
+            server.server_close()
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse arguments and run the selected benchmark."""
+    parser = argparse.ArgumentParser(prog="python -m pylocalapi.bench")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    pagelist = sub.add_parser("pagelist", help="pagelist paging and merging")
+    pagelist.add_argument("--devices", type=int, nargs="+", default=[30, 300, 3000])
+    pagelist.add_argument(
+        "--latency", type=float, default=80.0, help="simulated ms per request"
+    )
+
+    codec_parser = sub.add_parser("codec", help="JSON decoding backends")
+    codec_parser.add_argument("--devices", type=int, nargs="+", default=[300, 3000])
+    codec_parser.add_argument(
+        "--payload",
+        type=Path,
+        nargs="*",
+        default=[],
+        help="recorded JSON response bodies to include",
+    )
+    codec_parser.add_argument("--rounds", type=int, default=20)
+
+    importtime = sub.add_parser("importtime", help="import cost and lazy imports")
+    importtime.add_argument(
+        "--module", nargs="+", default=list(IMPORT_TARGETS), dest="modules"
+    )
+    importtime.add_argument("--top", type=int, default=8)
+    importtime.add_argument(
+        "--budget", type=float, default=None, help="fail above this many ms"
+    )
+
+    unifiedmsg = sub.add_parser("unifiedmsg", help="cold alarm sync, chunk parallelism")
+    unifiedmsg.add_argument("--serials", type=int, nargs="+", default=[20, 200, 1000])
+    unifiedmsg.add_argument(
+        "--latency", type=float, default=40.0, help="server delay per request, ms"
+    )
+    unifiedmsg.add_argument(
+        "--parallel",
+        type=int,
+        nargs="+",
+        default=sorted({1, UNIFIEDMSG_MAX_PARALLEL, 8}),
+        help="unifiedmsg_parallel values to compare (first is the baseline)",
+    )
+
+    args = parser.parse_args(argv)
+    if args.bench == "importtime":
+        return bench_importtime(args.modules, args.top, args.budget)
+    if args.bench == "pagelist":
+        return bench_pagelist(args.devices, args.latency)
+    if args.bench == "codec":
+        return bench_codec(args.devices, args.payload, args.rounds)
+    if args.bench == "unifiedmsg":
+        return bench_unifiedmsg(args.serials, args.latency, args.parallel)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
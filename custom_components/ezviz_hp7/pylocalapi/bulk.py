@@ -0,0 +1,208 @@
+"""Run the same kind of command against many devices concurrently.
+
+``EzvizClient.run_bulk`` takes a list of ``(operation, serial, args)`` specs,
+runs them on a bounded thread pool and returns a :class:`BulkReport` with one
+:class:`BulkResult` per spec, in input order. A failing device never aborts
+the others: its exception is captured in the report.
+
+Concurrency is limited twice: ``max_workers`` bounds the pool of one call,
+and a per-client semaphore bounds all bulk calls of the same account, so two
+overlapping bulk runs cannot flood the cloud with requests.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import Any
+
+import requests
+
+from .exceptions import PyEzvizError
+
+DEFAULT_BULK_CONCURRENCY = 8
+
+# Client methods that act on one serial (passed first) and may be bulked.
+BULK_OPERATIONS = frozenset(
+    {
+        "alarm_sound",
+        "detection_sensibility",
+        "do_not_disturb",
+        "reboot_camera",
+        "set_battery_camera_work_mode",
+        "set_camera_defence",
+        "set_floodlight_brightness",
+        "set_night_vision_mode",
+        "set_offline_notification",
+        "set_switch",
+        "sound_alarm",
+        "switch_status",
+        "upgrade_device",
+    }
+)
+
+
+@dataclass(frozen=True)
+class BulkOperation:
+    """One client call: ``operation(serial, *args, **kwargs)``."""
+
+    operation: str
+    serial: str
+    args: tuple[Any, ...] = ()
+    kwargs: Mapping[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_spec(cls, spec: Any) -> BulkOperation:
+        """Build an operation from ``(operation, serial[, args])``.
+
+        ``args`` is either a sequence of positional arguments or a mapping
+        of keyword arguments.
+
+        Raises:
+            PyEzvizError: If the spec is malformed or the operation is not
+                in :data:`BULK_OPERATIONS`.
+        """
+        if isinstance(spec, BulkOperation):
+            op = spec
+        else:
+            if not isinstance(spec, (tuple, list)) or len(spec) not in (2, 3):
+                raise PyEzvizError(f"Invalid bulk operation spec: {spec!r}")
+            name, serial, *rest = spec
+            extra = rest[0] if rest else ()
+            if isinstance(extra, Mapping):
+                op = cls(name, serial, (), dict(extra))
+            else:
+                op = cls(name, serial, tuple(extra))
+        if op.operation not in BULK_OPERATIONS:
+            raise PyEzvizError(f"Unsupported bulk operation: {op.operation}")
+        return op
+
+
+@dataclass(frozen=True)
+class BulkResult:
+    """Outcome of one bulk operation."""
+
+    operation: str
+    serial: str
+    ok: bool
+    result: Any = None
+    error: BaseException | None = None
+    elapsed: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable view of the result."""
+        return {
+            "operation": self.operation,
+            "serial": self.serial,
+            "ok": self.ok,
+            "result": self.result if self.ok else None,
+            "error": (
+                f"{type(self.error).__name__}: {self.error}" if self.error else None
+            ),
+            "elapsed_ms": round(self.elapsed * 1000, 1),
+        }
+
+
+@dataclass
+class BulkReport:
+    """Aggregated outcome of a bulk run, one result per input spec."""
+
+    results: list[BulkResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of operations run."""
+        return len(self.results)
+
+    @property
+    def ok(self) -> bool:
+        """Return True when every operation succeeded."""
+        return all(result.ok for result in self.results)
+
+    @property
+    def succeeded(self) -> list[BulkResult]:
+        """Return the successful results."""
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> list[BulkResult]:
+        """Return the failed results."""
+        return [result for result in self.results if not result.ok]
+
+    def errors(self) -> dict[str, BaseException]:
+        """Return ``{serial: error}`` for the failed operations."""
+        return {
+            result.serial: result.error
+            for result in self.results
+            if result.error is not None
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable summary plus every result."""
+        return {
+            "total": len(self.results),
+            "succeeded": len(self.succeeded),
+            "failed": len(self.failed),
+            "elapsed_ms": round(self.elapsed * 1000, 1),
+            "results": [result.as_dict() for result in self.results],
+        }
+
+
+def run_bulk(
+    call: Callable[[BulkOperation], Any],
+    operations: Iterable[Any],
+    *,
+    limiter: threading.Semaphore,
+    max_workers: int = DEFAULT_BULK_CONCURRENCY,
+) -> BulkReport:
+    """Run ``call`` for every operation and collect the outcomes.
+
+    Args:
+        call: Performs one operation (normally dispatches to a client method).
+        operations: Specs accepted by :meth:`BulkOperation.from_spec`. All are
+            validated before anything runs.
+        limiter: Semaphore shared by every bulk run of the same account.
+        max_workers: Upper bound of threads for this run.
+    """
+    ops = [BulkOperation.from_spec(spec) for spec in operations]
+    started = time.perf_counter()
+
+    def _run(op: BulkOperation) -> BulkResult:
+        with limiter:
+            op_started = time.perf_counter()
+            try:
+                result = call(op)
+            except (
+                PyEzvizError,
+                requests.RequestException,
+                KeyError,
+                TypeError,
+                ValueError,
+            ) as err:
+                return BulkResult(
+                    op.operation,
+                    op.serial,
+                    False,
+                    error=err,
+                    elapsed=time.perf_counter() - op_started,
+                )
+            return BulkResult(
+                op.operation,
+                op.serial,
+                True,
+                result=result,
+                elapsed=time.perf_counter() - op_started,
+            )
+
+    if len(ops) <= 1 or max_workers <= 1:
+        results = [_run(op) for op in ops]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=min(len(ops), max_workers),
+            thread_name_prefix="ezviz-bulk",
+        ) as pool:
+            results = list(pool.map(_run, ops))
+    return BulkReport(results, time.perf_counter() - started)
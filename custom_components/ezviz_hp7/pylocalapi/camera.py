@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 import datetime
+import inspect
 import logging
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast
 
@@ -17,6 +19,7 @@ from .utils import (
 )
 
 if TYPE_CHECKING:
+    from .async_client import AsyncEzvizClient
     from .client import EzvizClient
 
 
@@ -26,6 +29,82 @@ DEFAULT_ALARM_IMAGE_URL = (
     "https://eustatics.ezvizlife.com/ovs_mall/web/img/index/EZVIZ_logo.png?ver=3007907502"
 )
 UNIFIEDMSG_LOOKBACK_DAYS = 7
+# Status keys derived from the latest alarm rather than the pagelist.
+ALARM_STATUS_KEYS = frozenset(
+    {
+        "Motion_Trigger",
+        "Seconds_Last_Trigger",
+        "last_alarm_time",
+        "last_alarm_pic",
+        "last_alarm_pic_checksum",
+        "last_alarm_pic_crypt",
+        "last_alarm_type_code",
+        "last_alarm_type_name",
+    }
+)
+
+
+def normalize_unified_message(message: dict[str, Any]) -> dict[str, Any]:
+    """Normalize unified message payload to legacy alarm shape."""
+    ext = message.get("ext")
+    if not isinstance(ext, dict):
+        ext = {}
+
+    pics_field = ext.get("pics")
+    multi_pic = None
+    if isinstance(pics_field, str) and pics_field:
+        multi_pic = next(
+            (part for part in pics_field.split(";") if part), None
+        )
+
+    def _first_valid(*candidates: Any) -> str:
+        for candidate in candidates:
+            if isinstance(candidate, str) and candidate:
+                return candidate
+        return DEFAULT_ALARM_IMAGE_URL
+
+    pic_url = _first_valid(
+        message.get("pic"),
+        multi_pic,
+        message.get("defaultPic"),
+    )
+
+    alarm_name = (
+        message.get("title")
+        or message.get("detail")
+        or message.get("sampleName")
+        or "NoAlarm"
+    )
+    alarm_type = ext.get("alarmType") or message.get("subType") or "0000"
+
+    time_value: Any = message.get("time")
+    if isinstance(time_value, str):
+        try:
+            time_value = int(time_value)
+        except (TypeError, ValueError):
+            try:
+                time_value = float(time_value)
+            except (TypeError, ValueError):
+                time_value = None
+
+    time_str = message.get("timeStr") or ext.get("alarmStartTime")
+
+    return {
+        "alarmId": message.get("msgId"),
+        "deviceSerial": message.get("deviceSerial"),
+        "channel": message.get("channel"),
+        "alarmStartTime": time_value,
+        "alarmStartTimeStr": time_str,
+        "alarmTime": time_value,
+        "alarmTimeStr": time_str,
+        "picUrl": pic_url,
+        "picChecksum": message.get("picChecksum") or ext.get("picChecksum"),
+        "picCrypt": message.get("picCrypt") or ext.get("picCrypt"),
+        "sampleName": alarm_name,
+        "alarmType": alarm_type,
+        "msgSource": "unifiedmsg",
+        "ext": ext,
+    }
 
 
 class CameraStatus(TypedDict, total=False):
@@ -59,6 +138,8 @@ class CameraStatus(TypedDict, total=False):
     Seconds_Last_Trigger: Any
     last_alarm_time: Any
     last_alarm_pic: str
+    last_alarm_pic_checksum: str | None
+    last_alarm_pic_crypt: Any
     last_alarm_type_code: str
     last_alarm_type_name: str
     cam_timezone: Any
@@ -87,11 +168,17 @@ class EzvizCamera:
     Wraps the Ezviz pagelist/device mapping and surfaces a stable API
     to query status and perform common actions (PTZ, switches, alarm
     settings, etc.). Designed for use in Home Assistant and scripts.
+
+    With an ``AsyncEzvizClient`` the camera is only a data model: the caller
+    awaits the client itself and feeds the results through ``device_obj``,
+    ``update(device_payload=..., latest_alarm=...)`` and ``status(refresh=False)``.
+    Anything that would fetch through the client raises PyEzvizError instead
+    of returning an un-awaited coroutine.
     """
 
     def __init__(
         self,
-        client: EzvizClient,
+        client: EzvizClient | AsyncEzvizClient,
         serial: str,
         device_obj: EzvizDeviceRecord | dict | None = None,
     ) -> None:
@@ -100,10 +187,14 @@ class EzvizCamera:
         Raises:
             InvalidURL: If the API endpoint/connection is invalid when fetching device info.
             HTTPError: If the API returns a non-success HTTP status while fetching device info.
-            PyEzvizError: On Ezviz API contract errors or decoding failures.
+            PyEzvizError: On Ezviz API contract errors or decoding failures, or
+                when ``device_obj`` is missing and the client is async.
         """
         self._client = client
         self._serial = serial
+        self._async_client = inspect.iscoroutinefunction(
+            getattr(client, "sync_messages", None)
+        )
         self._alarmmotiontrigger: dict[str, Any] = {
             "alarm_trigger_active": False,
             "timepassed": None,
@@ -112,6 +203,7 @@ class EzvizCamera:
         self._record: EzvizDeviceRecord | None = None
 
         if device_obj is None:
+            self._require_sync_client("device info")
             self._device = self._client.get_device_infos(self._serial)
         elif isinstance(device_obj, EzvizDeviceRecord):
             # Accept either a typed record or the original dict
@@ -121,18 +213,95 @@ class EzvizCamera:
             self._device = device_obj or {}
         self._last_alarm: dict[str, Any] = {}
         self._switch: dict[int, bool] = {}
+        self._load_switches()
+        # Device-derived part of status(), rebuilt only when a section changes
+        self._device_status: dict[str, Any] | None = None
+        self._tzinfo: datetime.tzinfo | None = None
+
+    def _load_switches(self) -> None:
+        """Collapse the SWITCH section into ``self._switch`` (in place)."""
+        self._switch.clear()
         if self._record and getattr(self._record, "switches", None):
-            self._switch = {int(k): bool(v) for k, v in self._record.switches.items()}
-        else:
-            switches = self._device.get("SWITCH") or []
-            if isinstance(switches, list):
-                for item in switches:
-                    if not isinstance(item, dict):
-                        continue
-                    t = item.get("type")
-                    en = item.get("enable")
-                    if isinstance(t, int) and isinstance(en, (bool, int)):
-                        self._switch[t] = bool(en)
+            self._switch.update(
+                {int(k): bool(v) for k, v in self._record.switches.items()}
+            )
+            return
+        switches = self._device.get("SWITCH") or []
+        if isinstance(switches, list):
+            for item in switches:
+                if not isinstance(item, dict):
+                    continue
+                t = item.get("type")
+                en = item.get("enable")
+                if isinstance(t, int) and isinstance(en, (bool, int)):
+                    self._switch[t] = bool(en)
+
+    def update(
+        self,
+        device_payload: EzvizDeviceRecord | Mapping[str, Any] | None = None,
+        latest_alarm: dict[str, Any] | None = None,
+    ) -> set[str]:
+        """Refresh this camera in place instead of building a new object.
+
+        Only the pagelist sections whose content differs from the cached
+        mapping are replaced; the device-derived fields used by status() are
+        recomputed on the next call only when something changed.
+
+        Args:
+            device_payload: New per-device mapping as returned by
+                ``get_device_infos(serial)`` (or an EzvizDeviceRecord). ``None``
+                keeps the cached device data.
+            latest_alarm: Unified message to apply as the latest alarm without
+                an extra HTTP request. ``None`` keeps the current alarm (its
+                motion window is still re-evaluated).
+
+        Returns:
+            set[str]: Names of the top-level sections that changed.
+        """
+        changed: set[str] = set()
+        if device_payload is not None:
+            record = (
+                device_payload
+                if isinstance(device_payload, EzvizDeviceRecord)
+                else None
+            )
+            new_map = record.raw if record is not None else device_payload
+            for key, value in new_map.items():
+                if key not in self._device or self._device[key] != value:
+                    self._device[key] = value
+                    changed.add(key)
+            for key in [key for key in self._device if key not in new_map]:
+                del self._device[key]
+                changed.add(key)
+
+            if changed:
+                if record is not None:
+                    self._record = record
+                elif self._record is not None:
+                    self._record = EzvizDeviceRecord.from_api(self._serial, self._device)
+                if "SWITCH" in changed:
+                    self._load_switches()
+                if "STATUS" in changed:
+                    self._tzinfo = None
+                self._device_status = None
+
+        if latest_alarm:
+            self._alarm_list(prefetched=latest_alarm)
+        elif self._last_alarm:
+            self._motion_trigger()
+        return changed
+
+    def _require_sync_client(self, what: str) -> None:
+        """Refuse a blocking fetch through an async client.
+
+        Raises:
+            PyEzvizError: If the camera wraps an ``AsyncEzvizClient``.
+        """
+        if self._async_client:
+            raise PyEzvizError(
+                f"Camera {self._serial} cannot fetch {what} through an async "
+                "client; await the client and pass the result in"
+            )
 
     def fetch_key(self, keys: list[Any], default_value: Any = None) -> Any:
         """Fetch dictionary key."""
@@ -143,13 +312,15 @@ class EzvizCamera:
 
         Args:
             prefetched: Optional unified message payload provided by the caller to
-                avoid an extra API request. When ``None``, the camera will query the
-                cloud API directly with a short date lookback window.
+                avoid an extra API request. When ``None``, the camera syncs the
+                client's unified message cursor and uses its latest message;
+                with an async client it is required.
 
         Raises:
             InvalidURL: If the API endpoint/connection is invalid.
             HTTPError: If the API returns a non-success HTTP status.
-            PyEzvizError: On Ezviz API contract errors or decoding failures.
+            PyEzvizError: On Ezviz API contract errors or decoding failures, or
+                when nothing was prefetched and the client is async.
         """
         if prefetched:
             self._last_alarm = self._normalize_unified_message(prefetched)
@@ -159,23 +330,11 @@ class EzvizCamera:
             self._motion_trigger()
             return
 
-        response = self._client.get_device_messages_list(
-            serials=self._serial,
-            limit=1,
-            date="",
-            end_time="",
-        )
-        messages = response.get("message") or response.get("messages") or []
-        if not isinstance(messages, list):
-            messages = []
-        latest_message = next(
-            (
-                msg
-                for msg in messages
-                if isinstance(msg, dict)
-                and msg.get("deviceSerial") == self._serial
-            ),
-            None,
+        self._require_sync_client("alarms")
+        # The client's message sync pages through every alarm since the last
+        # poll, so a burst is not reduced to its last message
+        latest_message = self._client.sync_messages([self._serial]).latest.get(
+            self._serial
         )
         if latest_message is None:
             _LOGGER.debug(
@@ -252,70 +411,14 @@ class EzvizCamera:
 
     def _normalize_unified_message(self, message: dict[str, Any]) -> dict[str, Any]:
         """Normalize unified message payload to legacy alarm shape."""
-        ext = message.get("ext")
-        if not isinstance(ext, dict):
-            ext = {}
-
-        pics_field = ext.get("pics")
-        multi_pic = None
-        if isinstance(pics_field, str) and pics_field:
-            multi_pic = next(
-                (part for part in pics_field.split(";") if part), None
-            )
-
-        def _first_valid(*candidates: Any) -> str:
-            for candidate in candidates:
-                if isinstance(candidate, str) and candidate:
-                    return candidate
-            return DEFAULT_ALARM_IMAGE_URL
-
-        pic_url = _first_valid(
-            message.get("pic"),
-            multi_pic,
-            message.get("defaultPic"),
-        )
-
-        alarm_name = (
-            message.get("title")
-            or message.get("detail")
-            or message.get("sampleName")
-            or "NoAlarm"
-        )
-        alarm_type = ext.get("alarmType") or message.get("subType") or "0000"
-
-        time_value: Any = message.get("time")
-        if isinstance(time_value, str):
-            try:
-                time_value = int(time_value)
-            except (TypeError, ValueError):
-                try:
-                    time_value = float(time_value)
-                except (TypeError, ValueError):
-                    time_value = None
-
-        time_str = message.get("timeStr") or ext.get("alarmStartTime")
-
-        return {
-            "alarmId": message.get("msgId"),
-            "deviceSerial": message.get("deviceSerial"),
-            "channel": message.get("channel"),
-            "alarmStartTime": time_value,
-            "alarmStartTimeStr": time_str,
-            "alarmTime": time_value,
-            "alarmTimeStr": time_str,
-            "picUrl": pic_url,
-            "picChecksum": message.get("picChecksum") or ext.get("picChecksum"),
-            "picCrypt": message.get("picCrypt") or ext.get("picCrypt"),
-            "sampleName": alarm_name,
-            "alarmType": alarm_type,
-            "msgSource": "unifiedmsg",
-            "ext": ext,
-        }
+        return normalize_unified_message(message)
 
     def _get_tzinfo(self) -> datetime.tzinfo:
         """Return tzinfo from camera setting if recognizable, else local tzinfo."""
-        tz_val = self.fetch_key(["STATUS", "optionals", "timeZone"])
-        return parse_timezone_value(tz_val)
+        if self._tzinfo is None:
+            tz_val = self.fetch_key(["STATUS", "optionals", "timeZone"])
+            self._tzinfo = parse_timezone_value(tz_val)
+        return self._tzinfo
 
     def _is_alarm_schedules_enabled(self) -> bool:
         """Check if alarm schedules enabled."""
@@ -340,7 +443,7 @@ class EzvizCamera:
 
         refresh: if True, updates alarm info via network before composing status.
         latest_alarm: Optional prefetched unified message payload to avoid an extra
-            HTTP request when ``refresh`` is True.
+            HTTP request when ``refresh`` is True (required with an async client).
 
         Raises:
             InvalidURL: If the API endpoint/connection is invalid while refreshing.
@@ -350,6 +453,35 @@ class EzvizCamera:
         if refresh:
             self._alarm_list(prefetched=latest_alarm)
 
+        if self._device_status is None:
+            self._device_status = self._compose_device_status()
+
+        data = dict(self._device_status)
+        data.update(
+            {
+                "Motion_Trigger": self._alarmmotiontrigger["alarm_trigger_active"],
+                "Seconds_Last_Trigger": self._alarmmotiontrigger["timepassed"],
+                # Keep last_alarm_time in sync with the time actually used to
+                # compute Motion_Trigger/Seconds_Last_Trigger.
+                "last_alarm_time": self._alarmmotiontrigger.get("last_alarm_time_str")
+                or self._last_alarm.get("alarmStartTimeStr"),
+                "last_alarm_pic": self._last_alarm.get(
+                    "picUrl",
+                    DEFAULT_ALARM_IMAGE_URL,
+                ),
+                "last_alarm_pic_checksum": self._last_alarm.get("picChecksum"),
+                "last_alarm_pic_crypt": self._last_alarm.get("picCrypt"),
+                "last_alarm_type_code": self._last_alarm.get("alarmType", "0000"),
+                "last_alarm_type_name": self._last_alarm.get("sampleName", "NoAlarm"),
+            }
+        )
+        return cast(CameraStatus, data)
+
+    def _compose_device_status(self) -> dict[str, Any]:
+        """Build the device-derived (non-alarm) part of status().
+
+        The result is cached until update() reports a changed section.
+        """
         name = (
             self._record.name
             if self._record
@@ -426,18 +558,6 @@ class EzvizCamera:
             "supported_channels": self.fetch_key(["deviceInfos", "channelNumber"]),
             "battery_level": self.fetch_key(["STATUS", "optionals", "powerRemaining"]),
             "PIR_Status": self.fetch_key(["STATUS", "pirStatus"]),
-            "Motion_Trigger": self._alarmmotiontrigger["alarm_trigger_active"],
-            "Seconds_Last_Trigger": self._alarmmotiontrigger["timepassed"],
-            # Keep last_alarm_time in sync with the time actually used to
-            # compute Motion_Trigger/Seconds_Last_Trigger.
-            "last_alarm_time": self._alarmmotiontrigger.get("last_alarm_time_str")
-            or self._last_alarm.get("alarmStartTimeStr"),
-            "last_alarm_pic": self._last_alarm.get(
-                "picUrl",
-                DEFAULT_ALARM_IMAGE_URL,
-            ),
-            "last_alarm_type_code": self._last_alarm.get("alarmType", "0000"),
-            "last_alarm_type_name": self._last_alarm.get("sampleName", "NoAlarm"),
             "cam_timezone": self.fetch_key(["STATUS", "optionals", "timeZone"]),
             "push_notify_alarm": not bool(self.fetch_key(["NODISTURB", "alarmEnable"])),
             "push_notify_call": not bool(
@@ -466,13 +586,14 @@ class EzvizCamera:
 
         # Include all top-level keys from the pagelist/device mapping to allow
         # consumers to access new fields without library updates. We do not
-        # overwrite curated keys above if there is a name collision.
-        source_map = dict(self._record.raw) if self._record else dict(self._device)
+        # overwrite curated keys above (or the alarm keys merged by status())
+        # if there is a name collision.
+        source_map = self._record.raw if self._record else self._device
         for key, value in source_map.items():
-            if key not in data:
+            if key not in data and key not in ALARM_STATUS_KEYS:
                 data[key] = value
 
-        return cast(CameraStatus, data)
+        return data
 
     # essential_status() was removed in favor of including all top-level
     # pagelist keys directly in status().
@@ -0,0 +1,171 @@
+"""Change sets between successive device refreshes.
+
+:class:`DeviceStateTracker` keeps the last device dicts (as returned by
+``get_device_infos``) together with a content hash per section. Each refresh
+yields a :class:`ChangeSet` listing added and removed devices and, for the
+sections whose hash moved, which fields changed with their old and new
+values. Sections with an unchanged hash are skipped without being compared,
+so consumers only pay for what actually changed.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+import hashlib
+import json
+from typing import Any
+
+
+def section_hash(value: Any) -> str:
+    """Return a stable content hash of a JSON-like section value."""
+    encoded = json.dumps(
+        value, sort_keys=True, separators=(",", ":"), default=str
+    ).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+@dataclass(frozen=True)
+class FieldChange:
+    """One changed field of a section.
+
+    ``field`` is the top-level key inside the section, or None when the
+    section is not a mapping (lists such as ``resourceInfos``) and was
+    replaced as a whole. Missing keys are reported as None.
+    """
+
+    field: str | None
+    old: Any
+    new: Any
+
+
+@dataclass(frozen=True)
+class SectionChange:
+    """A section whose content hash changed, with its field-level diff."""
+
+    section: str
+    old_hash: str | None
+    new_hash: str
+    fields: tuple[FieldChange, ...]
+
+
+@dataclass
+class ChangeSet:
+    """Differences between two refreshes of the device list.
+
+    Attributes:
+        added: Serials that appeared since the previous refresh.
+        removed: Serials that disappeared.
+        changed: ``{serial: {section: SectionChange}}`` for devices present
+            in both refreshes. Added devices are not repeated here.
+    """
+
+    added: tuple[str, ...] = ()
+    removed: tuple[str, ...] = ()
+    changed: dict[str, dict[str, SectionChange]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        """Return True when anything changed."""
+        return bool(self.added or self.removed or self.changed)
+
+    def touched(self) -> set[str]:
+        """Return the serials that were added or changed."""
+        return {*self.added, *self.changed}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable view of the change set."""
+        return {
+            "added": list(self.added),
+            "removed": list(self.removed),
+            "changed": {
+                serial: {
+                    name: [
+                        {"field": item.field, "old": item.old, "new": item.new}
+                        for item in change.fields
+                    ]
+                    for name, change in sections.items()
+                }
+                for serial, sections in self.changed.items()
+            },
+        }
+
+
+def _field_changes(old: Any, new: Any) -> tuple[FieldChange, ...]:
+    if not isinstance(old, Mapping) or not isinstance(new, Mapping):
+        return (FieldChange(None, old, new),)
+    return tuple(
+        FieldChange(key, old.get(key), new.get(key))
+        for key in {**old, **new}
+        if old.get(key) != new.get(key) or (key in old) != (key in new)
+    )
+
+
+class DeviceStateTracker:
+    """Previous per-device, per-section state and the hashes that guard it."""
+
+    def __init__(self) -> None:
+        """Start with no known devices; the first update reports all as added."""
+        self._state: dict[str, dict[str, Any]] = {}
+        self._hashes: dict[str, dict[str, str]] = {}
+
+    def __contains__(self, serial: object) -> bool:
+        """Return True when ``serial`` was present in the last update."""
+        return serial in self._state
+
+    def section_hash(self, serial: str, section: str) -> str | None:
+        """Return the last known hash of a section, usable as an ETag."""
+        return self._hashes.get(serial, {}).get(section)
+
+    def state(self, serial: str) -> dict[str, Any] | None:
+        """Return the last known device dict of ``serial``."""
+        return self._state.get(serial)
+
+    def reset(self) -> None:
+        """Forget everything; the next update reports all devices as added."""
+        self._state.clear()
+        self._hashes.clear()
+
+    def update(self, devices: Mapping[str, Mapping[str, Any]]) -> ChangeSet:
+        """Record a refresh and return what changed since the previous one.
+
+        A section that is the very same object as last time (as happens for
+        the sections a pagelist projection did not fetch) is skipped without
+        hashing.
+
+        Args:
+            devices: ``{serial: device dict}`` for the whole account.
+        """
+        changes = ChangeSet()
+        added: list[str] = []
+        for serial, device in devices.items():
+            old_hashes = self._hashes.get(serial)
+            if old_hashes is None:
+                added.append(serial)
+                self._state[serial] = dict(device)
+                self._hashes[serial] = {
+                    name: section_hash(value) for name, value in device.items()
+                }
+                continue
+
+            old_state = self._state[serial]
+            for name, value in device.items():
+                old_value = old_state.get(name)
+                if value is old_value:
+                    continue
+                new_hash = section_hash(value)
+                old_hash = old_hashes.get(name)
+                old_state[name] = value
+                if new_hash == old_hash:
+                    continue
+                changes.changed.setdefault(serial, {})[name] = SectionChange(
+                    name, old_hash, new_hash, _field_changes(old_value, value)
+                )
+                old_hashes[name] = new_hash
+
+        removed = [serial for serial in self._state if serial not in devices]
+        for serial in removed:
+            del self._state[serial]
+            del self._hashes[serial]
+        changes.added = tuple(added)
+        changes.removed = tuple(removed)
+        return changes
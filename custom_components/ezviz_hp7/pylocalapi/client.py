@@ -3,15 +3,28 @@
 from __future__ import annotations
 
 from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 import datetime as dt
+import functools
 import hashlib
 import json
 import logging
-from typing import Any, ClassVar, NotRequired, TypedDict, cast
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    NoReturn,
+    NotRequired,
+    TypedDict,
+    cast,
+)
 from urllib.parse import urlencode
 from uuid import uuid4
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from .api_endpoints import (
     API_ENDPOINT_2FA_VALIDATE_POST_AUTH,
@@ -107,9 +120,14 @@ from .api_endpoints import (
     API_ENDPOINT_V3_ALARMS,
     API_ENDPOINT_VIDEO_ENCRYPT,
 )
+from .auth import TokenManager
+from .bulk import DEFAULT_BULK_CONCURRENCY, BulkOperation, BulkReport, run_bulk
 from .camera import EzvizCamera
-from .cas import EzvizCAS
+from .changes import ChangeSet, DeviceStateTracker
+from .codec import loads as json_loads
 from .constants import (
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
     DEFAULT_TIMEOUT,
     DEFAULT_UNIFIEDMSG_STYPE,
     FEATURE_CODE,
@@ -129,14 +147,37 @@ from .exceptions import (
 )
 from .feature import optionals_mapping
 from .light_bulb import EzvizLightBulb
+from .message_stream import (
+    DEFAULT_STREAM_PAGE_SIZE,
+    DEFAULT_STREAM_PREFETCH,
+    MessageCursor,
+    MessageStream,
+    RangePager,
+)
+from .messages import FillChunk, MessageBatch, MessageSync
+from .metrics import RequestMetrics, endpoint_label
 from .models import EzvizDeviceRecord, build_device_records_map
-from .mqtt import MQTTClient
-from .utils import convert_to_dict, deep_merge
+from .pagelist import PagelistIndex, merge_projection, projection_sections
+from .retry import AUTH, READ, TRANSIENT_STATUSES, WRITE, RetryPolicy
+from .utils import merge_pages
+
+if TYPE_CHECKING:
+    from .mqtt import MQTTClient
 
 _LOGGER = logging.getLogger(__name__)
 
 UNIFIEDMSG_LOOKBACK_DAYS = 7
 MAX_UNIFIEDMSG_PAGES = 6
+UNIFIEDMSG_MAX_PARALLEL = 4
+PAGELIST_MAX_PARALLEL = 4
+PAGELIST_FULL_FILTER = (
+    "CLOUD, TIME_PLAN, CONNECTION, SWITCH,"
+    "STATUS, WIFI, NODISTURB, KMS,"
+    "P2P, TIME_PLAN, CHANNEL, VTM, DETECTOR,"
+    "FEATURE, CUSTOM_TAG, UPGRADE, VIDEO_QUALITY,"
+    "QOS, PRODUCTS_INFO, SIM_CARD, MULTI_UPGRADE_EXT,"
+    "FEATURE_INFO"
+)
 
 
 class ClientToken(TypedDict):
@@ -191,6 +232,9 @@ class SystemInfoResponse(TypedDict, total=False):
 class PagelistPageInfo(TypedDict, total=False):
     """Pagination info with 'hasNext' flag."""
 
+    offset: int
+    limit: int
+    totalResults: int
     hasNext: bool
 
 
@@ -207,8 +251,439 @@ class UserIdResponse(ApiOkResponse, total=False):
     deviceTokenInfo: Any
 
 
-class EzvizClient:
-    """Initialize api client object."""
+class EzvizClientBase:
+    """Transport-independent pieces shared by the sync and async clients.
+
+    Holds response validation and the request builders for the endpoints
+    implemented by both :class:`EzvizClient` (``requests``) and
+    :class:`~.async_client.AsyncEzvizClient` (``aiohttp``), so the two
+    transports cannot drift apart in what they send or accept.
+    """
+
+    account: str | None
+    password: str | None
+    metrics: RequestMetrics
+    device_state: DeviceStateTracker
+    retry_policy: RetryPolicy
+    tokens: TokenManager
+    _token: ClientToken
+    _pagelist_index: PagelistIndex | None = None
+
+    @staticmethod
+    def _normalize_json_payload(payload: Any) -> Any:
+        """Return a payload suitable for json= usage, decoding strings when needed."""
+
+        if isinstance(payload, (Mapping, list)):
+            return payload
+        if isinstance(payload, tuple):
+            return list(payload)
+        if isinstance(payload, (bytes, bytearray)):
+            try:
+                return json_loads(payload)
+            except ValueError as err:
+                raise PyEzvizError("Invalid JSON payload provided") from err
+        if isinstance(payload, str):
+            try:
+                return json_loads(payload)
+            except ValueError as err:
+                raise PyEzvizError("Invalid JSON payload provided") from err
+        raise PyEzvizError("Unsupported payload type for JSON body")
+
+    @staticmethod
+    def _is_ok(payload: dict) -> bool:
+        """Return True if payload indicates success for both API styles."""
+        meta = payload.get("meta")
+        if isinstance(meta, dict) and meta.get("code") == 200:
+            return True
+        rc = payload.get("resultCode")
+        return rc in (0, "0")
+
+    @staticmethod
+    def _meta_code(payload: dict) -> int | None:
+        """Safely extract meta.code as an int, or None if missing/invalid."""
+        code = (payload.get("meta") or {}).get("code")
+        if isinstance(code, (int, str)):
+            try:
+                return int(code)
+            except (TypeError, ValueError):
+                return None
+        return None
+
+    @staticmethod
+    def _meta_ok(payload: dict) -> bool:
+        """Return True if meta.code equals 200."""
+        return EzvizClientBase._meta_code(payload) == 200
+
+    @staticmethod
+    def _response_code(payload: dict) -> int | str | None:
+        """Return a best-effort code from a response for logging.
+
+        Prefers modern ``meta.code`` if present; falls back to legacy
+        ``resultCode`` or a top-level ``status`` field when available.
+        Returns None if no code-like field is found.
+        """
+        # Prefer modern meta.code
+        mc = EzvizClientBase._meta_code(payload)
+        if mc is not None:
+            return mc
+        if "resultCode" in payload:
+            return payload.get("resultCode")
+        if "status" in payload:
+            return payload.get("status")
+        return None
+
+    @staticmethod
+    def _summarize_payload(payload: Any) -> str:
+        """Return a compact description of payload content for debug logs."""
+
+        if payload is None:
+            return "-"
+        if isinstance(payload, Mapping):
+            keys = ", ".join(sorted(str(key) for key in payload))
+            return f"dict[{keys}]"
+        if isinstance(payload, (list, tuple, set)):
+            return f"{type(payload).__name__}(len={len(payload)})"
+        if isinstance(payload, (bytes, bytearray)):
+            return f"bytes(len={len(payload)})"
+        if isinstance(payload, str):
+            trimmed = payload[:32] + "…" if len(payload) > 32 else payload
+            return f"str(len={len(payload)}, preview={trimmed!r})"
+        return f"{type(payload).__name__}"
+
+    def _ensure_ok(self, payload: dict, message: str) -> None:
+        """Raise PyEzvizError with context if response is not OK.
+
+        Accepts both API styles: new (meta.code == 200) and legacy (resultCode == 0).
+        """
+        if not self._is_ok(payload):
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "API error detected (%s): code=%s payload=%s",
+                    message,
+                    self._response_code(payload),
+                    json.dumps(payload, ensure_ascii=False),
+                )
+            raise PyEzvizError(f"{message}: Got {payload})")
+
+    def _url(self, path: str) -> str:
+        """Build a full API URL for the given path."""
+        return f"https://{self._token['api_url']}{path}"
+
+    def _log_retry(self, payload: dict, log: str, serial: str | None) -> None:
+        """Log a concise warning before retrying a JSON call."""
+        self.metrics.record_retry(log)
+        # Prefer modern meta.code; fall back to legacy resultCode
+        _LOGGER.warning(
+            "Http_retry: serial=%s code=%s msg=%s",
+            serial or "unknown",
+            self._response_code(payload),
+            log,
+        )
+
+    def _retry_delay(self, kind: str, attempt: int, reason: str) -> float | None:
+        """Return the backoff before retry ``attempt``, or None when out of budget."""
+        delay = self.retry_policy.next_delay(kind, attempt)
+        if delay is None:
+            _LOGGER.warning("Retry budget exhausted, not retrying: %s", reason)
+        return delay
+
+    def _relogin_delay(self, relogins: int) -> float | None:
+        """Return the wait before re-login number ``relogins`` after a 401.
+
+        The first re-login is immediate (sessions do expire); further ones back
+        off as ``auth`` retries. None means give up.
+        """
+        if relogins >= MAX_RETRIES:
+            return None
+        if relogins == 0:
+            return 0.0
+        return self._retry_delay(AUTH, relogins - 1, "http_401")
+
+    def _transport_retry_delay(
+        self, method: str, url: str, attempt: int, reason: str
+    ) -> float | None:
+        """Return the wait before retrying a transport failure, or None to raise."""
+        kind = self.retry_policy.endpoint_class(method, url)
+        if attempt >= self.retry_policy.transport_retries(kind):
+            return None
+        delay = self._retry_delay(kind, attempt, reason)
+        if delay is not None:
+            self.metrics.record_retry(reason)
+            _LOGGER.warning(
+                "Http_retry: %s reason=%s attempt=%s delay=%.1fs",
+                endpoint_label(method, url),
+                reason,
+                attempt + 1,
+                delay,
+            )
+        return delay
+
+    # ---- Shared request builders -------------------------------------------------
+
+    def _expand_region_url(self) -> None:
+        """Turn a bare region code (e.g. ``ieu``) into the API hostname."""
+        if len(self._token["api_url"].split(".")) == 1:
+            self._token["api_url"] = "apii" + self._token["api_url"] + ".ezvizlife.com"
+
+    def _login_payload(self, smscode: int | None = None) -> dict[str, Any]:
+        """Return the form body for the account/password login call."""
+        return {
+            "account": self.account,
+            "password": self.password,
+            "featureCode": FEATURE_CODE,
+            "msgType": "3" if smscode else "0",
+            "bizType": "TERMINAL_BIND" if smscode else "",
+            "cuName": "SGFzc2lv",  # hassio base64 encoded
+            "smsCode": smscode,
+        }
+
+    @staticmethod
+    def _token_from_login(json_result: dict) -> ClientToken:
+        """Build a fresh token from a successful login response."""
+        return {
+            "session_id": str(json_result["loginSession"]["sessionId"]),
+            "rf_session_id": str(json_result["loginSession"]["rfSessionId"]),
+            "username": str(json_result["loginUser"]["username"]),
+            "api_url": str(json_result["loginArea"]["apiDomain"]),
+        }
+
+    def _refresh_payload(self) -> dict[str, Any]:
+        """Return the form body for the session refresh call."""
+        return {
+            "refreshSessionId": self._token["rf_session_id"],
+            "featureCode": FEATURE_CODE,
+        }
+
+    @staticmethod
+    def _raise_login_error(json_result: dict) -> NoReturn:
+        """Raise the exception matching a failed login response."""
+        code = json_result["meta"]["code"]
+        if code == 1012:
+            raise PyEzvizError("The MFA code is invalid, please try again.")
+        if code == 1013:
+            raise PyEzvizError("Incorrect Username.")
+        if code == 1014:
+            raise PyEzvizError("Incorrect Password.")
+        if code == 1015:
+            raise PyEzvizError("The user is locked.")
+        if code == 6002:
+            raise EzvizAuthVerificationCode(
+                "MFA enabled on account. Please retry with code."
+            )
+        raise PyEzvizError(f"Login error: {json_result['meta']}")
+
+    @staticmethod
+    def _service_urls_from(json_output: dict) -> Any:
+        """Extract service URLs from a server info response."""
+        if not EzvizClientBase._meta_ok(json_output):
+            raise PyEzvizError(f"Error getting Service URLs: {json_output}")
+        service_urls = json_output.get("systemConfigInfo", {})
+        service_urls["sysConf"] = str(service_urls.get("sysConf", "")).split("|")
+        return service_urls
+
+    @staticmethod
+    def _pagelist_params(
+        page_filter: str, group_id: int, limit: int, offset: int
+    ) -> dict[str, int | str]:
+        """Return query parameters for one pagelist page."""
+        return {
+            "groupId": group_id,
+            "limit": limit,
+            "offset": offset,
+            "filter": page_filter,
+        }
+
+    @staticmethod
+    def _pagelist_has_next(page: dict) -> bool:
+        """Return True if a pagelist response says more pages follow."""
+        return bool((page.get("page") or {}).get("hasNext", False))
+
+    @staticmethod
+    def _pagelist_remaining_offsets(first: dict, limit: int, offset: int) -> list[int]:
+        """Return the offsets still to fetch after the first pagelist page.
+
+        Empty when there is no next page or the response has no usable
+        ``totalResults``; callers then page sequentially on ``hasNext``.
+        """
+        if not EzvizClientBase._pagelist_has_next(first):
+            return []
+        total = (first.get("page") or {}).get("totalResults")
+        try:
+            total = int(total)
+        except (TypeError, ValueError):
+            return []
+        return list(range(offset + limit, total, limit))
+
+    @staticmethod
+    def _unifiedmsg_params(
+        serials: str | None,
+        s_type: str | int | Iterable[str | int] | None,
+        *,
+        limit: int,
+        date: str | dt.date | dt.datetime | None,
+        end_time: str | int | None,
+    ) -> dict[str, Any]:
+        """Return query parameters for the unified message list call."""
+
+        def _stringify(value: Any) -> str:
+            raw = getattr(value, "value", value)
+            return str(raw)
+
+        stype_param: str | None
+        if s_type is None:
+            stype_param = DEFAULT_UNIFIEDMSG_STYPE
+        elif isinstance(s_type, str):
+            stype_param = s_type
+        elif isinstance(s_type, Iterable) and not isinstance(
+            s_type, (bytes, bytearray)
+        ):
+            parts = [_stringify(item) for item in s_type if item not in (None, "")]
+            stype_param = ",".join(parts) if parts else DEFAULT_UNIFIEDMSG_STYPE
+        else:
+            stype_param = _stringify(s_type)
+
+        if date is None:
+            date_value = dt.datetime.now().strftime("%Y%m%d")
+        elif isinstance(date, (dt.date, dt.datetime)):
+            date_value = date.strftime("%Y%m%d")
+        else:
+            date_value = str(date)
+
+        try:
+            limit_value = max(1, min(int(limit), 50))
+        except (TypeError, ValueError):
+            limit_value = 20
+
+        end_time_value: str = "" if end_time is None else str(end_time)
+
+        params: dict[str, Any] = {
+            "serials": serials,
+            "stype": stype_param,
+            "limit": limit_value,
+            "date": date_value,
+            "endTime": end_time_value,
+        }
+        filtered_params = {k: v for k, v in params.items() if v not in (None, "")}
+        # keep empty string endTime to mimic app behavior
+        if end_time_value == "":
+            filtered_params["endTime"] = ""
+        return filtered_params
+
+    def _index_pagelist(self, pagelist: Any) -> PagelistIndex:
+        """Return the index of ``pagelist``, reusing it for the same payload."""
+        index = self._pagelist_index
+        if index is None or index.pagelist is not pagelist:
+            index = self._pagelist_index = PagelistIndex(pagelist)
+        return index
+
+    def _merge_projection(
+        self, partial: Any, sections: tuple[str, ...]
+    ) -> PagelistIndex | None:
+        """Splice a projection into the cached full pagelist and index the result.
+
+        Returns None when there is no cached pagelist yet or the device list
+        changed, in which case the caller falls back to a full fetch.
+        """
+        cached = self._pagelist_index
+        if cached is None:
+            return None
+        merged = merge_projection(cached.pagelist, partial, sections)
+        if merged is None:
+            return None
+        return self._index_pagelist(merged)
+
+    @staticmethod
+    def _device_infos_from_index(
+        index: PagelistIndex, serial: str | None = None
+    ) -> dict[Any, Any]:
+        """Return all device dicts, or the one of ``serial`` ({} if unknown)."""
+        if not serial:
+            return index.devices()
+        return index.device(serial) or {}
+
+    def _device_infos_from_pagelist(
+        self, devices: Any, serial: str | None = None
+    ) -> dict[Any, Any]:
+        """Split a full pagelist payload into per-serial device dicts."""
+        return self._device_infos_from_index(self._index_pagelist(devices), serial)
+
+    def _cam_key_form(self, serial: str, smscode: int | None) -> dict[str, Any]:
+        """Return the form body for the camera encryption key call."""
+        return {
+            "checkcode": smscode,
+            "serial": serial,
+            "clientNo": "web_site",
+            "clientType": 3,
+            "netType": "WIFI",
+            "featureCode": FEATURE_CODE,
+            "sessionId": self._token["session_id"],
+        }
+
+    @staticmethod
+    def _cam_key_from(json_output: dict, serial: str, can_retry: bool) -> Any:
+        """Return the encryption key from a cam key response.
+
+        Returns None when the backend reported a transient miss and the caller
+        may retry.
+        """
+        code = str(json_output.get("resultCode"))
+        if code == "20002":
+            raise EzvizAuthVerificationCode(f"MFA code required: Got {json_output})")
+        if code == "2009":
+            raise DeviceException(f"Device not reachable: Got {json_output})")
+        if code == "0":
+            return json_output.get("encryptkey")
+        if code == "-1" and can_retry:
+            _LOGGER.warning(
+                "Http_retry: serial=%s code=%s msg=%s",
+                serial,
+                code,
+                "cam_key_not_found",
+            )
+            return None
+        raise PyEzvizError(f"Could not get camera encryption key: Got {json_output})")
+
+    @staticmethod
+    def _lock_request(
+        endpoint: str,
+        serial: str,
+        user_id: str,
+        lock_no: int,
+        *,
+        resource_id: str | None = None,
+        local_index: str | int | None = None,
+        stream_token: str | None = None,
+        lock_type: str | None = None,
+    ) -> tuple[str, dict[str, Any]]:
+        """Return ``(path, json_body)`` for a remote lock/unlock command."""
+        route_resource = resource_id or "Video"
+        route_index = str(local_index if local_index is not None else 1)
+        un_lock_info: dict[str, Any] = {
+            "bindCode": f"{FEATURE_CODE}{user_id}",
+            "lockNo": lock_no,
+            "streamToken": stream_token or "",
+            "userName": user_id,
+        }
+        if lock_type:
+            un_lock_info["type"] = lock_type
+        path = f"{API_ENDPOINT_IOT_ACTION}{serial}/{route_resource}/{route_index}{endpoint}"
+        return path, {"unLockInfo": un_lock_info}
+
+
+class EzvizClient(EzvizClientBase):
+    """Initialize api client object.
+
+    Thread safety: one client may be shared by several threads (e.g. Home
+    Assistant executor jobs running a refresh while a button unlocks a door).
+    Token and session header updates, the device maps and the change tracker
+    are guarded by an internal lock, re-logins are single-flight and
+    ``load_devices`` runs one refresh at a time. All threads share one
+    ``requests`` session whose keep-alive pools hold ``pool_connections``
+    hosts (api, push and image hosts stay warm) with up to ``pool_maxsize``
+    connections each, so concurrent requests reuse TLS connections instead
+    of re-handshaking. Size ``pool_maxsize`` to the number of threads that
+    may call the client at once.
+    """
 
     # Supported categories for load_devices gating
     SUPPORTED_CATEGORIES: ClassVar[list[str]] = [
@@ -229,20 +704,40 @@ class EzvizClient:
         url: str = "apiieu.ezvizlife.com",
         timeout: int = DEFAULT_TIMEOUT,
         token: dict | None = None,
+        retry_policy: RetryPolicy | None = None,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        bulk_concurrency: int = DEFAULT_BULK_CONCURRENCY,
+        unifiedmsg_parallel: int = UNIFIEDMSG_MAX_PARALLEL,
     ) -> None:
-        """Initialize the client object."""
+        """Initialize the client object.
+
+        ``retry_policy`` controls backoff, the retry budget and the circuit
+        breaker for every request; a default policy is used when omitted.
+        ``pool_connections`` and ``pool_maxsize`` size the keep-alive pools
+        (hosts kept, connections per host). ``bulk_concurrency`` caps the
+        requests all :meth:`run_bulk` calls of this account run at once.
+        ``unifiedmsg_parallel`` caps the per-device alarm queries
+        :meth:`sync_messages` runs at once.
+        """
         self.account = account
         self.password = (
             hashlib.md5(password.encode("utf-8")).hexdigest() if password else None
         )  # Ezviz API sends md5 of password
-        self._session = requests.session()
-        self._session.headers.update(REQUEST_HEADER)
+        # Guards _token, session headers and the device maps across threads
+        self._state_lock = threading.RLock()
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._session = self._new_session()
         if token and token.get("session_id"):
             self._session.headers["sessionId"] = str(token["session_id"])  # ensure str
+        # Own copy: the caller's dict (e.g. a stored config) must not change
+        # under it when the session is refreshed
         self._token: ClientToken = cast(
             ClientToken,
-            token
-            or {
+            dict(token)
+            if token
+            else {
                 "session_id": None,
                 "rf_session_id": None,
                 "username": None,
@@ -251,44 +746,95 @@ class EzvizClient:
         )
         self._timeout = timeout
         self._cameras: dict[str, Any] = {}
+        self._camera_objects: dict[str, EzvizCamera] = {}
         self._light_bulbs: dict[str, Any] = {}
         self.mqtt_client: MQTTClient | None = None
         self._debug_request_counters: dict[str, int] = {}
+        self.metrics = RequestMetrics()
+        self.device_state = DeviceStateTracker()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.tokens = TokenManager()
+        # Concurrent 401s (pagelist pages, executor threads) share one re-login
+        self._login_lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self._bulk_concurrency = bulk_concurrency
+        self._bulk_limiter = threading.BoundedSemaphore(bulk_concurrency)
+        self.message_sync = MessageSync(max_pages=MAX_UNIFIEDMSG_PAGES)
+        self._message_lock = threading.Lock()
+        self._unifiedmsg_parallel = max(1, unifiedmsg_parallel)
+
+    def _new_session(self) -> requests.Session:
+        """Return a session with the default headers and sized keep-alive pools."""
+        session = requests.session()
+        adapter = HTTPAdapter(
+            pool_connections=self._pool_connections,
+            pool_maxsize=self._pool_maxsize,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(REQUEST_HEADER)
+        return session
+
+    def _session_headers(self, **extra: str) -> dict[str, Any]:
+        """Return a snapshot of the session headers plus ``extra``."""
+        with self._state_lock:
+            headers = dict(self._session.headers)
+        headers.update(extra)
+        return headers
+
+    def _set_session_id(self, session_id: Any) -> None:
+        """Switch the session header to ``session_id``."""
+        with self._state_lock:
+            self._session.headers["sessionId"] = str(session_id)
+
+    def _relogin(self, stale_session_id: str | None, reason: str) -> None:
+        """Refresh the session once for all callers that saw ``stale_session_id``."""
+        with self._login_lock:
+            if self._token.get("session_id") != stale_session_id:
+                # Another thread already renewed the session
+                return
+            self.metrics.record_relogin(reason)
+            self.login()
+
+    def _ensure_fresh_session(self) -> None:
+        """Refresh the session shortly before it expires, once per session.
+
+        A failed proactive refresh is only logged: the request goes out with
+        the current session and the usual 401 handling applies.
+        """
+        if not self.tokens.needs_refresh(self._token):
+            return
+        self.tokens.mark_attempted(self._token)
+        try:
+            self._relogin(self._token.get("session_id"), "proactive")
+        except PyEzvizError as err:
+            _LOGGER.debug("Proactive session refresh failed: %s", err)
 
     def _login(self, smscode: int | None = None) -> dict[Any, Any]:
         """Login to Ezviz API."""
-        # Region code to url.
-        if len(self._token["api_url"].split(".")) == 1:
-            self._token["api_url"] = "apii" + self._token["api_url"] + ".ezvizlife.com"
-
-        payload = {
-            "account": self.account,
-            "password": self.password,
-            "featureCode": FEATURE_CODE,
-            "msgType": "3" if smscode else "0",
-            "bizType": "TERMINAL_BIND" if smscode else "",
-            "cuName": "SGFzc2lv",  # hassio base64 encoded
-            "smsCode": smscode,
-        }
+        self._expand_region_url()
 
+        self.retry_policy.before_request()
         try:
             req = self._session.post(
                 url=f"https://{self._token['api_url']}{API_ENDPOINT_LOGIN}",
                 allow_redirects=False,
-                data=payload,
+                data=self._login_payload(smscode),
                 timeout=self._timeout,
             )
+            self.retry_policy.record_outcome(req.status_code)
 
             req.raise_for_status()
 
         except requests.ConnectionError as err:
+            self.retry_policy.record_outcome(None)
             raise InvalidURL("A Invalid URL or Proxy error occurred") from err
 
         except requests.HTTPError as err:
             raise HTTPError from err
 
         try:
-            json_result = req.json()
+            json_result = json_loads(req.content)
 
         except ValueError as err:
             raise PyEzvizError(
@@ -299,22 +845,20 @@ class EzvizClient:
             ) from err
 
         if json_result["meta"]["code"] == 200:
-            self._session.headers["sessionId"] = json_result["loginSession"][
-                "sessionId"
-            ]
-            self._token = {
-                "session_id": str(json_result["loginSession"]["sessionId"]),
-                "rf_session_id": str(json_result["loginSession"]["rfSessionId"]),
-                "username": str(json_result["loginUser"]["username"]),
-                "api_url": str(json_result["loginArea"]["apiDomain"]),
-            }
+            with self._state_lock:
+                self._set_session_id(json_result["loginSession"]["sessionId"])
+                self._token = self._token_from_login(json_result)
 
-            self._token["service_urls"] = self.get_service_urls()
+            service_urls = self.get_service_urls()
+            with self._state_lock:
+                self._token["service_urls"] = service_urls
+            self.tokens.publish(self._token)
 
-            return cast(dict[Any, Any], self._token)
+            return dict(self._token)
 
         if json_result["meta"]["code"] == 1100:
-            self._token["api_url"] = json_result["loginArea"]["apiDomain"]
+            with self._state_lock:
+                self._token["api_url"] = json_result["loginArea"]["apiDomain"]
             _LOGGER.warning(
                 "Region_incorrect: serial=%s code=%s msg=%s",
                 "unknown",
@@ -323,25 +867,10 @@ class EzvizClient:
             )
             return self.login()
 
-        if json_result["meta"]["code"] == 1012:
-            raise PyEzvizError("The MFA code is invalid, please try again.")
-
-        if json_result["meta"]["code"] == 1013:
-            raise PyEzvizError("Incorrect Username.")
-
-        if json_result["meta"]["code"] == 1014:
-            raise PyEzvizError("Incorrect Password.")
-
-        if json_result["meta"]["code"] == 1015:
-            raise PyEzvizError("The user is locked.")
-
         if json_result["meta"]["code"] == 6002:
             self.send_mfa_code()
-            raise EzvizAuthVerificationCode(
-                "MFA enabled on account. Please retry with code."
-            )
 
-        raise PyEzvizError(f"Login error: {json_result['meta']}")
+        self._raise_login_error(json_result)
 
     # ---- Internal HTTP helpers -------------------------------------------------
 
@@ -359,8 +888,13 @@ class EzvizClient:
         """Perform an HTTP request with optional 401 retry via re-login.
 
         Centralizes the common 401→login→retry pattern without altering
-        individual endpoint behavior. Returns the Response for the caller to
-        parse and validate according to its API contract.
+        individual endpoint behavior. Connection errors and transient
+        statuses are retried as allowed by :attr:`retry_policy`. Returns the
+        Response for the caller to parse and validate according to its API
+        contract.
+
+        Raises:
+            EzvizCircuitOpen: Without sending anything while the circuit is open.
         """
         if _LOGGER.isEnabledFor(logging.DEBUG):
             _LOGGER.debug(
@@ -371,37 +905,58 @@ class EzvizClient:
                 self._summarize_payload(data),
                 self._summarize_payload(json_body),
             )
-        try:
-            req = self._session.request(
-                method=method,
-                url=url,
-                params=params,
-                data=data,
-                json=json_body,
-                timeout=self._timeout,
-            )
-            req.raise_for_status()
-        except requests.HTTPError as err:
-            if (
-                retry_401
-                and err.response is not None
-                and err.response.status_code == 401
-            ):
-                if max_retries >= MAX_RETRIES:
-                    raise HTTPError from err
-                # Re-login and retry once
-                self.login()
-                return self._http_request(
-                    method,
-                    url,
+        self._ensure_fresh_session()
+        attempt = 0
+        while True:
+            self.retry_policy.before_request()
+            session_id = self._token.get("session_id")
+            started = time.perf_counter()
+            try:
+                req = self._session.request(
+                    method=method,
+                    url=url,
                     params=params,
                     data=data,
-                    json_body=json_body,
-                    retry_401=retry_401,
-                    max_retries=max_retries + 1,
+                    json=json_body,
+                    timeout=self._timeout,
                 )
-            raise HTTPError from err
-        else:
+                req.raise_for_status()
+            except requests.HTTPError as err:
+                self._record_response(method, url, started, err.response, error=True)
+                status = err.response.status_code if err.response is not None else None
+                if retry_401 and status == 401:
+                    delay = self._relogin_delay(max_retries)
+                    if delay is None:
+                        raise HTTPError from err
+                    # Re-login (once for all callers that saw this session) and retry
+                    time.sleep(delay)
+                    self._relogin(session_id, "http_401")
+                    return self._http_request(
+                        method,
+                        url,
+                        params=params,
+                        data=data,
+                        json_body=json_body,
+                        retry_401=retry_401,
+                        max_retries=max_retries + 1,
+                    )
+                if status in TRANSIENT_STATUSES:
+                    delay = self._transport_retry_delay(method, url, attempt, f"http_{status}")
+                    if delay is not None:
+                        time.sleep(delay)
+                        attempt += 1
+                        continue
+                raise HTTPError from err
+            except requests.RequestException as err:
+                self._record_response(method, url, started, None, error=True)
+                delay = self._transport_retry_delay(method, url, attempt, type(err).__name__)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            self._record_response(method, url, started, req)
             if _LOGGER.isEnabledFor(logging.DEBUG):
                 content_length = req.headers.get("Content-Length")
                 if content_length is None:
@@ -413,116 +968,40 @@ class EzvizClient:
                     req.status_code,
                     content_length,
                 )
-            return req
-
-    @staticmethod
-    def _parse_json(resp: requests.Response) -> dict:
-        """Parse JSON or raise a friendly error."""
-        try:
-            return cast(dict, resp.json())
-        except ValueError as err:
-            raise PyEzvizError(
-                "Impossible to decode response: "
-                + str(err)
-                + "\nResponse was: "
-                + str(resp.text)
-            ) from err
-
-    @staticmethod
-    def _normalize_json_payload(payload: Any) -> Any:
-        """Return a payload suitable for json= usage, decoding strings when needed."""
-
-        if isinstance(payload, (Mapping, list)):
-            return payload
-        if isinstance(payload, tuple):
-            return list(payload)
-        if isinstance(payload, (bytes, bytearray)):
-            try:
-                return json.loads(payload.decode())
-            except (UnicodeDecodeError, json.JSONDecodeError) as err:
-                raise PyEzvizError("Invalid JSON payload provided") from err
-        if isinstance(payload, str):
-            try:
-                return json.loads(payload)
-            except json.JSONDecodeError as err:
-                raise PyEzvizError("Invalid JSON payload provided") from err
-        raise PyEzvizError("Unsupported payload type for JSON body")
-
-    @staticmethod
-    def _is_ok(payload: dict) -> bool:
-        """Return True if payload indicates success for both API styles."""
-        meta = payload.get("meta")
-        if isinstance(meta, dict) and meta.get("code") == 200:
-            return True
-        rc = payload.get("resultCode")
-        return rc in (0, "0")
-
-    @staticmethod
-    def _meta_code(payload: dict) -> int | None:
-        """Safely extract meta.code as an int, or None if missing/invalid."""
-        code = (payload.get("meta") or {}).get("code")
-        if isinstance(code, (int, str)):
-            try:
-                return int(code)
-            except (TypeError, ValueError):
-                return None
-        return None
-
-    @staticmethod
-    def _meta_ok(payload: dict) -> bool:
-        """Return True if meta.code equals 200."""
-        return EzvizClient._meta_code(payload) == 200
-
-    @staticmethod
-    def _response_code(payload: dict) -> int | str | None:
-        """Return a best-effort code from a response for logging.
-
-        Prefers modern ``meta.code`` if present; falls back to legacy
-        ``resultCode`` or a top-level ``status`` field when available.
-        Returns None if no code-like field is found.
-        """
-        # Prefer modern meta.code
-        mc = EzvizClient._meta_code(payload)
-        if mc is not None:
-            return mc
-        if "resultCode" in payload:
-            return payload.get("resultCode")
-        if "status" in payload:
-            return payload.get("status")
-        return None
-
-    @staticmethod
-    def _summarize_payload(payload: Any) -> str:
-        """Return a compact description of payload content for debug logs."""
-
-        if payload is None:
-            return "-"
-        if isinstance(payload, Mapping):
-            keys = ", ".join(sorted(str(key) for key in payload))
-            return f"dict[{keys}]"
-        if isinstance(payload, (list, tuple, set)):
-            return f"{type(payload).__name__}(len={len(payload)})"
-        if isinstance(payload, (bytes, bytearray)):
-            return f"bytes(len={len(payload)})"
-        if isinstance(payload, str):
-            trimmed = payload[:32] + "…" if len(payload) > 32 else payload
-            return f"str(len={len(payload)}, preview={trimmed!r})"
-        return f"{type(payload).__name__}"
-
-    def _ensure_ok(self, payload: dict, message: str) -> None:
-        """Raise PyEzvizError with context if response is not OK.
-
-        Accepts both API styles: new (meta.code == 200) and legacy (resultCode == 0).
-        """
-        if not self._is_ok(payload):
-            if _LOGGER.isEnabledFor(logging.DEBUG):
-                _LOGGER.debug(
-                    "API error detected (%s): code=%s payload=%s",
-                    message,
-                    self._response_code(payload),
-                    json.dumps(payload, ensure_ascii=False),
-                )
-            raise PyEzvizError(f"{message}: Got {payload})")
+            return req
+
+    def _record_response(
+        self,
+        method: str,
+        url: str,
+        started: float,
+        resp: requests.Response | None,
+        *,
+        error: bool = False,
+    ) -> None:
+        """Feed one finished HTTP attempt into :attr:`metrics` and the breaker."""
+        self.retry_policy.record_outcome(resp.status_code if resp is not None else None)
+        self.metrics.record_request(
+            method,
+            url,
+            status=resp.status_code if resp is not None else None,
+            elapsed=time.perf_counter() - started,
+            size=len(resp.content) if resp is not None else None,
+            error=error,
+        )
+
+    @staticmethod
+    def _parse_json(resp: requests.Response) -> dict:
+        """Parse JSON or raise a friendly error."""
+        try:
+            return cast(dict, json_loads(resp.content))
+        except ValueError as err:
+            raise PyEzvizError(
+                "Impossible to decode response: "
+                + str(err)
+                + "\nResponse was: "
+                + str(resp.text)
+            ) from err
 
     def _send_prepared(
         self,
@@ -535,30 +1014,43 @@ class EzvizClient:
 
         Useful for endpoints requiring special URL encoding or manual preparation.
         """
+        method = prepared.method or "GET"
+        url = prepared.url or ""
+        self._ensure_fresh_session()
+        self.retry_policy.before_request()
+        with self._state_lock:
+            session_id = self._token.get("session_id")
+            # The request may have been prepared before a re-login
+            if "sessionId" in prepared.headers:
+                prepared.headers["sessionId"] = self._session.headers["sessionId"]
+        started = time.perf_counter()
         try:
             req = self._session.send(request=prepared, timeout=self._timeout)
             req.raise_for_status()
         except requests.HTTPError as err:
+            self._record_response(method, url, started, err.response, error=True)
             if (
                 retry_401
                 and err.response is not None
                 and err.response.status_code == 401
             ):
-                if max_retries >= MAX_RETRIES:
+                delay = self._relogin_delay(max_retries)
+                if delay is None:
                     raise HTTPError from err
-                self.login()
+                time.sleep(delay)
+                self._relogin(session_id, "http_401")
                 return self._send_prepared(
                     prepared, retry_401=retry_401, max_retries=max_retries + 1
                 )
             raise HTTPError from err
+        except requests.RequestException:
+            self._record_response(method, url, started, None, error=True)
+            raise
+        self._record_response(method, url, started, req)
         return req
 
     # ---- Small helpers --------------------------------------------------------------
 
-    def _url(self, path: str) -> str:
-        """Build a full API URL for the given path."""
-        return f"https://{self._token['api_url']}{path}"
-
     def _request_json(
         self,
         method: str,
@@ -605,8 +1097,10 @@ class EzvizClient:
 
         Calls ``producer`` up to ``attempts + 1`` times. After each call, the
         result is passed to ``should_retry``; if it returns True and attempts
-        remain, a retry is performed and a concise warning is logged. If it
-        returns False, the payload is returned to the caller.
+        remain, a retry is performed after the :attr:`retry_policy` backoff
+        and a concise warning is logged. If it returns False, the payload is
+        returned to the caller. Retries stop early when the retry budget is
+        exhausted.
 
         Raises:
             PyEzvizError: If retries are exhausted without a successful payload.
@@ -617,14 +1111,11 @@ class EzvizClient:
             if not should_retry(payload):
                 return payload
             if attempt < total:
-                # Prefer modern meta.code; fall back to legacy resultCode
-                code = self._response_code(payload)
-                _LOGGER.warning(
-                    "Http_retry: serial=%s code=%s msg=%s",
-                    serial or "unknown",
-                    code,
-                    log,
-                )
+                delay = self._retry_delay(READ, attempt, log)
+                if delay is None:
+                    break
+                self._log_retry(payload, log, serial)
+                time.sleep(delay)
         raise PyEzvizError(f"{log}: exceeded retries")
 
     def send_mfa_code(self) -> bool:
@@ -650,12 +1141,7 @@ class EzvizClient:
             json_output = self._request_json("GET", API_ENDPOINT_SERVER_INFO)
         except requests.ConnectionError as err:  # pragma: no cover - keep behavior
             raise InvalidURL("A Invalid URL or Proxy error occurred") from err
-        if not self._meta_ok(json_output):
-            raise PyEzvizError(f"Error getting Service URLs: {json_output}")
-
-        service_urls = json_output.get("systemConfigInfo", {})
-        service_urls["sysConf"] = str(service_urls.get("sysConf", "")).split("|")
-        return service_urls
+        return self._service_urls_from(json_output)
 
     def lbs_domain(self, max_retries: int = 0) -> dict:
         """Retrieve the LBS sub-domain information."""
@@ -678,55 +1164,71 @@ class EzvizClient:
         offset: int = 0,
         max_retries: int = 0,
     ) -> Any:
-        """Get data from pagelist API."""
-        if max_retries > MAX_RETRIES:
-            raise PyEzvizError("Can't gather proper data. Max retries exceeded.")
+        """Get data from pagelist API.
 
+        The first page tells how many results exist; the remaining offsets are
+        then fetched concurrently (up to ``PAGELIST_MAX_PARALLEL``) and all
+        pages are merged once with :func:`~.utils.merge_pages`.
+        """
         if page_filter is None:
             raise PyEzvizError("Trying to call get_pagelist without filter")
 
-        params: dict[str, int | str] = {
-            "groupId": group_id,
-            "limit": limit,
-            "offset": offset,
-            "filter": page_filter,
-        }
-
-        json_output = self._request_json(
-            "GET",
-            API_ENDPOINT_PAGELIST,
-            params=params,
-            retry_401=True,
-            max_retries=max_retries,
-        )
-        if self._meta_code(json_output) != 200:
-            # session is wrong, need to relogin and retry
-            self.login()
-            _LOGGER.warning(
-                "Http_retry: serial=%s code=%s msg=%s",
-                "unknown",
-                self._meta_code(json_output),
-                "pagelist_relogin",
-            )
-            return self._api_get_pagelist(
-                page_filter, json_key, group_id, limit, offset, max_retries + 1
+        def _fetch(page_offset: int) -> dict:
+            return self._get_pagelist_page(
+                page_filter, group_id, limit, page_offset, max_retries
             )
 
-        page_info = json_output.get("page") or {}
-        next_page = bool(page_info.get("hasNext", False))
-
-        data = json_output[json_key] if json_key else json_output
+        pages = [_fetch(offset)]
+        offsets = self._pagelist_remaining_offsets(pages[0], limit, offset)
+        if len(offsets) == 1:
+            pages.append(_fetch(offsets[0]))
+        elif offsets:
+            with ThreadPoolExecutor(
+                max_workers=min(len(offsets), PAGELIST_MAX_PARALLEL),
+                thread_name_prefix="ezviz-pagelist",
+            ) as pool:
+                pages.extend(pool.map(_fetch, offsets))
+
+        # Without totalResults (or if the account grew meanwhile) keep paging
+        last_offset = offsets[-1] if offsets else offset
+        while self._pagelist_has_next(pages[-1]):
+            last_offset += limit
+            pages.append(_fetch(last_offset))
+
+        return merge_pages(page[json_key] if json_key else page for page in pages)
+
+    def _get_pagelist_page(
+        self,
+        page_filter: str,
+        group_id: int,
+        limit: int,
+        offset: int,
+        max_retries: int = 0,
+    ) -> dict:
+        """Fetch one pagelist page, re-logging in when the session is rejected."""
+        while True:
+            if max_retries > MAX_RETRIES:
+                raise PyEzvizError("Can't gather proper data. Max retries exceeded.")
 
-        if next_page:
-            next_offset = offset + limit
-            # Recursive call to fetch next page
-            next_data = self._api_get_pagelist(
-                page_filter, json_key, group_id, limit, next_offset, max_retries
+            session_id = self._token.get("session_id")
+            json_output = self._request_json(
+                "GET",
+                API_ENDPOINT_PAGELIST,
+                params=self._pagelist_params(page_filter, group_id, limit, offset),
+                retry_401=True,
+                max_retries=max_retries,
             )
-            # Merge data from next page into current data
-            data = deep_merge(data, next_data)
+            if self._meta_code(json_output) == 200:
+                return json_output
 
-        return data
+            # session is wrong, need to relogin and retry (with backoff)
+            delay = self._retry_delay(AUTH, max_retries, "pagelist_relogin")
+            if delay is None:
+                raise PyEzvizError("Can't gather proper data. Retry budget exhausted.")
+            self._log_retry(json_output, "pagelist_relogin", None)
+            time.sleep(delay)
+            self._relogin(session_id, "pagelist")
+            max_retries += 1
 
     def get_alarminfo(self, serial: str, limit: int = 1, max_retries: int = 0) -> dict:
         """Get data from alarm info API for camera serial."""
@@ -782,48 +1284,9 @@ class EzvizClient:
         if max_retries > MAX_RETRIES:
             raise PyEzvizError("Can't gather proper data. Max retries exceeded.")
 
-        def _stringify(value: Any) -> str:
-            raw = getattr(value, "value", value)
-            return str(raw)
-
-        stype_param: str | None
-        if s_type is None:
-            stype_param = DEFAULT_UNIFIEDMSG_STYPE
-        elif isinstance(s_type, str):
-            stype_param = s_type
-        elif isinstance(s_type, Iterable) and not isinstance(
-            s_type, (bytes, bytearray)
-        ):
-            parts = [_stringify(item) for item in s_type if item not in (None, "")]
-            stype_param = ",".join(parts) if parts else DEFAULT_UNIFIEDMSG_STYPE
-        else:
-            stype_param = _stringify(s_type)
-
-        if date is None:
-            date_value = dt.datetime.now().strftime("%Y%m%d")
-        elif isinstance(date, (dt.date, dt.datetime)):
-            date_value = date.strftime("%Y%m%d")
-        else:
-            date_value = str(date)
-
-        try:
-            limit_value = max(1, min(int(limit), 50))
-        except (TypeError, ValueError):
-            limit_value = 20
-
-        end_time_value: str = "" if end_time is None else str(end_time)
-
-        params: dict[str, Any] = {
-            "serials": serials,
-            "stype": stype_param,
-            "limit": limit_value,
-            "date": date_value,
-            "endTime": end_time_value,
-        }
-        filtered_params = {k: v for k, v in params.items() if v not in (None, "")}
-        # keep empty string endTime to mimic app behavior
-        if end_time_value == "":
-            filtered_params["endTime"] = ""
+        filtered_params = self._unifiedmsg_params(
+            serials, s_type, limit=limit, date=date, end_time=end_time
+        )
 
         json_output = self._request_json(
             "GET",
@@ -835,13 +1298,13 @@ class EzvizClient:
         self._ensure_ok(json_output, "Could not get unified message list")
         if _LOGGER.isEnabledFor(logging.DEBUG):
             counter_key = "unifiedmsg"
-            self._debug_request_counters[counter_key] = (
-                self._debug_request_counters.get(counter_key, 0) + 1
-            )
+            with self._state_lock:
+                count = self._debug_request_counters.get(counter_key, 0) + 1
+                self._debug_request_counters[counter_key] = count
             _LOGGER.debug(
                 "req_counter[%s]=%s params=%s",
                 counter_key,
-                self._debug_request_counters[counter_key],
+                count,
                 filtered_params,
             )
         return json_output
@@ -1157,8 +1620,9 @@ class EzvizClient:
             channel=channel_no,
             max_retries=max_retries,
         )
-        if self._cameras.get(serial):
-            self._cameras[serial]["switches"][status_type] = target_state
+        with self._state_lock:
+            if self._cameras.get(serial):
+                self._cameras[serial]["switches"][status_type] = target_state
         return True
 
     def device_switch(
@@ -1495,10 +1959,7 @@ class EzvizClient:
 
         full_url = f"https://{self._token['api_url']}{API_ENDPOINT_IOT_FEATURE}{serial.upper()}/0"
 
-        headers = {
-            **self._session.headers,
-            "Content-Type": "application/json",
-        }
+        headers = self._session_headers(**{"Content-Type": "application/json"})
 
         req_prep = requests.Request(
             method="PUT", url=full_url, headers=headers, data=payload
@@ -1534,7 +1995,7 @@ class EzvizClient:
             f"{local_index}/{domain_id}/{action_id}"
         )
 
-        headers = dict(self._session.headers)
+        headers = self._session_headers()
         data: str | bytes | bytearray | None = None
         if payload is not None:
             headers["Content-Type"] = "application/json"
@@ -2175,6 +2636,50 @@ class EzvizClient:
         self._ensure_ok(json_output, "Could not cancel alarm siren")
         return True
 
+    def run_bulk(
+        self,
+        operations: Iterable[Any],
+        *,
+        max_workers: int | None = None,
+    ) -> BulkReport:
+        """Run per-device commands concurrently and report each outcome.
+
+        Example::
+
+            report = client.run_bulk(
+                [("set_camera_defence", serial, (0,)) for serial in serials]
+            )
+            for serial, err in report.errors().items():
+                ...
+
+        Args:
+            operations: ``(operation, serial[, args])`` tuples or
+                :class:`~.bulk.BulkOperation` objects. ``operation`` names a
+                client method from :data:`~.bulk.BULK_OPERATIONS`; ``args``
+                is a tuple of positional or a dict of keyword arguments
+                passed after the serial.
+            max_workers: Threads for this call, at most the account-wide
+                ``bulk_concurrency`` (the default).
+
+        Returns:
+            A :class:`~.bulk.BulkReport` with one result per operation, in
+            input order. Device errors are captured, not raised.
+
+        Raises:
+            PyEzvizError: If an operation spec is malformed or unsupported;
+                nothing is run in that case.
+        """
+
+        def _call(op: BulkOperation) -> Any:
+            return getattr(self, op.operation)(op.serial, *op.args, **op.kwargs)
+
+        workers = self._bulk_concurrency
+        if max_workers is not None:
+            workers = max(1, min(max_workers, workers))
+        return run_bulk(
+            _call, operations, limiter=self._bulk_limiter, max_workers=workers
+        )
+
     def load_devices(self, refresh: bool = True) -> dict[Any, Any]:
         """Build status maps for cameras and light bulbs.
 
@@ -2184,8 +2689,15 @@ class EzvizClient:
         Note: We update in place and do not remove keys for devices that may
         have disappeared. Users who intentionally remove a device can restart
         the integration to flush stale entries.
+
+        Concurrent calls run one after the other; the returned mapping is a
+        snapshot that later refreshes do not modify.
         """
+        with self._load_lock:
+            return self._load_devices(refresh)
 
+    def _load_devices(self, refresh: bool) -> dict[Any, Any]:
+        """Refresh the device maps; callers hold ``_load_lock``."""
         # Build lightweight records for clean gating/selection
         records = cast(dict[str, EzvizDeviceRecord], self.get_device_records(None))
         supported_categories = self.SUPPORTED_CATEGORIES
@@ -2222,9 +2734,9 @@ class EzvizClient:
                 if rec.device_category == DeviceCatagories.LIGHTING.value:
                     try:
                         # Create a light bulb object
-                        self._light_bulbs[device] = EzvizLightBulb(
-                            self, device, dict(rec.raw)
-                        ).status()
+                        bulb = EzvizLightBulb(self, device, dict(rec.raw)).status()
+                        with self._state_lock:
+                            self._light_bulbs[device] = bulb
                     except (
                         PyEzvizError,
                         KeyError,
@@ -2239,12 +2751,20 @@ class EzvizClient:
                         )
                 else:
                     try:
-                        # Create camera object
-                        cam = EzvizCamera(self, device, dict(rec.raw))
-                        self._cameras[device] = cam.status(
+                        # Reuse the camera object across refreshes and only
+                        # patch the sections that changed.
+                        cam = self._camera_objects.get(device)
+                        if cam is None:
+                            cam = EzvizCamera(self, device, dict(rec.raw))
+                            self._camera_objects[device] = cam
+                        else:
+                            cam.update(device_payload=rec.raw)
+                        status = cam.status(
                             refresh=refresh,
                             latest_alarm=latest_alarms.get(device),
                         )
+                        with self._state_lock:
+                            self._cameras[device] = status
 
                     except (
                         PyEzvizError,
@@ -2258,100 +2778,126 @@ class EzvizClient:
                             "load_error",
                             str(err),
                         )
-        return {**self._cameras, **self._light_bulbs}
+        with self._state_lock:
+            return {**self._cameras, **self._light_bulbs}
 
-    def _prefetch_latest_camera_alarms(
-        self, serials: Iterable[str], *, chunk_size: int = 20
-    ) -> dict[str, dict[str, Any]]:
-        """Attempt to fetch the most recent unified message per camera serial."""
-        serial_list = [serial for serial in serials if serial]
-        if not serial_list:
-            return {}
+    def sync_messages(self, serials: Iterable[str] | None = None) -> MessageBatch:
+        """Read the unified messages that arrived since the previous call.
+
+        Uses :attr:`message_sync` to page from the newest message back to the
+        ones already seen, so a burst of alarms between two calls is reported
+        in full and every message is returned in ``new`` exactly once. In
+        steady state this is a single request. Devices the account-wide scan
+        does not reach (first run, large accounts) are queried in chunks, up
+        to ``unifiedmsg_parallel`` at once.
+
+        A failed request does not fail the call: the messages read so far
+        are returned and the cursors that could not be verified stay put,
+        so the next call reads those devices again.
+
+        Args:
+            serials: Devices to report; None reports every device.
+        """
 
-        latest: dict[str, dict[str, Any]] = {}
+        def _run_chunk(chunk: FillChunk) -> FillChunk:
+            while (request := chunk.next_request()) is not None:
+                try:
+                    response = self.get_device_messages_list(**request, max_retries=1)
+                except PyEzvizError as err:
+                    # Kept in the chunk: the other chunks still merge
+                    chunk.fail(err)
+                else:
+                    chunk.feed(response)
+            return chunk
 
-        def _query_chunk(
-            missing: set[str], limit: int, *, filtered: bool
-        ) -> None:
-            """Populate latest alarms for a given chunk, retrying a few times."""
-            attempts = 0
-            while missing and attempts < MAX_UNIFIEDMSG_PAGES:
-                attempts += 1
-                serial_param = None if not filtered else ",".join(sorted(missing))
+        with self._message_lock:
+            run = self.message_sync.begin(serials)
+            while (request := run.next_request()) is not None:
                 try:
                     response = self.get_device_messages_list(
-                        serials=serial_param,
-                        limit=limit,
-                        date="",
-                        end_time="",
-                        max_retries=1,
+                        **request, max_retries=1
                     )
                 except PyEzvizError as err:
-                    _LOGGER.debug(
-                        "alarm_prefetch_failed: serials=%s error=%r",
-                        serial_param or "",
-                        err,
-                    )
-                    return
-
-                items = response.get("message") or response.get("messages") or []
-                if not isinstance(items, list) or not items:
-                    return
-
-                matched = 0
-                for item in items:
-                    serial = item.get("deviceSerial")
-                    if (
-                        isinstance(serial, str)
-                        and serial in missing
-                        and serial not in latest
-                    ):
-                        latest[serial] = item
-                        missing.discard(serial)
-                        matched += 1
-
-                # If this filtered call returned fewer entries than we still need,
-                # assume remaining serials truly have no data and stop retrying.
-                if filtered and matched < len(missing):
-                    return
-
-                if not response.get("hasNext"):
-                    return
-
-        remaining_serials = set(serial_list)
-
-        # First, try a global fetch without serial filtering to capture the freshest alarms
-        before = set(remaining_serials)
-        _query_chunk(remaining_serials, limit=50, filtered=False)
-        satisfied = before - remaining_serials
-        if satisfied:
-            remaining_serials.difference_update(satisfied)
-
-        for start_idx in range(0, len(serial_list), chunk_size):
-            chunk = [
-                serial
-                for serial in serial_list[start_idx : start_idx + chunk_size]
-                if serial
-            ]
-            if not chunk:
-                continue
-            remaining = {serial for serial in chunk if serial in remaining_serials}
-            if not remaining:
-                continue
-            chunk_key = ",".join(chunk)
-            limit = min(50, max(len(chunk), 20))
-            before_chunk = set(remaining)
-            _query_chunk(remaining, limit, filtered=True)
-            satisfied_chunk = before_chunk - remaining
-            if satisfied_chunk:
-                remaining_serials.difference_update(satisfied_chunk)
-            if remaining:
-                _LOGGER.debug(
-                    "alarm_prefetch_incomplete: serials=%s missing=%s",
-                    chunk_key,
-                    ",".join(sorted(remaining)),
-                )
-        return latest
+                    run.fail(err)
+                else:
+                    run.feed(response)
+            chunks = run.fill_chunks()
+            if len(chunks) > 1 and self._unifiedmsg_parallel > 1:
+                with ThreadPoolExecutor(
+                    max_workers=min(len(chunks), self._unifiedmsg_parallel),
+                    thread_name_prefix="ezviz-unifiedmsg",
+                ) as pool:
+                    chunks = list(pool.map(_run_chunk, chunks))
+            else:
+                chunks = [_run_chunk(chunk) for chunk in chunks]
+            # Merged in chunk order, whatever order the queries finished in
+            for chunk in chunks:
+                run.feed_chunk(chunk)
+            return run.finish()
+
+    def iter_messages(
+        self,
+        since: str | dt.date | dt.datetime,
+        until: str | dt.date | dt.datetime | None = None,
+        *,
+        serials: Iterable[str] | None = None,
+        page_size: int = DEFAULT_STREAM_PAGE_SIZE,
+        prefetch: int = DEFAULT_STREAM_PREFETCH,
+        cursor: MessageCursor | str | None = None,
+    ) -> MessageStream:
+        """Iterate the unified messages of a date range, newest first.
+
+        Pages are requested lazily across days and ``hasNext`` pages; a
+        background thread fetches up to ``prefetch`` pages ahead of the
+        consumer (0 fetches in the calling thread).
+
+        Args:
+            since: Oldest day, included (``YYYYMMDD``, date or datetime).
+            until: Newest day, included; defaults to today.
+            serials: Devices to read; None reads every device.
+            page_size: Messages per request (1-50).
+            prefetch: Pages read ahead and held in memory.
+            cursor: ``stream.cursor`` of an earlier stream to resume after.
+
+        Example:
+            >>> with client.iter_messages("20260901", "20260930") as stream:
+            ...     for message in stream:
+            ...         export(message)
+        """
+        pager = RangePager(
+            since,
+            until,
+            serials=",".join(serials) if serials else None,
+            page_size=page_size,
+            cursor=cursor,
+        )
+        return MessageStream(
+            functools.partial(self.get_device_messages_list, max_retries=1),
+            pager,
+            prefetch,
+        )
+
+    def _prefetch_latest_camera_alarms(
+        self, serials: Iterable[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Return the most recent unified message per camera serial.
+
+        Backed by :meth:`sync_messages`; when the cloud call fails the last
+        known messages are returned.
+        """
+        serial_list = [serial for serial in serials if serial]
+        if not serial_list:
+            return {}
+        try:
+            return self.sync_messages(serial_list).latest
+        except PyEzvizError as err:
+            _LOGGER.debug(
+                "alarm_prefetch_failed: serials=%s error=%r", ",".join(serial_list), err
+            )
+        latest = {
+            serial: self.message_sync.latest(serial) for serial in serial_list
+        }
+        return {serial: item for serial, item in latest.items() if item is not None}
 
     def load_cameras(self, refresh: bool = True) -> dict[Any, Any]:
         """Load and return all camera status mappings.
@@ -2369,73 +2915,64 @@ class EzvizClient:
         self.load_devices(refresh=refresh)
         return self._light_bulbs
 
-    def get_device_infos(self, serial: str | None = None) -> dict[Any, Any]:
-        """Load all devices and build dict per device serial."""
-        devices = self._get_page_list()
-        result: dict[str, Any] = {}
-        _res_id = "NONE"
-
-        for device in devices.get("deviceInfos", []) or []:
-            _serial = device["deviceSerial"]
-            _res_id_list = {
-                item
-                for item in devices.get("CLOUD", {})
-                if devices["CLOUD"][item].get("deviceSerial") == _serial
-            }
-            _res_id = _res_id_list.pop() if _res_id_list else "NONE"
-
-            result[_serial] = {
-                "CLOUD": {_res_id: devices.get("CLOUD", {}).get(_res_id, {})},
-                "VTM": {_res_id: devices.get("VTM", {}).get(_res_id, {})},
-                "P2P": devices.get("P2P", {}).get(_serial, {}),
-                "CONNECTION": devices.get("CONNECTION", {}).get(_serial, {}),
-                "KMS": devices.get("KMS", {}).get(_serial, {}),
-                "STATUS": devices.get("STATUS", {}).get(_serial, {}),
-                "TIME_PLAN": devices.get("TIME_PLAN", {}).get(_serial, {}),
-                "CHANNEL": {_res_id: devices.get("CHANNEL", {}).get(_res_id, {})},
-                "QOS": devices.get("QOS", {}).get(_serial, {}),
-                "NODISTURB": devices.get("NODISTURB", {}).get(_serial, {}),
-                "FEATURE": devices.get("FEATURE", {}).get(_serial, {}),
-                "UPGRADE": devices.get("UPGRADE", {}).get(_serial, {}),
-                "FEATURE_INFO": devices.get("FEATURE_INFO", {}).get(_serial, {}),
-                "SWITCH": devices.get("SWITCH", {}).get(_serial, {}),
-                "CUSTOM_TAG": devices.get("CUSTOM_TAG", {}).get(_serial, {}),
-                "VIDEO_QUALITY": {
-                    _res_id: devices.get("VIDEO_QUALITY", {}).get(_res_id, {})
-                },
-                "resourceInfos": [
-                    item
-                    for item in (devices.get("resourceInfos") or [])
-                    if isinstance(item, dict) and item.get("deviceSerial") == _serial
-                ],  # Could be more than one
-                "WIFI": devices.get("WIFI", {}).get(_serial, {}),
-                "deviceInfos": device,
-            }
-            # Nested keys are still encoded as JSON strings
-            try:
-                support_ext = result[_serial].get("deviceInfos", {}).get("supportExt")
-                if isinstance(support_ext, str) and support_ext:
-                    result[_serial]["deviceInfos"]["supportExt"] = json.loads(
-                        support_ext
-                    )
-            except (TypeError, ValueError):
-                # Leave as-is if not valid JSON
-                pass
-            convert_to_dict(result[_serial]["STATUS"].get("optionals"))
+    def get_device_infos(
+        self,
+        serial: str | None = None,
+        sections: Iterable[str] | None = None,
+    ) -> dict[Any, Any]:
+        """Load all devices and build dict per device serial.
 
-        if not serial:
-            return result
+        Args:
+            serial: Return only this device's dict.
+            sections: Pagelist sections the caller reads; see
+                :meth:`get_device_index`.
+        """
+        return self._device_infos_from_index(self.get_device_index(sections), serial)
+
+    def get_device_index(self, sections: Iterable[str] | None = None) -> PagelistIndex:
+        """Load all devices and return an index that builds them on demand.
 
-        return cast(dict[Any, Any], result.get(serial, {}))
+        Args:
+            sections: Pagelist sections the caller reads (e.g. ``STATUS``,
+                ``CONNECTION``). Once a full pagelist has been fetched, only
+                these sections are requested and spliced into it, so the other
+                sections keep their last known values. ``None`` always fetches
+                every section.
+        """
+        if sections is not None and self._pagelist_index is not None:
+            wanted = projection_sections(sections)
+            partial = self._api_get_pagelist(
+                page_filter=",".join(wanted), json_key=None
+            )
+            index = self._merge_projection(partial, wanted)
+            if index is not None:
+                return index
+        return self._index_pagelist(self._get_page_list())
+
+    def get_device_changes(
+        self, sections: Iterable[str] | None = None
+    ) -> ChangeSet:
+        """Refresh devices and return what changed since the previous call.
+
+        The first call reports every device as added; the latest device dicts
+        stay available through ``device_state.state(serial)``. ``sections``
+        works as in :meth:`get_device_index`.
+        """
+        index = self.get_device_index(sections)
+        devices = index.devices()
+        with self._state_lock:
+            return self.device_state.update(devices)
 
     def get_device_records(
-        self, serial: str | None = None
+        self,
+        serial: str | None = None,
+        sections: Iterable[str] | None = None,
     ) -> dict[str, EzvizDeviceRecord] | EzvizDeviceRecord | dict[Any, Any]:
         """Return devices as EzvizDeviceRecord mapping (or single record).
 
         Falls back to raw when a specific serial is requested but not found.
         """
-        devices = self.get_device_infos()
+        devices = self.get_device_infos(sections=sections)
         records = build_device_records_map(devices)
         if serial is None:
             return records
@@ -2562,39 +3099,13 @@ class EzvizClient:
             json_output = self._request_json(
                 "POST",
                 API_ENDPOINT_CAM_ENCRYPTKEY,
-                data={
-                    "checkcode": smscode,
-                    "serial": serial,
-                    "clientNo": "web_site",
-                    "clientType": 3,
-                    "netType": "WIFI",
-                    "featureCode": FEATURE_CODE,
-                    "sessionId": self._token["session_id"],
-                },
+                data=self._cam_key_form(serial, smscode),
                 retry_401=True,
                 max_retries=0,
             )
-
-            code = str(json_output.get("resultCode"))
-            if code == "20002":
-                raise EzvizAuthVerificationCode(
-                    f"MFA code required: Got {json_output})"
-                )
-            if code == "2009":
-                raise DeviceException(f"Device not reachable: Got {json_output})")
-            if code == "0":
-                return json_output.get("encryptkey")
-            if code == "-1" and attempt < attempts:
-                _LOGGER.warning(
-                    "Http_retry: serial=%s code=%s msg=%s",
-                    serial,
-                    code,
-                    "cam_key_not_found",
-                )
-                continue
-            raise PyEzvizError(
-                f"Could not get camera encryption key: Got {json_output})"
-            )
+            key = self._cam_key_from(json_output, serial, attempt < attempts)
+            if key is not None:
+                return key
 
         raise PyEzvizError("Could not get camera encryption key: exceeded retries")
 
@@ -2844,20 +3355,19 @@ class EzvizClient:
             bool: True if the operation was successful.
 
         """
-        route_resource = resource_id or "Video"
-        route_index = str(local_index if local_index is not None else 1)
-        un_lock_info: dict[str, Any] = {
-            "bindCode": f"{FEATURE_CODE}{user_id}",
-            "lockNo": lock_no,
-            "streamToken": stream_token or "",
-            "userName": user_id,
-        }
-        if lock_type:
-            un_lock_info["type"] = lock_type
-        payload = {"unLockInfo": un_lock_info}
+        path, payload = self._lock_request(
+            API_ENDPOINT_REMOTE_UNLOCK,
+            serial,
+            user_id,
+            lock_no,
+            resource_id=resource_id,
+            local_index=local_index,
+            stream_token=stream_token,
+            lock_type=lock_type,
+        )
         json_result = self._request_json(
             "PUT",
-            f"{API_ENDPOINT_IOT_ACTION}{serial}/{route_resource}/{route_index}{API_ENDPOINT_REMOTE_UNLOCK}",
+            path,
             json_body=payload,
             retry_401=True,
             max_retries=0,
@@ -2868,6 +3378,7 @@ class EzvizClient:
             self._response_code(json_result),
             "remote_unlock",
         )
+        self._ensure_ok(json_result, "Could not send remote_unlock command")
         return True
 
     def remote_lock(
@@ -2883,20 +3394,19 @@ class EzvizClient:
     ) -> bool:
         """Send a remote lock command to a specific lock."""
 
-        route_resource = resource_id or "Video"
-        route_index = str(local_index if local_index is not None else 1)
-        un_lock_info: dict[str, Any] = {
-            "bindCode": f"{FEATURE_CODE}{user_id}",
-            "lockNo": lock_no,
-            "streamToken": stream_token or "",
-            "userName": user_id,
-        }
-        if lock_type:
-            un_lock_info["type"] = lock_type
-        payload = {"unLockInfo": un_lock_info}
+        path, payload = self._lock_request(
+            API_ENDPOINT_REMOTE_LOCK,
+            serial,
+            user_id,
+            lock_no,
+            resource_id=resource_id,
+            local_index=local_index,
+            stream_token=stream_token,
+            lock_type=lock_type,
+        )
         json_result = self._request_json(
             "PUT",
-            f"{API_ENDPOINT_IOT_ACTION}{serial}/{route_resource}/{route_index}{API_ENDPOINT_REMOTE_LOCK}",
+            path,
             json_body=payload,
             retry_401=True,
             max_retries=0,
@@ -2907,6 +3417,7 @@ class EzvizClient:
             self._response_code(json_result),
             "remote_lock",
         )
+        self._ensure_ok(json_result, "Could not send remote_lock command")
         return True
 
     def get_remote_unbind_progress(
@@ -2929,22 +3440,21 @@ class EzvizClient:
     def login(self, sms_code: int | None = None) -> dict[Any, Any]:
         """Get or refresh ezviz login token."""
         if self._token["session_id"] and self._token["rf_session_id"]:
+            self.retry_policy.before_request()
             try:
                 req = self._session.put(
                     url=f"https://{self._token['api_url']}{API_ENDPOINT_REFRESH_SESSION_ID}",
-                    data={
-                        "refreshSessionId": self._token["rf_session_id"],
-                        "featureCode": FEATURE_CODE,
-                    },
+                    data=self._refresh_payload(),
                     timeout=self._timeout,
                 )
+                self.retry_policy.record_outcome(req.status_code)
                 req.raise_for_status()
 
             except requests.HTTPError as err:
                 raise HTTPError from err
 
             try:
-                json_result = req.json()
+                json_result = json_loads(req.content)
 
             except ValueError as err:
                 raise PyEzvizError(
@@ -2955,27 +3465,32 @@ class EzvizClient:
                 ) from err
 
             if json_result["meta"]["code"] == 200:
-                self._session.headers["sessionId"] = json_result["sessionInfo"][
-                    "sessionId"
-                ]
-                self._token["session_id"] = str(json_result["sessionInfo"]["sessionId"])
-                self._token["rf_session_id"] = str(
-                    json_result["sessionInfo"]["refreshSessionId"]
-                )
+                with self._state_lock:
+                    self._set_session_id(json_result["sessionInfo"]["sessionId"])
+                    self._token["session_id"] = str(
+                        json_result["sessionInfo"]["sessionId"]
+                    )
+                    self._token["rf_session_id"] = str(
+                        json_result["sessionInfo"]["refreshSessionId"]
+                    )
 
                 if not self._token.get("service_urls"):
-                    self._token["service_urls"] = self.get_service_urls()
+                    service_urls = self.get_service_urls()
+                    with self._state_lock:
+                        self._token["service_urls"] = service_urls
+                self.tokens.publish(self._token)
 
-                return cast(dict[Any, Any], self._token)
+                return dict(self._token)
 
             if json_result["meta"]["code"] == 403:
                 if self.account and self.password:
-                    self._token = {
-                        "session_id": None,
-                        "rf_session_id": None,
-                        "username": None,
-                        "api_url": self._token["api_url"],
-                    }
+                    with self._state_lock:
+                        self._token = {
+                            "session_id": None,
+                            "rf_session_id": None,
+                            "username": None,
+                            "api_url": self._token["api_url"],
+                        }
                     return self.login()
 
                 raise EzvizAuthTokenExpired(
@@ -3010,7 +3525,7 @@ class EzvizClient:
             raise HTTPError from err
 
         try:
-            json_result = req.json()
+            json_result = json_loads(req.content)
 
         except ValueError as err:
             raise PyEzvizError(
@@ -3026,6 +3541,9 @@ class EzvizClient:
 
     def set_camera_defence_old(self, serial: str, enable: int) -> bool:
         """Enable/Disable motion detection on camera."""
+        # CAS pulls in pycryptodome and xmltodict: load it on first use
+        from .cas import EzvizCAS
+
         cas_client = EzvizCAS(cast(dict[str, Any], self._token))
         cas_client.set_camera_defence_state(serial, enable)
 
@@ -3492,32 +4010,21 @@ class EzvizClient:
             raise PyEzvizError(
                 "Unproper sensibility for type 0 (should be within 1 to 6)."
             )
-        try:
-            req = self._session.post(
-                url=f"https://{self._token['api_url']}{API_ENDPOINT_DETECTION_SENSIBILITY}",
-                data={
-                    "subSerial": serial,
-                    "type": type_value,
-                    "channelNo": 1,
-                    "value": sensibility,
-                },
-                timeout=self._timeout,
-            )
-
-            req.raise_for_status()
-
-        except requests.HTTPError as err:
-            if err.response.status_code == 401:
-                # session is wrong, need to re-log-in
-                self.login()
-                return self.detection_sensibility(
-                    serial, sensibility, type_value, max_retries + 1
-                )
-
-            raise HTTPError from err
+        req = self._http_request(
+            "POST",
+            self._url(API_ENDPOINT_DETECTION_SENSIBILITY),
+            data={
+                "subSerial": serial,
+                "type": type_value,
+                "channelNo": 1,
+                "value": sensibility,
+            },
+            retry_401=True,
+            max_retries=max_retries,
+        )
 
         try:
-            response_json = req.json()
+            response_json = json_loads(req.content)
 
         except ValueError as err:
             raise PyEzvizError("Could not decode response:" + str(err)) from err
@@ -3530,6 +4037,10 @@ class EzvizClient:
                     max_retries,
                     MAX_RETRIES,
                 )
+                delay = self._retry_delay(WRITE, max_retries, "detection_sensibility_offline")
+                if delay is None:
+                    raise PyEzvizError("Camera offline and retry budget exhausted.")
+                time.sleep(delay)
                 return self.detection_sensibility(
                     serial, sensibility, type_value, max_retries + 1
                 )
@@ -4203,11 +4714,12 @@ class EzvizClient:
     ) -> dict:
         """Batch query encrypt keys for devices, matching the mobile client's risk API."""
 
-        headers = {
-            **self._session.headers,
-            "Content-Type": "application/x-www-form-urlencoded",
-            "areaId": str(area_id),
-        }
+        headers = self._session_headers(
+            **{
+                "Content-Type": "application/x-www-form-urlencoded",
+                "areaId": str(area_id),
+            }
+        )
         if isinstance(form_data, (bytes, bytearray, str)):
             body = form_data
         else:
@@ -4448,7 +4960,7 @@ class EzvizClient:
     ) -> dict:
         """Find device information by serial."""
 
-        headers = dict(self._session.headers)
+        headers = self._session_headers()
         if user_ssid is not None:
             headers["userSsid"] = user_ssid
 
@@ -4672,6 +5184,9 @@ class EzvizClient:
     ) -> MQTTClient:
         """Return a configured MQTTClient using this client's session."""
         if self.mqtt_client is None:
+            # paho-mqtt is only needed once push is started
+            from .mqtt import MQTTClient
+
             self.mqtt_client = MQTTClient(
                 token=cast(dict[Any, Any], self._token),
                 session=self._session,
@@ -4683,12 +5198,7 @@ class EzvizClient:
     def _get_page_list(self) -> Any:
         """Get ezviz device info broken down in sections."""
         return self._api_get_pagelist(
-            page_filter="CLOUD, TIME_PLAN, CONNECTION, SWITCH,"
-            "STATUS, WIFI, NODISTURB, KMS,"
-            "P2P, TIME_PLAN, CHANNEL, VTM, DETECTOR,"
-            "FEATURE, CUSTOM_TAG, UPGRADE, VIDEO_QUALITY,"
-            "QOS, PRODUCTS_INFO, SIM_CARD, MULTI_UPGRADE_EXT,"
-            "FEATURE_INFO",
+            page_filter=PAGELIST_FULL_FILTER,
             json_key=None,
         )
 
@@ -4740,8 +5250,7 @@ class EzvizClient:
 
     def close_session(self) -> None:
         """Clear current session."""
-        if self._session:
-            self._session.close()
-
-        self._session = requests.session()
-        self._session.headers.update(REQUEST_HEADER)  # Reset session.
+        with self._state_lock:
+            old_session, self._session = self._session, self._new_session()
+        if old_session:
+            old_session.close()
@@ -0,0 +1,106 @@
+"""JSON decoding with the fastest available backend.
+
+``orjson`` is used when installed (Home Assistant ships it), then
+``msgspec``, then the stdlib ``json`` module. :func:`loads` accepts the raw
+response bytes, so HTTP bodies and MQTT payloads are parsed without first
+being decoded to ``str``.
+
+The fast backends are stricter than the stdlib (64-bit integers only, no
+``NaN``); a payload they reject is retried with the stdlib, so results never
+depend on which backend is installed. Every backend raises ``ValueError`` on
+invalid JSON.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import json
+from typing import Any
+
+JSONInput = bytes | bytearray | memoryview | str
+
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+def _stdlib_loads(data: JSONInput) -> Any:
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _load_backend(name: str) -> Callable[[JSONInput], Any] | None:
+    """Return the loads function of backend ``name``, or None if not installed."""
+    if name == "json":
+        return _stdlib_loads
+    if name == "orjson":
+        try:
+            import orjson
+        except ImportError:
+            return None
+        return orjson.loads
+    if name == "msgspec":
+        try:
+            import msgspec
+        except ImportError:
+            return None
+        decode = msgspec.json.decode
+        decode_error = msgspec.DecodeError
+
+        def _msgspec_loads(data: JSONInput) -> Any:
+            try:
+                return decode(data)
+            except decode_error as err:
+                raise ValueError(str(err)) from err
+
+        return _msgspec_loads
+    raise ValueError(f"Unknown JSON backend: {name}")
+
+
+def available_backends() -> list[str]:
+    """Return the installed backends, fastest first."""
+    return [name for name in BACKENDS if _load_backend(name) is not None]
+
+
+_backend_name = "json"
+_backend_loads: Callable[[JSONInput], Any] = _stdlib_loads
+
+
+def use_backend(name: str | None = None) -> str:
+    """Select the backend used by :func:`loads` and return its name.
+
+    Args:
+        name: One of :data:`BACKENDS`, or None for the fastest installed one.
+
+    Raises:
+        ValueError: If ``name`` is unknown or not installed.
+    """
+    global _backend_name, _backend_loads
+    for candidate in (name,) if name else BACKENDS:
+        loader = _load_backend(candidate)
+        if loader is not None:
+            _backend_name, _backend_loads = candidate, loader
+            return candidate
+    raise ValueError(f"JSON backend {name} is not installed")
+
+
+def backend() -> str:
+    """Return the name of the backend in use."""
+    return _backend_name
+
+
+def loads(data: JSONInput) -> Any:
+    """Parse JSON from bytes (preferred) or str.
+
+    Raises:
+        ValueError: If ``data`` is not valid JSON.
+    """
+    if _backend_loads is _stdlib_loads:
+        return _stdlib_loads(data)
+    try:
+        return _backend_loads(data)
+    except ValueError:
+        # Big integers, NaN, non UTF-8 text: let the stdlib decide
+        return _stdlib_loads(data)
+
+
+use_backend()
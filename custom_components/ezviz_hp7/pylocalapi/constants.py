@@ -22,6 +22,10 @@ FEATURE_CODE = _generate_unique_code()
 XOR_KEY = b"\x0c\x0eJ^X\x15@Rr"
 DEFAULT_TIMEOUT = 25
 MAX_RETRIES = 3
+# Keep-alive pools of EzvizClient: hosts kept open (api, push, image ...)
+# and connections per host, sized for concurrent executor threads.
+DEFAULT_POOL_CONNECTIONS = 8
+DEFAULT_POOL_MAXSIZE = 16
 # Unified message API default subtype that returns all alarm categories.
 DEFAULT_UNIFIEDMSG_STYPE = "92"
 HIK_ENCRYPTION_HEADER = b"hikencodepicture"
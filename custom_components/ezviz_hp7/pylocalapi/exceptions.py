@@ -31,3 +31,7 @@ class EzvizAuthVerificationCode(PyEzvizError):
 
 class DeviceException(PyEzvizError):
     """Raised when the physical device reports network or operational issues."""
+
+
+class EzvizCircuitOpen(PyEzvizError):
+    """Raised without contacting the cloud while the client's circuit breaker is open."""
@@ -0,0 +1,268 @@
+"""Lazy iteration of the unified message list over a date range.
+
+``get_device_messages_list`` returns one page (at most 50 messages) of one
+day. :class:`RangePager` plans the requests that walk a whole date range,
+newest day first and, within a day, newest message first through the
+``hasNext`` pages; it does no I/O, so the sync and async clients share it.
+
+:class:`MessageStream` drives a pager for ``EzvizClient.iter_messages``: a
+reader thread fetches the next pages while the consumer handles the current
+one (``AsyncEzvizClient`` uses a task for the same, see
+``async_client.AsyncMessageStream``). At most ``prefetch`` pages wait in
+memory, so exporting a month costs the same memory as exporting a day.
+:attr:`MessageStream.cursor` is the position after the last message handed
+out; passing it back as ``cursor`` resumes the iteration right after that
+message.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+import datetime
+import queue
+import threading
+from typing import Any
+
+from .exceptions import PyEzvizError
+from .messages import response_messages
+
+DEFAULT_STREAM_PAGE_SIZE = 50
+DEFAULT_STREAM_PREFETCH = 2
+
+DateLike = str | datetime.date | datetime.datetime
+
+
+def parse_day(value: DateLike) -> datetime.date:
+    """Return ``value`` (``YYYYMMDD``, ISO date, date or datetime) as a date.
+
+    Raises:
+        PyEzvizError: If a string is not a valid date.
+    """
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    for fmt in ("%Y%m%d", "%Y-%m-%d"):
+        try:
+            return datetime.datetime.strptime(str(value), fmt).date()
+        except ValueError:
+            continue
+    raise PyEzvizError(f"Invalid date: {value!r}, expected YYYYMMDD")
+
+
+@dataclass(frozen=True)
+class MessageCursor:
+    """Position in a date range: the day being read and the last ``msgId``.
+
+    ``end_time`` is empty at the start of a day.
+    """
+
+    date: str
+    end_time: str = ""
+
+    def __str__(self) -> str:
+        """Return the cursor as ``YYYYMMDD:msgId`` (see :meth:`parse`)."""
+        return f"{self.date}:{self.end_time}"
+
+    @classmethod
+    def parse(cls, value: str) -> MessageCursor:
+        """Build a cursor from its string form.
+
+        Raises:
+            PyEzvizError: If ``value`` is not ``YYYYMMDD[:msgId]``.
+        """
+        date, _, end_time = str(value).partition(":")
+        return cls(parse_day(date).strftime("%Y%m%d"), end_time)
+
+
+class RangePager:
+    """Request planner for a date range; see the module docstring."""
+
+    def __init__(
+        self,
+        since: DateLike,
+        until: DateLike | None = None,
+        *,
+        serials: str | None = None,
+        page_size: int = DEFAULT_STREAM_PAGE_SIZE,
+        cursor: MessageCursor | str | None = None,
+    ) -> None:
+        """Plan the days from ``until`` (default: today) back to ``since``.
+
+        Args:
+            since: Oldest day, included.
+            until: Newest day, included.
+            serials: Optional CSV of serials passed to every request.
+            page_size: Messages per request (1-50).
+            cursor: Resume after this position instead of the newest message
+                of ``until``.
+        """
+        first = parse_day(since)
+        last = parse_day(until) if until is not None else datetime.date.today()
+        if first > last:
+            first, last = last, first
+        self._days = [
+            (last - datetime.timedelta(days=offset)).strftime("%Y%m%d")
+            for offset in range((last - first).days + 1)
+        ]
+        self._serials = serials
+        self._limit = max(1, min(int(page_size), 50))
+        self._end_time = ""
+        self._skip: str | None = None
+        if cursor is not None:
+            if isinstance(cursor, str):
+                cursor = MessageCursor.parse(cursor)
+            if cursor.date in self._days:
+                del self._days[: self._days.index(cursor.date)]
+            else:
+                # Cursor outside the range: nothing newer than it is left
+                self._days = [day for day in self._days if day < cursor.date]
+            if self._days and self._days[0] == cursor.date:
+                self._end_time = cursor.end_time
+                self._skip = cursor.end_time or None
+
+    @property
+    def date(self) -> str | None:
+        """Return the day the next request reads, or None when done."""
+        return self._days[0] if self._days else None
+
+    def next_request(self) -> dict[str, Any] | None:
+        """Return the ``get_device_messages_list`` kwargs to call next, or None."""
+        if not self._days:
+            return None
+        return {
+            "serials": self._serials,
+            "limit": self._limit,
+            "date": self._days[0],
+            "end_time": self._end_time,
+        }
+
+    def feed(self, response: dict[str, Any]) -> list[dict[str, Any]]:
+        """Consume the response of the last request and return its messages."""
+        items = response_messages(response)
+        if self._skip is not None:
+            items = [item for item in items if str(item.get("msgId")) != self._skip]
+            self._skip = None
+        last_id = str(items[-1].get("msgId") or "") if items else ""
+        if not items or not response.get("hasNext") or last_id in ("", self._end_time):
+            # Day exhausted (or the server stopped making progress)
+            self._days.pop(0)
+            self._end_time = ""
+        else:
+            self._end_time = last_id
+        return items
+
+
+class MessageStream(Iterator[dict[str, Any]]):
+    """Iterator over the messages planned by a :class:`RangePager`.
+
+    With ``prefetch > 0`` a daemon thread reads ahead into a queue bounded to
+    ``prefetch`` pages; errors of the reader are raised by :meth:`__next__`
+    in the consumer. Closing the stream (or leaving its ``with`` block) stops
+    the reader.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[..., dict[str, Any]],
+        pager: RangePager,
+        prefetch: int = DEFAULT_STREAM_PREFETCH,
+    ) -> None:
+        """Stream the pages of ``pager``, calling ``fetch(**request)`` for each."""
+        self._fetch = fetch
+        self._pager = pager
+        self._page: Iterator[dict[str, Any]] = iter(())
+        self._page_date: str | None = pager.date
+        self._cursor: MessageCursor | None = None
+        self._closed = threading.Event()
+        self._queue: queue.Queue[Any] | None = None
+        self.pages = 0
+        if prefetch > 0:
+            self._queue = queue.Queue(maxsize=prefetch)
+            threading.Thread(
+                target=self._read_ahead, name="ezviz-message-stream", daemon=True
+            ).start()
+
+    @property
+    def cursor(self) -> MessageCursor | None:
+        """Return the position after the last message returned, if any."""
+        return self._cursor
+
+    def __iter__(self) -> MessageStream:
+        """Return the stream itself."""
+        return self
+
+    def __enter__(self) -> MessageStream:
+        """Return the stream itself."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop the reader thread."""
+        self.close()
+
+    def close(self) -> None:
+        """Stop reading ahead; the stream raises StopIteration from now on."""
+        self._closed.set()
+        if self._queue is not None:
+            # Unblock a reader waiting for room in the queue
+            try:
+                while True:
+                    self._queue.get_nowait()
+            except queue.Empty:
+                pass
+
+    def _next_page(self) -> tuple[str, list[dict[str, Any]]] | None:
+        """Fetch one page in the calling thread; None when the range is done."""
+        request = self._pager.next_request()
+        if request is None:
+            return None
+        return request["date"], self._pager.feed(self._fetch(**request))
+
+    def _put(self, item: Any) -> bool:
+        assert self._queue is not None
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=0.2)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def _read_ahead(self) -> None:
+        while not self._closed.is_set():
+            try:
+                page = self._next_page()
+            except Exception as err:  # re-raised in the consumer
+                self._put(err)
+                return
+            # None marks the end of the range
+            if not self._put(page) or page is None:
+                return
+
+    def __next__(self) -> dict[str, Any]:
+        """Return the next message, fetching pages as needed."""
+        while True:
+            if self._closed.is_set():
+                raise StopIteration
+            message = next(self._page, None)
+            if message is not None:
+                self._cursor = MessageCursor(
+                    self._page_date or "", str(message.get("msgId") or "")
+                )
+                return message
+            if self._queue is None:
+                page = self._next_page()
+            else:
+                item = self._queue.get()
+                if isinstance(item, Exception):
+                    self._closed.set()
+                    raise item
+                page = item
+            if page is None:
+                self._closed.set()
+                raise StopIteration
+            self.pages += 1
+            self._page_date, messages = page
+            self._page = iter(messages)
+
@@ -0,0 +1,447 @@
+"""Incremental sync of the unified message (alarm) list.
+
+The unified message endpoint returns messages newest first and pages towards
+older ones with ``endTime=<msgId of the last message>``. Asking only for the
+newest message on every poll loses every alarm but the last one of a burst.
+
+:class:`MessageSync` remembers, per device, how far the message list has been
+read and which ``msgId``\\s were already seen. Each :meth:`MessageSync.begin`
+returns a :class:`SyncRun`: a small state machine the sync and async clients
+drive with ``next_request()`` / ``feed()``. In steady state a poll is one
+request for the newest page, which already overlaps known messages; after a
+burst the run pages back until it reaches them. Devices the account-wide
+scan does not reach are then queried in :class:`FillChunk`\\s of
+``FILL_CHUNK_SIZE`` serials, which the clients run concurrently. Every
+message is reported in :attr:`MessageBatch.new` exactly once.
+
+The first run for a device only establishes its baseline (latest message,
+seen ids) and reports nothing as new, so a restart does not replay history.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PAGE_LIMIT = 20
+DEFAULT_MAX_PAGES = 6
+DEFAULT_HISTORY = 1000
+FILL_CHUNK_SIZE = 20
+
+
+def message_time(message: dict[str, Any]) -> float | None:
+    """Return the ``time`` of a unified message as a number, if present."""
+    value = message.get("time")
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _newer_or_equal(message: dict[str, Any], other: dict[str, Any]) -> bool:
+    return (message_time(message) or 0.0) >= (message_time(other) or 0.0)
+
+
+def response_messages(response: dict[str, Any]) -> list[dict[str, Any]]:
+    """Return the message list of a unified message response."""
+    items = response.get("message") or response.get("messages") or []
+    if not isinstance(items, list):
+        return []
+    return [item for item in items if isinstance(item, dict)]
+
+
+@dataclass
+class MessageBatch:
+    """Result of one sync run.
+
+    Attributes:
+        new: Messages not reported by any previous run, oldest first.
+        read: Every message of the requested serials read by this run,
+            including baseline and already reported ones, oldest first.
+        latest: ``{serial: newest known message}`` for the requested serials
+            that have any message.
+        requests: Unified message requests the run made.
+        truncated: True when the page limit was hit, or a request failed,
+            before reaching known messages; older messages of that burst
+            were not read.
+        failed: Serials whose per-device query failed; their cursors did not
+            move, so the next run queries them again.
+    """
+
+    new: list[dict[str, Any]] = field(default_factory=list)
+    read: list[dict[str, Any]] = field(default_factory=list)
+    latest: dict[str, dict[str, Any]] = field(default_factory=dict)
+    requests: int = 0
+    truncated: bool = False
+    failed: list[str] = field(default_factory=list)
+
+    def new_by_serial(self) -> dict[str, list[dict[str, Any]]]:
+        """Return the new messages grouped by device serial, oldest first."""
+        grouped: dict[str, list[dict[str, Any]]] = {}
+        for message in self.new:
+            grouped.setdefault(str(message.get("deviceSerial")), []).append(message)
+        return grouped
+
+
+class FillChunk:
+    """Per-device query for baseline serials missing from the account scan.
+
+    Pages the list filtered on ``serials`` until each of them has a message,
+    the list ends or ``max_pages`` requests were made. Drive it with
+    ``next_request()`` / ``feed()`` like :class:`SyncRun`; on a failed
+    request call :meth:`fail` instead.
+    """
+
+    def __init__(self, serials: list[str], max_pages: int) -> None:
+        """Query ``serials`` with at most ``max_pages`` requests."""
+        self.serials = serials
+        self.messages: list[dict[str, Any]] = []
+        self.requests = 0
+        self.error: Exception | None = None
+        self._max_pages = max_pages
+        self._scope = frozenset(serials)
+        self._missing = set(serials)
+        self._end_time = ""
+        self._done = False
+
+    def next_request(self) -> dict[str, Any] | None:
+        """Return the ``get_device_messages_list`` kwargs to call next, or None."""
+        if self._done:
+            return None
+        return {
+            "serials": ",".join(self.serials),
+            "limit": min(50, max(len(self.serials), DEFAULT_PAGE_LIMIT)),
+            "date": "",
+            "end_time": self._end_time,
+        }
+
+    def feed(self, response: dict[str, Any]) -> None:
+        """Consume the response of the last :meth:`next_request`."""
+        self.requests += 1
+        items = response_messages(response)
+        for message in items:
+            serial = message.get("deviceSerial")
+            if serial in self._scope:
+                self.messages.append(message)
+                self._missing.discard(serial)
+        last_id = str(items[-1].get("msgId") or "") if items else ""
+        self._done = (
+            not self._missing
+            or not items
+            or not response.get("hasNext")
+            or self.requests >= self._max_pages
+            or last_id in ("", self._end_time)
+        )
+        self._end_time = last_id
+
+    def fail(self, error: Exception) -> None:
+        """Stop the query after a failed request; see :meth:`SyncRun.feed_chunk`."""
+        self.error = error
+        self._done = True
+
+
+class SyncRun:
+    """One pass over the message list; see :meth:`MessageSync.begin`."""
+
+    def __init__(
+        self,
+        sync: MessageSync,
+        serials: list[str] | None,
+        threshold: float | None,
+        baseline: set[str],
+    ) -> None:
+        """Prepare a run; use :meth:`MessageSync.begin` instead."""
+        self._sync = sync
+        self._serials = serials
+        self._scope = set(serials) if serials is not None else None
+        self._threshold = threshold
+        self._baseline = baseline
+        self._end_time: str | None = ""
+        self._pages = 0
+        self._top: float | None = None
+        self._fill: list[list[str]] = []
+        self._scanning = True
+        self._scan_failed = False
+        self._failed: set[str] = set()
+        # Committed to the MessageSync only by finish(), so a run that fails
+        # half way reports its messages again next time
+        self._seen_in_run: dict[str, None] = {}
+        self._latest_in_run: dict[str, dict[str, Any]] = {}
+        self.batch = MessageBatch()
+
+    def next_request(self) -> dict[str, Any] | None:
+        """Return the kwargs of the next account-wide scan request, or None.
+
+        Once the scan is over, :meth:`fill_chunks` returns the per-device
+        queries still needed.
+        """
+        if self._scanning:
+            return {
+                "serials": None,
+                "limit": self._sync.page_limit,
+                "date": "",
+                "end_time": self._end_time,
+            }
+        return None
+
+    def fail(self, error: Exception) -> None:
+        """End the scan after its last request failed, keeping what was read.
+
+        The messages read so far are reported and remembered as seen, but no
+        cursor moves: the next run reads from the same position again.
+        """
+        _LOGGER.warning(
+            "Unifiedmsg_sync: request failed after %s pages, returning partial "
+            "results: %r",
+            self._pages,
+            error,
+        )
+        self._scan_failed = True
+        if self._threshold is not None:
+            self.batch.truncated = True
+        self._end_scan()
+
+    def _end_scan(self) -> None:
+        self._scanning = False
+        missing = self._missing_baseline()
+        self._fill = [
+            missing[i : i + FILL_CHUNK_SIZE]
+            for i in range(0, len(missing), FILL_CHUNK_SIZE)
+        ]
+
+    def fill_chunks(self) -> list[FillChunk]:
+        """Return the queries for baseline devices the scan did not reach.
+
+        Chunks are independent of each other and may run concurrently; feed
+        each one back with :meth:`feed_chunk` in list order, so the merged
+        result does not depend on which query finished first.
+        """
+        chunks = [FillChunk(serials, self._sync.max_pages) for serials in self._fill]
+        self._fill = []
+        return chunks
+
+    def feed_chunk(self, chunk: FillChunk) -> None:
+        """Merge the messages of a completed :class:`FillChunk`.
+
+        A chunk that failed is dropped, pages already read included: its
+        serials keep their baseline and are listed in ``batch.failed``.
+        """
+        self.batch.requests += chunk.requests
+        if chunk.error is not None:
+            _LOGGER.warning(
+                "Unifiedmsg_sync: query for serials=%s failed: %r",
+                ",".join(chunk.serials),
+                chunk.error,
+            )
+            self._failed.update(chunk.serials)
+            self.batch.failed.extend(chunk.serials)
+            return
+        for message in chunk.messages:
+            self._record(message)
+
+    def _in_scope(self, serial: Any) -> bool:
+        return isinstance(serial, str) and (self._scope is None or serial in self._scope)
+
+    def _record(self, message: dict[str, Any]) -> None:
+        serial = message.get("deviceSerial")
+        msg_id = message.get("msgId")
+        msg_id = str(msg_id) if msg_id not in (None, "") else None
+        if msg_id is not None:
+            if msg_id in self._seen_in_run:
+                return
+            self._seen_in_run[msg_id] = None
+            known = self._sync.is_seen(msg_id)
+        else:
+            known = False
+        if not self._in_scope(serial):
+            return
+        self.batch.read.append(message)
+        current = self._latest_in_run.get(serial)
+        if current is None or (message_time(message) or 0.0) > (
+            message_time(current) or 0.0
+        ):
+            self._latest_in_run[serial] = message
+        if not known and self._threshold is not None and serial not in self._baseline:
+            self.batch.new.append(message)
+
+    def feed(self, response: dict[str, Any]) -> None:
+        """Consume the response of the last :meth:`next_request`."""
+        self.batch.requests += 1
+        items = response_messages(response)
+        self._pages += 1
+        reached_known = False
+        for message in items:
+            time_value = message_time(message)
+            if self._top is None and time_value is not None:
+                self._top = time_value
+            msg_id = message.get("msgId")
+            if self._threshold is not None and (
+                (time_value is not None and time_value < self._threshold)
+                or (msg_id not in (None, "") and self._sync.is_seen(str(msg_id)))
+            ):
+                reached_known = True
+                break
+            self._record(message)
+
+        missing = self._missing_baseline()
+        done = (
+            reached_known
+            or not items
+            or not response.get("hasNext")
+            or (self._threshold is None and not missing)
+        )
+        if not done and self._pages >= self._sync.max_pages:
+            if self._threshold is not None:
+                self.batch.truncated = True
+                _LOGGER.warning(
+                    "Unifiedmsg_sync: more than %s new messages since last poll, "
+                    "older ones were skipped",
+                    self._pages * self._sync.page_limit,
+                )
+            done = True
+        if done:
+            self._end_scan()
+        else:
+            self._end_time = str(items[-1].get("msgId") or "")
+
+    def _missing_baseline(self) -> list[str]:
+        """Serials still waiting for a first message in a baseline run."""
+        return sorted(
+            serial
+            for serial in self._baseline
+            if self._sync.latest(serial) is None and serial not in self._latest_in_run
+            and (self._scope is None or serial in self._scope)
+        )
+
+    def finish(self) -> MessageBatch:
+        """Commit the run, advance the cursors and return the batch.
+
+        After :meth:`fail` the messages read are committed but the cursors
+        stay where they were; serials of failed chunks keep their baseline.
+        """
+        for msg_id in self._seen_in_run:
+            self._sync.mark_seen(msg_id)
+        for serial, message in self._latest_in_run.items():
+            self._sync.offer_latest(serial, message)
+        serials = self._serials
+        if serials is not None and self._failed:
+            serials = [serial for serial in serials if serial not in self._failed]
+        if not self._scan_failed and (serials is None or serials):
+            self._sync.complete(serials, self._top, self._threshold)
+        self.batch.new.sort(key=lambda msg: message_time(msg) or 0.0)
+        self.batch.read.sort(key=lambda msg: message_time(msg) or 0.0)
+        for serial in self._serials or self._sync.known_serials():
+            latest = self._sync.latest(serial)
+            if latest is not None:
+                self.batch.latest[serial] = latest
+        return self.batch
+
+
+class MessageSync:
+    """Per-device cursors over the unified message list.
+
+    Not thread-safe by itself: the clients serialize runs (a ``threading``
+    lock in ``EzvizClient``, an ``asyncio`` lock in ``AsyncEzvizClient``)
+    from :meth:`begin` to :meth:`SyncRun.finish`.
+    """
+
+    def __init__(
+        self,
+        page_limit: int = DEFAULT_PAGE_LIMIT,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        history: int = DEFAULT_HISTORY,
+    ) -> None:
+        """Page ``page_limit`` messages at a time, at most ``max_pages`` per run.
+
+        ``history`` bounds the remembered ``msgId``\\s used for de-duplication.
+        """
+        self.page_limit = max(1, min(page_limit, 50))
+        self.max_pages = max(1, max_pages)
+        self._history = history
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._latest: dict[str, dict[str, Any]] = {}
+        self._synced_until: dict[str, float] = {}
+        self._global_synced: float | None = None
+
+    # -- cursors -----------------------------------------------------------
+
+    def latest(self, serial: str) -> dict[str, Any] | None:
+        """Return the newest known message of ``serial``."""
+        return self._latest.get(serial)
+
+    def known_serials(self) -> list[str]:
+        """Return the serials with a known latest message."""
+        return list(self._latest)
+
+    def cursor(self, serial: str) -> dict[str, Any]:
+        """Return the sync position of ``serial`` (for diagnostics)."""
+        latest = self._latest.get(serial) or {}
+        return {
+            "msg_id": latest.get("msgId"),
+            "time": message_time(latest) if latest else None,
+            "synced_until": self._synced_until.get(serial),
+        }
+
+    def is_seen(self, msg_id: str) -> bool:
+        """Return True when ``msg_id`` was already read."""
+        return msg_id in self._seen
+
+    def mark_seen(self, msg_id: str) -> None:
+        """Remember ``msg_id``, forgetting the oldest beyond ``history``."""
+        self._seen[msg_id] = None
+        self._seen.move_to_end(msg_id)
+        while len(self._seen) > self._history:
+            self._seen.popitem(last=False)
+
+    def offer_latest(self, serial: str, message: dict[str, Any]) -> None:
+        """Keep ``message`` as latest of ``serial`` unless a newer one is known."""
+        current = self._latest.get(serial)
+        if current is None or _newer_or_equal(message, current):
+            self._latest[serial] = message
+
+    def reset(self) -> None:
+        """Forget everything; the next run establishes new baselines."""
+        self._seen.clear()
+        self._latest.clear()
+        self._synced_until.clear()
+        self._global_synced = None
+
+    # -- runs --------------------------------------------------------------
+
+    def begin(self, serials: Iterable[str] | None = None) -> SyncRun:
+        """Start a run over ``serials`` (None: every device of the account).
+
+        The run always reads the account-wide list, which costs a single
+        request in steady state, and keeps only messages of ``serials``.
+        """
+        scope = sorted({serial for serial in serials if serial}) if serials else None
+        if scope is None:
+            return SyncRun(self, None, self._global_synced, set())
+        # Devices without a position get a baseline: their messages read in
+        # this run set their latest alarm but are not reported as new
+        baseline = {serial for serial in scope if serial not in self._synced_until}
+        synced = [self._synced_until[s] for s in scope if s in self._synced_until]
+        return SyncRun(self, scope, min(synced) if synced else None, baseline)
+
+    def complete(
+        self, serials: list[str] | None, top: float | None, threshold: float | None
+    ) -> None:
+        """Record that a run read everything down to its threshold."""
+        position = top if top is not None else threshold
+        if position is None:
+            position = 0.0
+        for serial in serials or list(self._synced_until) or self.known_serials():
+            self._synced_until[serial] = max(
+                position, self._synced_until.get(serial, 0.0)
+            )
+        if serials is None:
+            self._global_synced = max(position, self._global_synced or 0.0)
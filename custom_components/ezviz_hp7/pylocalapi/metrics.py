@@ -0,0 +1,192 @@
+"""Request instrumentation for the Ezviz clients.
+
+:class:`RequestMetrics` is always on and cheap: each HTTP attempt adds one
+sample to a bounded per-endpoint ring buffer under a lock. Percentiles are
+only computed when :meth:`RequestMetrics.snapshot` is called.
+"""
+
+from __future__ import annotations
+
+from collections import Counter, deque
+from dataclasses import dataclass, field
+import math
+import re
+import threading
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+DEFAULT_MAX_SAMPLES = 512
+
+# Path segments that carry identifiers rather than naming the endpoint.
+_SERIAL_SEGMENT = re.compile(r"^(?=.*\d)[A-Z0-9]{8,}(?:-[A-Z0-9]+)*$")
+_NUMBER_SEGMENT = re.compile(r"^\d+$")
+
+
+def endpoint_label(method: str, url: str) -> str:
+    """Return a low-cardinality label like ``GET /v3/devices/{serial}/switch``.
+
+    The host and query string are dropped; serial numbers and numeric ids in
+    the path are replaced by placeholders.
+    """
+    path = urlsplit(url).path or url
+    parts = []
+    for segment in path.split("/"):
+        if _NUMBER_SEGMENT.match(segment):
+            parts.append("{n}")
+        elif _SERIAL_SEGMENT.match(segment):
+            parts.append("{serial}")
+        else:
+            parts.append(segment)
+    return f"{method.upper()} {'/'.join(parts)}"
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = math.ceil(pct / 100 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, rank))]
+
+
+@dataclass
+class _EndpointStats:
+    """Counters and recent latency samples for one endpoint label."""
+
+    max_samples: int
+    count: int = 0
+    errors: int = 0
+    bytes_total: int = 0
+    latency_total: float = 0.0
+    statuses: Counter = field(default_factory=Counter)
+    latencies: deque = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.latencies = deque(maxlen=self.max_samples)
+
+
+class RequestMetrics:
+    """Per-endpoint request counts, latencies, sizes, retries and re-logins."""
+
+    def __init__(self, max_samples: int = DEFAULT_MAX_SAMPLES) -> None:
+        """Initialize empty metrics keeping ``max_samples`` latencies per endpoint."""
+        self._max_samples = max_samples
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, _EndpointStats] = {}
+        self._retries: Counter = Counter()
+        self._relogins: Counter = Counter()
+        self._started = time.time()
+
+    def record_request(
+        self,
+        method: str,
+        url: str,
+        *,
+        status: int | None,
+        elapsed: float,
+        size: int | None = None,
+        error: bool = False,
+    ) -> None:
+        """Record one HTTP attempt.
+
+        Args:
+            method: HTTP method.
+            url: Full URL or path; normalized with :func:`endpoint_label`.
+            status: HTTP status, or None when no response was received.
+            elapsed: Wall time of the attempt in seconds.
+            size: Response body size in bytes, if known.
+            error: True for transport errors and HTTP error statuses.
+        """
+        label = endpoint_label(method, url)
+        with self._lock:
+            stats = self._endpoints.get(label)
+            if stats is None:
+                stats = self._endpoints[label] = _EndpointStats(self._max_samples)
+            stats.count += 1
+            stats.latency_total += elapsed
+            stats.latencies.append(elapsed)
+            stats.statuses[status if status is not None else "error"] += 1
+            if error:
+                stats.errors += 1
+            if size:
+                stats.bytes_total += size
+
+    def record_retry(self, reason: str) -> None:
+        """Record an application-level retry (e.g. ``alarm_info_server_busy``)."""
+        with self._lock:
+            self._retries[reason] += 1
+
+    def record_relogin(self, reason: str) -> None:
+        """Record a session refresh triggered by a failed request."""
+        with self._lock:
+            self._relogins[reason] += 1
+
+    def reset(self) -> None:
+        """Drop all recorded data."""
+        with self._lock:
+            self._endpoints.clear()
+            self._retries.clear()
+            self._relogins.clear()
+            self._started = time.time()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a JSON-serializable summary of everything recorded so far.
+
+        Latencies are reported in milliseconds; percentiles cover the most
+        recent ``max_samples`` requests of each endpoint.
+        """
+        with self._lock:
+            endpoints = {
+                label: (
+                    stats.count,
+                    stats.errors,
+                    stats.bytes_total,
+                    stats.latency_total,
+                    dict(stats.statuses),
+                    sorted(stats.latencies),
+                )
+                for label, stats in self._endpoints.items()
+            }
+            retries = dict(self._retries)
+            relogins = dict(self._relogins)
+            started = self._started
+
+        all_latencies: list[float] = []
+        per_endpoint: dict[str, Any] = {}
+        for label, (count, errors, size, total, statuses, latencies) in endpoints.items():
+            all_latencies.extend(latencies)
+            per_endpoint[label] = {
+                "count": count,
+                "errors": errors,
+                "bytes": size,
+                "statuses": {str(key): value for key, value in statuses.items()},
+                "latency_ms": _latency_summary(latencies, total / count if count else None),
+            }
+        all_latencies.sort()
+        count = sum(item[0] for item in endpoints.values())
+        total = sum(item[3] for item in endpoints.values())
+        return {
+            "since": started,
+            "requests": count,
+            "errors": sum(item[1] for item in endpoints.values()),
+            "bytes": sum(item[2] for item in endpoints.values()),
+            "retries": sum(retries.values()),
+            "relogins": sum(relogins.values()),
+            "retry_reasons": retries,
+            "relogin_reasons": relogins,
+            "latency_ms": _latency_summary(all_latencies, total / count if count else None),
+            "endpoints": per_endpoint,
+        }
+
+
+def _latency_summary(sorted_values: list[float], mean: float | None) -> dict[str, Any]:
+    def _ms(value: float | None) -> float | None:
+        return None if value is None else round(value * 1000, 1)
+
+    return {
+        "mean": _ms(mean),
+        "p50": _ms(_percentile(sorted_values, 50)),
+        "p95": _ms(_percentile(sorted_values, 95)),
+        "p99": _ms(_percentile(sorted_values, 99)),
+        "max": _ms(sorted_values[-1] if sorted_values else None),
+    }
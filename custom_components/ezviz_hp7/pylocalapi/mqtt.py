@@ -24,7 +24,6 @@ import base64
 from collections import OrderedDict
 from collections.abc import Callable
 from contextlib import suppress
-import json
 import logging
 from typing import Any, Final, TypedDict
 
@@ -36,6 +35,7 @@ from .api_endpoints import (
     API_ENDPOINT_START_MQTT,
     API_ENDPOINT_STOP_MQTT,
 )
+from .codec import loads as json_loads
 from .constants import APP_SECRET, DEFAULT_TIMEOUT, FEATURE_CODE, MQTT_APP_KEY
 from .exceptions import HTTPError, InvalidURL, PyEzvizError
 
@@ -254,6 +254,34 @@ class MQTTClient:
         # Always attempt to stop push on server side
         self._stop_ezviz_push()
 
+    def update_token(self, token: EzvizToken | dict) -> None:
+        """Switch the push service to a refreshed session.
+
+        The Ezviz push is started for a session id, so after a session refresh
+        it is started again for the new one. The MQTT connection and its
+        client id are kept; the ``sessionId`` header of the requests session
+        is updated as well.
+
+        Args:
+            token (dict): The refreshed token, same fields as in the constructor.
+
+        Raises:
+            PyEzvizError: If the API fails to start push notifications.
+            InvalidURL: If the push service URL is invalid or unreachable.
+            HTTPError: If the HTTP request fails for other reasons.
+        """
+        self._token = token
+        self._session.headers["sessionId"] = str(token["session_id"])
+        if self._mqtt_data["mqtt_clientid"] is not None:
+            self._start_ezviz_push()
+
+    def close(self) -> None:
+        """Close the requests session used for the push API calls.
+
+        Call it after :meth:`stop`; the client cannot be used afterwards.
+        """
+        self._session.close()
+
     # ------------------------------------------------------------------
     # MQTT callbacks
     # ------------------------------------------------------------------
@@ -398,7 +426,7 @@ class MQTTClient:
             raise HTTPError from err
 
         try:
-            json_output = req.json()
+            json_output = json_loads(req.content)
         except requests.ConnectionError as err:
             raise InvalidURL("Invalid URL or proxy error") from err
         except ValueError as err:
@@ -449,7 +477,7 @@ class MQTTClient:
             raise HTTPError from err
 
         try:
-            json_output = req.json()
+            json_output = json_loads(req.content)
         except requests.ConnectionError as err:
             raise InvalidURL("Invalid URL or proxy error") from err
         except ValueError as err:
@@ -499,7 +527,7 @@ class MQTTClient:
             raise HTTPError from err
 
         try:
-            json_output = req.json()
+            json_output = json_loads(req.content)
         except requests.ConnectionError as err:
             raise InvalidURL("Invalid URL or proxy error") from err
         except ValueError as err:
@@ -599,8 +627,7 @@ class MQTTClient:
             PyEzvizError: If the payload is not valid JSON.
         """
         try:
-            payload_str = payload_bytes.decode("utf-8")
-            data: dict[str, Any] = json.loads(payload_str)
+            data: dict[str, Any] = json_loads(payload_bytes)
 
             if "ext" in data and isinstance(data["ext"], str):
                 ext_parts = data["ext"].split(",")
@@ -613,7 +640,7 @@ class MQTTClient:
                     ext_dict[name] = value
                 data["ext"] = ext_dict
 
-        except json.JSONDecodeError as err:
+        except ValueError as err:
             # Stop the client on malformed payloads as a defensive measure,
             # mirroring previous behaviour.
             self.stop()
@@ -0,0 +1,189 @@
+"""Per-device view over the merged pagelist payload.
+
+The pagelist endpoint returns one mapping per filter section, keyed either by
+device serial (``STATUS``, ``WIFI`` ...) or by resource id (``CLOUD``,
+``VTM`` ...), plus the ``deviceInfos`` and ``resourceInfos`` lists.
+:class:`PagelistIndex` walks those once and assembles the per-serial dicts
+returned by ``get_device_infos`` on demand.
+
+Callers that only need a few sections can fetch a projection (a pagelist
+filtered to those sections) and splice it into the last full payload with
+:func:`merge_projection`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from .codec import loads as json_loads
+from .utils import convert_to_dict
+
+# Sections of a device dict in the order get_device_infos has always used,
+# with the id they are keyed by in the pagelist payload.
+BY_SERIAL = "serial"
+BY_RESOURCE = "resource"
+DEVICE_SECTIONS: tuple[tuple[str, str], ...] = (
+    ("CLOUD", BY_RESOURCE),
+    ("VTM", BY_RESOURCE),
+    ("P2P", BY_SERIAL),
+    ("CONNECTION", BY_SERIAL),
+    ("KMS", BY_SERIAL),
+    ("STATUS", BY_SERIAL),
+    ("TIME_PLAN", BY_SERIAL),
+    ("CHANNEL", BY_RESOURCE),
+    ("QOS", BY_SERIAL),
+    ("NODISTURB", BY_SERIAL),
+    ("FEATURE", BY_SERIAL),
+    ("UPGRADE", BY_SERIAL),
+    ("FEATURE_INFO", BY_SERIAL),
+    ("SWITCH", BY_SERIAL),
+    ("CUSTOM_TAG", BY_SERIAL),
+    ("VIDEO_QUALITY", BY_RESOURCE),
+    ("resourceInfos", BY_SERIAL),
+    ("WIFI", BY_SERIAL),
+    ("deviceInfos", BY_SERIAL),
+)
+
+NO_RESOURCE = "NONE"
+
+# Lists returned by the pagelist endpoint whatever the filter asks for.
+ALWAYS_RETURNED = ("deviceInfos", "resourceInfos")
+RESOURCE_SECTIONS = frozenset(
+    name for name, keyed_by in DEVICE_SECTIONS if keyed_by == BY_RESOURCE
+)
+
+
+def projection_sections(sections: Iterable[str]) -> tuple[str, ...]:
+    """Return the filter sections to request for a projection.
+
+    Duplicates and the always-returned lists are dropped. ``CLOUD`` is added
+    when a resource-keyed section is asked for, since it maps serials to
+    resource ids, and when nothing else is left to ask for.
+    """
+    wanted = dict.fromkeys(
+        name.strip()
+        for name in sections
+        if name and name.strip() and name.strip() not in ALWAYS_RETURNED
+    )
+    if not wanted or RESOURCE_SECTIONS.intersection(wanted):
+        # The filter cannot be empty; CLOUD is what get_device() asks for too
+        wanted.setdefault("CLOUD")
+    return tuple(wanted)
+
+
+def _serials(pagelist: dict[str, Any]) -> list[Any]:
+    return [
+        item.get("deviceSerial")
+        for item in pagelist.get("deviceInfos") or []
+        if isinstance(item, dict)
+    ]
+
+
+def merge_projection(
+    full: dict[str, Any], partial: dict[str, Any], sections: Iterable[str]
+) -> dict[str, Any] | None:
+    """Return ``full`` with the projected ``sections`` replaced by ``partial``'s.
+
+    A projection carries the whole account for its sections, so they are
+    replaced rather than deep-merged (removed keys disappear). Returns None
+    when the device list itself changed: the other sections of ``full`` would
+    then be stale and a full fetch is needed.
+    """
+    if _serials(full) != _serials(partial):
+        return None
+
+    merged = dict(full)
+    for name in (*ALWAYS_RETURNED, *sections):
+        if name in partial:
+            merged[name] = partial[name]
+    return merged
+
+
+def _section(pagelist: dict[str, Any], name: str) -> dict[str, Any]:
+    value = pagelist.get(name)
+    return value if isinstance(value, dict) else {}
+
+
+class PagelistIndex:
+    """Serial and resource-id lookups built in one pass over a pagelist.
+
+    Building the index is O(devices + resources). Device dicts are assembled
+    lazily and memoized, so asking for one serial does not build the others,
+    and the JSON-encoded ``supportExt`` and ``optionals`` fields are decoded
+    once per device.
+    """
+
+    def __init__(self, pagelist: dict[str, Any]) -> None:
+        """Index ``pagelist``; the payload is shared, not copied."""
+        self.pagelist = pagelist
+        self._device_infos: dict[str, dict[str, Any]] = {}
+        self._resource_ids: dict[str, str] = {}
+        self._resources: dict[str, list[dict[str, Any]]] = {}
+        self._built: dict[str, dict[str, Any]] = {}
+
+        for device in pagelist.get("deviceInfos") or []:
+            if isinstance(device, dict) and device.get("deviceSerial"):
+                self._device_infos[device["deviceSerial"]] = device
+        for res_id, cloud in _section(pagelist, "CLOUD").items():
+            serial = cloud.get("deviceSerial") if isinstance(cloud, dict) else None
+            if serial:
+                self._resource_ids.setdefault(serial, res_id)
+        for item in pagelist.get("resourceInfos") or []:
+            if isinstance(item, dict) and item.get("deviceSerial"):
+                self._resources.setdefault(item["deviceSerial"], []).append(item)
+
+    def __contains__(self, serial: object) -> bool:
+        """Return True when ``serial`` is listed in ``deviceInfos``."""
+        return serial in self._device_infos
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate serials in ``deviceInfos`` order."""
+        return iter(self._device_infos)
+
+    def __len__(self) -> int:
+        """Return the number of devices in the pagelist."""
+        return len(self._device_infos)
+
+    def resource_id(self, serial: str) -> str:
+        """Return the CLOUD resource id of ``serial`` (``"NONE"`` if unknown)."""
+        return self._resource_ids.get(serial, NO_RESOURCE)
+
+    def device(self, serial: str) -> dict[str, Any] | None:
+        """Return the per-section dict of one device, or None if not listed."""
+        built = self._built.get(serial)
+        if built is not None:
+            return built
+        device = self._device_infos.get(serial)
+        if device is None:
+            return None
+
+        res_id = self.resource_id(serial)
+        result: dict[str, Any] = {}
+        for name, keyed_by in DEVICE_SECTIONS:
+            if name == "deviceInfos":
+                result[name] = device
+            elif name == "resourceInfos":
+                result[name] = self._resources.get(serial, [])  # Could be more than one
+            elif keyed_by == BY_RESOURCE:
+                result[name] = {res_id: _section(self.pagelist, name).get(res_id, {})}
+            else:
+                result[name] = _section(self.pagelist, name).get(serial, {})
+
+        # Nested keys are still encoded as JSON strings
+        support_ext = device.get("supportExt")
+        if isinstance(support_ext, str) and support_ext:
+            try:
+                device["supportExt"] = json_loads(support_ext)
+            except ValueError:
+                # Leave as-is if not valid JSON
+                pass
+        if isinstance(result["STATUS"], dict):
+            convert_to_dict(result["STATUS"].get("optionals"))
+
+        self._built[serial] = result
+        return result
+
+    def devices(self) -> dict[str, dict[str, Any]]:
+        """Return ``{serial: device dict}`` for every device."""
+        return {serial: self.device(serial) or {} for serial in self._device_infos}
@@ -0,0 +1,290 @@
+"""Retry policy shared by every request a client makes.
+
+A :class:`RetryPolicy` combines three pieces:
+
+* :class:`Backoff` per endpoint class (``auth``, ``read``, ``write``):
+  exponential delay with jitter, plus how many times transport failures of
+  that class may be retried.
+* :class:`RetryBudget`: a token bucket capping retries account-wide, so a
+  cloud outage cannot turn every poll into a burst of retries.
+* :class:`CircuitBreaker`: after repeated transport/5xx failures it opens
+  and requests fail fast with :class:`~.exceptions.EzvizCircuitOpen` until a
+  single probe is allowed through after ``reset_timeout``.
+
+The policy only decides; the sync and async clients do the sleeping.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, replace
+import random
+import threading
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+from .api_endpoints import API_ENDPOINT_LOGIN, API_ENDPOINT_REFRESH_SESSION_ID
+from .exceptions import EzvizCircuitOpen
+
+AUTH = "auth"
+READ = "read"
+WRITE = "write"
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+# Statuses that say "the cloud is struggling", as opposed to "your request is wrong".
+TRANSIENT_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_AUTH_PATHS = (API_ENDPOINT_LOGIN, API_ENDPOINT_REFRESH_SESSION_ID)
+
+
+@dataclass(frozen=True)
+class Backoff:
+    """Exponential backoff with jitter for one endpoint class.
+
+    Attributes:
+        base: Delay before the first retry, in seconds.
+        factor: Multiplier applied for each further attempt.
+        max_delay: Upper bound of a single delay.
+        jitter: Fraction of the delay that is randomized (0 = fixed delays,
+            1 = "full jitter", uniformly between 0 and the computed delay).
+        transport_retries: Retries of connection errors and transient HTTP
+            statuses. Keep 0 for non-idempotent calls.
+    """
+
+    base: float = 0.5
+    factor: float = 2.0
+    max_delay: float = 30.0
+    jitter: float = 0.5
+    transport_retries: int = 0
+
+    def delay(self, attempt: int, rand: Callable[[], float] = random.random) -> float:
+        """Return the delay before retry number ``attempt`` (0-based)."""
+        delay = min(self.max_delay, self.base * self.factor ** max(0, attempt))
+        return delay * (1 - self.jitter) + delay * self.jitter * rand()
+
+
+DEFAULT_BACKOFF: dict[str, Backoff] = {
+    AUTH: Backoff(base=1.0, max_delay=60.0, transport_retries=1),
+    READ: Backoff(base=0.5, max_delay=15.0, transport_retries=2),
+    WRITE: Backoff(base=1.0, max_delay=15.0, transport_retries=0),
+}
+
+
+class RetryBudget:
+    """Token bucket limiting how many retries may happen over time."""
+
+    def __init__(self, capacity: float = 20.0, refill_per_sec: float = 0.2) -> None:
+        """Allow ``capacity`` retries in a burst, then ``refill_per_sec`` per second."""
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.refill_per_sec
+        )
+        self._updated = now
+
+    def try_spend(self) -> bool:
+        """Take one retry token; False when the budget is exhausted."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def available(self) -> float:
+        """Return the retry tokens currently available."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class CircuitBreaker:
+    """Closed → open after consecutive failures → half-open probe → closed."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0) -> None:
+        """Open after ``failure_threshold`` failures; probe after ``reset_timeout`` s."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._probe_started: float | None = None
+        self._trips = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Return ``closed``, ``open`` or ``half_open``."""
+        with self._lock:
+            if self._state == CIRCUIT_OPEN and self._reset_due(time.monotonic()):
+                return CIRCUIT_HALF_OPEN
+            return self._state
+
+    def _reset_due(self, now: float, since: float | None = None) -> bool:
+        since = self._opened_at if since is None else since
+        return since is not None and now - since >= self.reset_timeout
+
+    def before_request(self) -> None:
+        """Raise EzvizCircuitOpen unless a request may go out now."""
+        with self._lock:
+            if self._state == CIRCUIT_CLOSED:
+                return
+            now = time.monotonic()
+            if self._state == CIRCUIT_OPEN and self._reset_due(now):
+                self._state = CIRCUIT_HALF_OPEN
+            # A probe that never reported back must not keep the circuit shut
+            if self._state == CIRCUIT_HALF_OPEN and (
+                not self._probing or self._reset_due(now, self._probe_started)
+            ):
+                self._probing = True
+                self._probe_started = now
+                return
+            remaining = (
+                self.reset_timeout - (now - self._opened_at)
+                if self._opened_at is not None
+                else self.reset_timeout
+            )
+        raise EzvizCircuitOpen(
+            f"EZVIZ cloud unavailable, not retrying for another {max(0.0, remaining):.0f}s"
+        )
+
+    def record_success(self) -> None:
+        """Close the circuit and reset the failure count."""
+        with self._lock:
+            self._state = CIRCUIT_CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure; open the circuit at the threshold or on a failed probe."""
+        with self._lock:
+            self._failures += 1
+            if self._state == CIRCUIT_HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != CIRCUIT_OPEN:
+                    self._trips += 1
+                self._state = CIRCUIT_OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "trips": self._trips,
+                "open_for_s": (
+                    round(time.monotonic() - self._opened_at, 1)
+                    if self._opened_at is not None
+                    else None
+                ),
+            }
+
+
+class RetryPolicy:
+    """Backoff per endpoint class, a shared retry budget and a circuit breaker."""
+
+    def __init__(
+        self,
+        backoff: Mapping[str, Backoff] | None = None,
+        budget: RetryBudget | None = None,
+        breaker: CircuitBreaker | None = None,
+        rand: Callable[[], float] = random.random,
+    ) -> None:
+        """Build a policy; omitted parts use the module defaults."""
+        self.backoff = {**DEFAULT_BACKOFF, **(backoff or {})}
+        self.budget = budget or RetryBudget()
+        self.breaker = breaker or CircuitBreaker()
+        self._rand = rand
+        self._exhausted = 0
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> RetryPolicy:
+        """Build a policy from flat options (e.g. a Home Assistant options flow).
+
+        Recognized keys: ``retry_base_delay``, ``retry_max_delay``,
+        ``retry_budget`` (burst size), ``breaker_threshold`` and
+        ``breaker_reset``. Missing keys, and keys stored as None, keep the
+        defaults of :data:`DEFAULT_BACKOFF`, :class:`RetryBudget` and
+        :class:`CircuitBreaker`.
+        """
+
+        def option(**keys: tuple[str, Callable[[Any], Any]]) -> dict[str, Any]:
+            """Return ``{argument: convert(value)}`` for the options that are set."""
+            return {
+                argument: convert(options[key])
+                for argument, (key, convert) in keys.items()
+                if options.get(key) is not None
+            }
+
+        overrides = option(
+            base=("retry_base_delay", float), max_delay=("retry_max_delay", float)
+        )
+        backoff = {
+            kind: replace(default, **overrides) for kind, default in DEFAULT_BACKOFF.items()
+        }
+        budget = RetryBudget(**option(capacity=("retry_budget", float)))
+        breaker = CircuitBreaker(
+            **option(
+                failure_threshold=("breaker_threshold", int),
+                reset_timeout=("breaker_reset", float),
+            )
+        )
+        return cls(backoff, budget, breaker)
+
+    @staticmethod
+    def endpoint_class(method: str, url: str) -> str:
+        """Classify a request as ``auth``, ``read`` or ``write``."""
+        path = urlsplit(url).path or url
+        if any(path.endswith(auth) for auth in _AUTH_PATHS):
+            return AUTH
+        return READ if method.upper() == "GET" else WRITE
+
+    @staticmethod
+    def is_failure(status: int | None) -> bool:
+        """Return True for outcomes that count against the circuit breaker."""
+        return status is None or status in TRANSIENT_STATUSES
+
+    def before_request(self) -> None:
+        """Fail fast with EzvizCircuitOpen while the circuit is open."""
+        self.breaker.before_request()
+
+    def record_outcome(self, status: int | None) -> None:
+        """Feed an HTTP status (None for transport errors) to the breaker."""
+        if self.is_failure(status):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def transport_retries(self, kind: str) -> int:
+        """Return how often transport failures of ``kind`` may be retried."""
+        return self.backoff.get(kind, DEFAULT_BACKOFF[WRITE]).transport_retries
+
+    def next_delay(self, kind: str, attempt: int) -> float | None:
+        """Return the delay before retry ``attempt``, or None when out of budget."""
+        if not self.budget.try_spend():
+            self._exhausted += 1
+            return None
+        backoff = self.backoff.get(kind, DEFAULT_BACKOFF[READ])
+        return backoff.delay(attempt, self._rand)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return breaker and budget state for diagnostics."""
+        return {
+            **self.breaker.snapshot(),
+            "retry_budget": round(self.budget.available, 1),
+            "budget_exhausted": self._exhausted,
+        }
@@ -0,0 +1,306 @@
+"""Local alarm history backed by SQLite.
+
+Alarms are otherwise only available from the EZVIZ cloud, one page at a time.
+:class:`AlarmStore` keeps the unified messages read by the clients in an
+embedded SQLite database, normalized to the shape of
+:func:`~.camera.normalize_unified_message` and keyed by ``msgId``, so
+questions like "what happened today at the door" are answered locally.
+
+The table is indexed by ``(serial, time)``, ``(alarm_type, time)`` and
+``time``; every query of :meth:`AlarmStore.query` is a range scan on one of
+them. Inserts are batched in a single transaction and ignore ``msgId``\\s
+already stored, so the same page can be offered any number of times. Rows
+older than ``retention_days`` are pruned at most once per
+:data:`PRUNE_INTERVAL` while inserting.
+
+One connection is shared by all threads and guarded by a lock. Calls are
+blocking: from an event loop run them in an executor.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from .camera import normalize_unified_message
+from .codec import loads as json_loads
+
+DEFAULT_RETENTION_DAYS = 30
+PRUNE_INTERVAL = 3600.0
+SCHEMA_VERSION = 1
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS alarms (
+        msg_id TEXT PRIMARY KEY,
+        serial TEXT NOT NULL,
+        time REAL NOT NULL,
+        alarm_type TEXT,
+        alarm_name TEXT,
+        payload TEXT NOT NULL
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS alarms_serial_time ON alarms (serial, time)",
+    "CREATE INDEX IF NOT EXISTS alarms_type_time ON alarms (alarm_type, time)",
+    "CREATE INDEX IF NOT EXISTS alarms_time ON alarms (time)",
+)
+
+
+def alarm_timestamp(alarm: dict[str, Any]) -> float | None:
+    """Return the epoch seconds of a normalized alarm (ms values are scaled)."""
+    value = alarm.get("alarmStartTime")
+    if value is None:
+        value = alarm.get("alarmTime")
+    if isinstance(value, bool):
+        return None
+    try:
+        stamp = float(value)
+    except (TypeError, ValueError):
+        return None
+    # The cloud reports milliseconds; anything past year 5138 is not seconds
+    return stamp / 1000.0 if stamp > 1e11 else stamp
+
+
+def start_of_day(
+    day: datetime.date | None = None, tzinfo: datetime.tzinfo | None = None
+) -> float:
+    """Return the epoch seconds of midnight of ``day`` (default: today).
+
+    ``tzinfo`` defaults to the local time zone.
+    """
+    if day is None:
+        day = datetime.datetime.now(tzinfo).date()
+    midnight = datetime.datetime.combine(day, datetime.time.min, tzinfo)
+    return midnight.timestamp()
+
+
+class AlarmStore:
+    """Persistent, indexed history of unified messages.
+
+    Example:
+        >>> store = AlarmStore("alarms.db")
+        >>> store.add_many(client.sync_messages().read)
+        >>> store.today("BD1234567")
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] = ":memory:",
+        retention_days: float | None = DEFAULT_RETENTION_DAYS,
+    ) -> None:
+        """Open (and create if needed) the database at ``path``.
+
+        Args:
+            path: Database file, or ``":memory:"`` for a throwaway store.
+            retention_days: Age after which alarms are pruned; None keeps
+                everything.
+        """
+        self.path = os.fspath(path)
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._last_prune: float | None = None
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        with self._lock:
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def __enter__(self) -> AlarmStore:
+        """Return the store itself."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the store."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    # -- writes ------------------------------------------------------------
+
+    @staticmethod
+    def _row(message: dict[str, Any]) -> tuple[Any, ...] | None:
+        """Return the row of a raw or normalized message; None if unusable."""
+        alarm = (
+            message
+            if message.get("msgSource") == "unifiedmsg"
+            else normalize_unified_message(message)
+        )
+        msg_id = alarm.get("alarmId")
+        serial = alarm.get("deviceSerial")
+        if msg_id in (None, "") or not serial:
+            return None
+        stamp = alarm_timestamp(alarm)
+        return (
+            str(msg_id),
+            str(serial),
+            stamp if stamp is not None else time.time(),
+            str(alarm.get("alarmType") or ""),
+            alarm.get("sampleName"),
+            json.dumps(alarm, separators=(",", ":"), default=str),
+        )
+
+    def add_many(self, messages: Iterable[dict[str, Any]]) -> int:
+        """Store ``messages`` in one transaction and return how many were new.
+
+        Accepts raw unified messages or alarms already normalized. Messages
+        without ``msgId`` or serial, or older than the retention, are
+        skipped; known ``msgId``\\s are ignored.
+        """
+        rows = [row for row in map(self._row, messages) if row is not None]
+        if self.retention_days is not None:
+            # Already past retention: would be pruned again right away
+            cutoff = time.time() - self.retention_days * 86400.0
+            rows = [row for row in rows if row[2] >= cutoff]
+        with self._lock:
+            before = self._conn.total_changes
+            if rows:
+                self._conn.execute("BEGIN")
+                try:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO alarms VALUES (?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                except sqlite3.Error:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._conn.execute("COMMIT")
+            added = self._conn.total_changes - before
+            if (
+                self._last_prune is None
+                or time.monotonic() - self._last_prune >= PRUNE_INTERVAL
+            ):
+                self._prune_locked(time.time())
+        return added
+
+    def add(self, message: dict[str, Any]) -> bool:
+        """Store one message; return True if it was not known yet."""
+        return self.add_many((message,)) == 1
+
+    def prune(self, now: float | None = None) -> int:
+        """Delete alarms older than the retention and return how many."""
+        with self._lock:
+            return self._prune_locked(time.time() if now is None else now)
+
+    def _prune_locked(self, now: float) -> int:
+        self._last_prune = time.monotonic()
+        if self.retention_days is None:
+            return 0
+        cursor = self._conn.execute(
+            "DELETE FROM alarms WHERE time < ?",
+            (now - self.retention_days * 86400.0,),
+        )
+        return cursor.rowcount
+
+    # -- reads -------------------------------------------------------------
+
+    @staticmethod
+    def _where(
+        serial: str | Iterable[str] | None,
+        alarm_type: str | Iterable[str] | None,
+        since: float | None,
+        until: float | None,
+    ) -> tuple[str, list[Any]]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        for column, value in (("serial", serial), ("alarm_type", alarm_type)):
+            if value is None:
+                continue
+            values = [value] if isinstance(value, str) else list(value)
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        if since is not None:
+            clauses.append("time >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("time < ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(
+        self,
+        serial: str | Iterable[str] | None = None,
+        *,
+        since: float | None = None,
+        until: float | None = None,
+        alarm_type: str | Iterable[str] | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return stored alarms, newest first.
+
+        Args:
+            serial: One serial or several; None for every device.
+            since: Inclusive lower bound, epoch seconds.
+            until: Exclusive upper bound, epoch seconds.
+            alarm_type: One ``alarmType`` code or several.
+            limit: Maximum number of alarms returned.
+        """
+        where, params = self._where(serial, alarm_type, since, until)
+        sql = f"SELECT payload FROM alarms{where} ORDER BY time DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(max(0, limit))
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json_loads(payload) for (payload,) in rows]
+
+    def today(
+        self,
+        serial: str | Iterable[str] | None = None,
+        *,
+        alarm_type: str | Iterable[str] | None = None,
+        tzinfo: datetime.tzinfo | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return the alarms since local midnight, newest first."""
+        return self.query(
+            serial,
+            since=start_of_day(tzinfo=tzinfo),
+            alarm_type=alarm_type,
+            limit=limit,
+        )
+
+    def count(
+        self,
+        serial: str | Iterable[str] | None = None,
+        *,
+        since: float | None = None,
+        until: float | None = None,
+        alarm_type: str | Iterable[str] | None = None,
+    ) -> int:
+        """Return the number of stored alarms matching the filters."""
+        where, params = self._where(serial, alarm_type, since, until)
+        with self._lock:
+            (total,) = self._conn.execute(
+                f"SELECT COUNT(*) FROM alarms{where}", params
+            ).fetchone()
+        return int(total)
+
+    def count_by_type(
+        self,
+        serial: str | Iterable[str] | None = None,
+        *,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> dict[str, int]:
+        """Return ``{alarm_type: count}`` of the alarms matching the filters."""
+        where, params = self._where(serial, None, since, until)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT alarm_type, COUNT(*) FROM alarms{where} GROUP BY alarm_type",
+                params,
+            ).fetchall()
+        return {alarm_type: int(total) for alarm_type, total in rows}
@@ -5,14 +5,12 @@ from __future__ import annotations
 from collections.abc import Iterable, Iterator
 import datetime
 from hashlib import md5
-import json
 import logging
 import re as _re
 from typing import Any
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from Crypto.Cipher import AES
-
+from .codec import loads as json_loads
 from .constants import HIK_ENCRYPTION_HEADER
 from .exceptions import PyEzvizError
 
@@ -39,7 +37,7 @@ def decode_json(value: Any) -> Any:
 
     if isinstance(value, str):
         try:
-            return json.loads(value)
+            return json_loads(value)
         except (TypeError, ValueError):
             return None
     return value
@@ -52,7 +50,7 @@ def convert_to_dict(data: Any) -> Any:
             if isinstance(value, str):
                 try:
                     # Attempt to convert the string back into a dictionary
-                    data[key] = json.loads(value)
+                    data[key] = json_loads(value)
 
                 except ValueError:
                     continue
@@ -224,6 +222,9 @@ def _decrypt_single_block(
     if not ciphertext:
         raise PyEzvizError("Missing ciphertext payload")
 
+    # pycryptodome is only needed for encrypted pictures
+    from Crypto.Cipher import AES
+
     remainder = len(ciphertext) % AES.block_size
     if remainder:
         _LOGGER.debug(
@@ -301,6 +302,48 @@ def deep_merge(dict1: Any, dict2: Any) -> Any:
     return merged
 
 
+def merge_pages(pages: Iterable[Any]) -> Any:
+    """Merge paged API payloads, in order, in a single linear pass.
+
+    Gives the same result as folding :func:`deep_merge` over ``pages`` but
+    merges into the first page in place instead of rebuilding every dict and
+    list at each step, so the cost is linear in the total payload size. The
+    pages must be freshly decoded payloads owned by the caller.
+
+    Args:
+    pages (Iterable): Page payloads (dicts or lists) in offset order.
+
+    Returns:
+    Any: The merged payload, or None if there were no pages.
+
+    """
+    merged: Any = None
+    for page in pages:
+        if merged is None:
+            merged = page
+        elif page is None:
+            continue
+        elif isinstance(merged, dict) and isinstance(page, dict):
+            _merge_dict_into(merged, page)
+        elif isinstance(merged, list) and isinstance(page, list):
+            merged.extend(page)
+        else:
+            merged = page
+    return merged
+
+
+def _merge_dict_into(target: dict, source: dict) -> None:
+    """Merge ``source`` into ``target`` with :func:`deep_merge` semantics."""
+    for key, value in source.items():
+        current = target.get(key)
+        if isinstance(current, dict) and isinstance(value, dict):
+            _merge_dict_into(current, value)
+        elif isinstance(current, list) and isinstance(value, list):
+            current.extend(value)
+        else:
+            target[key] = value
+
+
 # ---------------------------------------------------------------------------
 # Time helpers for alarm/motion handling
 # ---------------------------------------------------------------------------
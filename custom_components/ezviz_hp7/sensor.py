@@ -2,7 +2,8 @@ from __future__ import annotations
 from typing import Any, Optional
 from datetime import datetime, timedelta
 from homeassistant.util import dt as dt_util
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN
@@ -51,6 +52,18 @@ SENSORS = [
 ]
 
 
+# Metriche HTTP del client dell'account: (key, percorso nello snapshot, unità, icona, state_class)
+METRIC_SENSORS = [
+    ("api_requests", "requests", None, "mdi:counter", SensorStateClass.TOTAL_INCREASING),
+    ("api_errors", "errors", None, "mdi:alert-circle-outline", SensorStateClass.TOTAL_INCREASING),
+    ("api_relogins", "relogins", None, "mdi:account-key", SensorStateClass.TOTAL_INCREASING),
+    ("api_latency_p50", "latency_ms.p50", "ms", "mdi:timer-outline", SensorStateClass.MEASUREMENT),
+    ("api_latency_p95", "latency_ms.p95", "ms", "mdi:timer-alert-outline", SensorStateClass.MEASUREMENT),
+    ("api_latency_p99", "latency_ms.p99", "ms", "mdi:timer-alert", SensorStateClass.MEASUREMENT),
+    ("api_circuit", "circuit.state", None, "mdi:electric-switch", None),
+]
+
+
 async def async_setup_entry(hass, entry, async_add_entities):
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator = data["coordinator"]
@@ -64,6 +77,14 @@ async def async_setup_entry(hass, entry, async_add_entities):
             ent._attr_entity_registry_enabled_default = False
         ents.append(ent)
 
+    # Le metriche sono dell'account: le crea solo la prima entry che arriva qui
+    account_key = data["account_key"]
+    account = hass.data[DOMAIN]["accounts"][account_key]
+    if account.setdefault("metrics_entry", entry.entry_id) == entry.entry_id:
+        username = entry.data["username"]
+        for cfg in METRIC_SENSORS:
+            ents.append(Hp7MetricSensor(coordinator, account_key, username, *cfg))
+
     async_add_entities(ents)
 
 class Hp7Sensor(CoordinatorEntity, SensorEntity):
@@ -97,9 +118,17 @@ class Hp7Sensor(CoordinatorEntity, SensorEntity):
             model="HP7",
         )
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        # L'ultimo allarme espone anche i recenti: un burst tra due poll non va perso
+        if self._path != "last_alarm_time":
+            return None
+        recent = self.coordinator.device_data(self._serial).get("recent_alarms")
+        return {"recent_alarms": recent} if recent else None
+
     @property
     def native_value(self):
-        data = self.coordinator.data or {}
+        data = self.coordinator.device_data(self._serial)
         val = _dig(data, self._path)
 
         if self._attr_device_class == SensorDeviceClass.TIMESTAMP:
@@ -124,4 +153,50 @@ class Hp7Sensor(CoordinatorEntity, SensorEntity):
                 val = self._transform(val)
             except Exception:
                 pass
-        return val
\ No newline at end of file
+        return val
+
+class Hp7MetricSensor(CoordinatorEntity, SensorEntity):
+    """Metrica delle richieste al cloud EZVIZ, una per account sul dispositivo dell'account.
+
+    Legge lo snapshot che il coordinator prende una volta per refresh.
+    """
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    # Il dettaglio per endpoint cambia a ogni refresh: non va nel recorder
+    _unrecorded_attributes = frozenset({"endpoints", "retry_reasons", "relogin_reasons"})
+
+    def __init__(self, coordinator, account_key, username, key, path, unit, icon, state_class):
+        super().__init__(coordinator)
+        self._path = path
+        self._attr_translation_key = key
+        self._attr_unique_id = f"{DOMAIN}_account_{account_key}_{key}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_icon = icon
+        self._attr_state_class = state_class
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"account_{account_key}")},
+            name=f"EZVIZ ({username})",
+            manufacturer="EZVIZ",
+            model="Account cloud",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @property
+    def native_value(self):
+        return _dig(self.coordinator.metrics, self._path)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        snapshot = self.coordinator.metrics
+        if self._path == "circuit.state":
+            return snapshot.get("circuit")
+        if self._path != "requests":
+            return None
+        return {
+            "endpoints": snapshot.get("endpoints"),
+            "retry_reasons": snapshot.get("retry_reasons"),
+            "relogin_reasons": snapshot.get("relogin_reasons"),
+            "bytes": snapshot.get("bytes"),
+        }
@@ -0,0 +1,116 @@
+from __future__ import annotations
+import asyncio
+import io
+import logging
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lati massimi delle miniature: le richieste vengono arrotondate al bucket
+# superiore, così card e tablet diversi condividono poche varianti in cache.
+THUMBNAIL_BUCKETS = (160, 320, 480, 640, 960, 1280)
+THUMBNAIL_QUALITY = 80
+
+
+def snapshot_key(serial: str, url: str, checksum: Optional[str] = None) -> str:
+    """Chiave di cache di un'immagine allarme: checksum se noto, altrimenti URL."""
+    return f"{serial}:{checksum or url}"
+
+
+def thumbnail_bucket(width: Optional[int], height: Optional[int]) -> Optional[int]:
+    """Bucket per la dimensione richiesta dal frontend (None = immagine intera)."""
+    side = max(width or 0, height or 0)
+    if side <= 0:
+        return None
+    return next((bucket for bucket in THUMBNAIL_BUCKETS if bucket >= side), None)
+
+
+def resize_image(data: bytes, bucket: int) -> Optional[bytes]:
+    """Ridimensiona l'immagine per stare in bucket x bucket (JPEG).
+
+    Bloccante: va eseguita nell'executor. Restituisce None se l'immagine è
+    già abbastanza piccola, se Pillow manca o se i byte non sono un'immagine;
+    in quei casi si serve l'originale.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        _LOGGER.debug("Pillow non disponibile: miniature disattivate")
+        return None
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if max(image.size) <= bucket:
+                return None
+            image.draft("RGB", (bucket, bucket))  # decodifica JPEG già ridotta
+            thumb = image.convert("RGB")
+            thumb.thumbnail((bucket, bucket))
+            out = io.BytesIO()
+            thumb.save(out, format="JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+            return out.getvalue()
+    except Exception as e:
+        _LOGGER.debug("Ridimensionamento snapshot fallito: %s", e)
+        return None
+
+
+class SnapshotCache:
+    """Cache LRU in memoria delle immagini allarme, limitata in byte.
+
+    L'immagine di un allarme non cambia finché non arriva l'allarme
+    successivo, quindi ogni dashboard aperta può riusare gli stessi byte.
+    Le richieste concorrenti per la stessa chiave condividono un solo download
+    (single-flight): dieci dashboard costano una richiesta al cloud.
+    """
+
+    def __init__(self, max_bytes: int):
+        self._max_bytes = max_bytes
+        self._items: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        data = self._items.get(key)
+        if data is not None:
+            self._items.move_to_end(key)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self._max_bytes:
+            return
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        self._items[key] = data
+        self._size += len(data)
+        while self._size > self._max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self._size -= len(evicted)
+
+    async def async_get_or_fetch(
+        self, key: str, fetch: Callable[[], Awaitable[Optional[bytes]]]
+    ) -> Optional[bytes]:
+        """Restituisce i byte in cache o li scarica una sola volta per chiave."""
+        data = self.get(key)
+        if data is not None:
+            self.hits += 1
+            return data
+
+        future = self._inflight.get(key)
+        if future is None:
+            self.misses += 1
+            future = asyncio.ensure_future(fetch())
+            self._inflight[key] = future
+            future.add_done_callback(lambda fut: self._fetch_done(key, fut))
+        # shield: se un chiamante viene cancellato il download continua per gli altri
+        return await asyncio.shield(future)
+
+    def _fetch_done(self, key: str, future: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        data = future.result()
+        if data:
+            self.put(key, data)